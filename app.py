@@ -1,7 +1,8 @@
 import streamlit as st
-import joblib
 import os
 
+from model_registry import ModelRegistry
+
 st.title("Fake News Detection")
 
 # Debug information
@@ -9,19 +10,22 @@ st.write("**Debug Info:**")
 st.write(f"Current working directory: {os.getcwd()}")
 st.write(f"Files in current directory: {os.listdir('.')}")
 
+registry = ModelRegistry()
+
 # Check if Models folder exists
-if os.path.exists('Models'):
+if os.path.exists(registry.root):
     st.write(f"✅ Models folder found")
-    st.write(f"Files in Models folder: {os.listdir('Models')}")
+    st.write(f"Files in Models folder: {os.listdir(registry.root)}")
     
-    # Check if the specific file exists
-    model_path = 'Models/fake_news_rf_pipeline.pkl'
-    if os.path.exists(model_path):
-        st.write(f"✅ Model file found at: {model_path}")
+    # Check which version the registry will serve
+    try:
+        version, entry = registry.entry()
+        model_path = os.path.join(registry.root, entry['path'])
+        st.write(f"✅ Active model version: {version} ({model_path})")
         file_size = os.path.getsize(model_path)
         st.write(f"File size: {file_size} bytes ({file_size/1024/1024:.1f} MB)")
-    else:
-        st.write(f"❌ Model file NOT found at: {model_path}")
+    except (FileNotFoundError, KeyError) as e:
+        st.write(f"❌ No usable model in registry: {e}")
 else:
     st.write("❌ Models folder NOT found")
 
@@ -29,8 +33,11 @@ else:
 st.write("**Attempting to load model:**")
 
 try:
-    pipeline = joblib.load('Models/fake_news_rf_pipeline.pkl')
-    st.success("✅ Model loaded successfully!")
+    handle = registry.load()
+    pipeline = handle.pipeline
+    st.success(f"✅ Model {handle.version} loaded successfully!")
+    st.write(f"Checksum: {handle.sha256[:12]}, vocabulary size: {handle.metadata['vocab_size']}, "
+             f"trees: {handle.metadata['n_estimators']}")
     
     # Test prediction
     test_headline = "This is a test headline"
@@ -0,0 +1,259 @@
+"""Async serving mode for the detector.
+
+A plain ASGI app that accepts requests on an event loop and sends the
+CPU-bound pipeline calls to a bounded process pool, micro-batching
+concurrent headlines the same way flask_app.py does:
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port $PORT
+
+Requests beyond MAX_PENDING in flight get 503 with Retry-After, and each
+prediction is abandoned with 504 after REQUEST_TIMEOUT seconds. A pool
+whose worker died is replaced, and the batch that was in it gets 503.
+"""
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from inference import model_loader, predict_proba_batch, format_prediction
+from prediction_cache import PredictionCache
+
+INFERENCE_PROCESSES = int(os.environ.get('INFERENCE_PROCESSES', os.cpu_count() or 1))
+MAX_PENDING = int(os.environ.get('MAX_PENDING', 256))
+REQUEST_TIMEOUT = float(os.environ.get('REQUEST_TIMEOUT', 2))
+RETRY_AFTER = int(os.environ.get('RETRY_AFTER', 1))
+BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', 32))
+BATCH_MAX_WAIT_MS = float(os.environ.get('BATCH_MAX_WAIT_MS', 5))
+MODEL_WATCH_INTERVAL = float(os.environ.get('MODEL_WATCH_INTERVAL', 5))
+MAX_BODY_BYTES = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+# --- Inference processes ---
+def _init_worker():
+    try:
+        model_loader.warm()
+    except Exception:
+        pass  # an initializer error would break the pool; _score_batch retries and reports it
+
+
+def _score_batch(headlines):
+    model_loader.ensure_watcher(MODEL_WATCH_INTERVAL)
+    probs = predict_proba_batch(headlines)
+    return model_loader.version, model_loader.checksum, probs
+
+
+class AsyncBatcher:
+    """Event-loop counterpart of inference.MicroBatcher.
+
+    Headlines arriving within max_wait_ms of each other (up to
+    max_batch_size) are sent to the process pool as one batch.
+    """
+
+    def __init__(self, submit_batch, max_batch_size=32, max_wait_ms=5):
+        self.submit_batch = submit_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending = []
+        self._timer = None
+
+    async def predict(self, item):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        # Requests that already timed out are dropped before scoring
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+        try:
+            results = await self.submit_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class DetectorApp:
+    def __init__(self):
+        self.pool = None
+        self.batcher = None
+        self.in_flight = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.pool_restarts = 0
+        self.model_version = None
+        self.model_checksum = None
+        # Keyed by the artifact's sha256, like flask_app: a re-registered version string gets a fresh cache
+        self.cache = PredictionCache(
+            maxsize=int(os.environ.get('PREDICTION_CACHE_SIZE', 10000)),
+            ttl=float(os.environ.get('PREDICTION_CACHE_TTL', 3600)),
+            model_signature=lambda: self.model_checksum,
+            shared_path=os.environ.get('PREDICTION_CACHE_SHARED_PATH') or None,
+        )
+
+    def start(self):
+        if self.pool is not None:
+            return
+        self.pool = self._new_pool()
+        self.batcher = AsyncBatcher(self._submit_batch, BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS)
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=INFERENCE_PROCESSES, initializer=_init_worker)
+
+    def stop(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def warm(self):
+        """Load the model in a pool process before accepting traffic"""
+        try:
+            await self._submit_batch(['warm up the model'])
+        except Exception:
+            logger.exception('Model warm-up failed, /ready stays 503')
+
+    async def _submit_batch(self, headlines):
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        try:
+            version, checksum, results = await loop.run_in_executor(pool, _score_batch, headlines)
+        except BrokenProcessPool:
+            # Concurrent batches all see the same broken pool; only the first replaces it
+            if self.pool is pool:
+                logger.error('Inference process died, starting a new pool')
+                self.pool = self._new_pool()
+                self.pool_restarts += 1
+                pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        self.model_version = version
+        self.model_checksum = checksum
+        return results
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        self.start()
+        route = (scope['method'], scope['path'])
+        if route == ('POST', '/predict'):
+            status, body, headers = await self.predict(receive)
+        elif route == ('GET', '/health'):
+            status, body, headers = 200, self.health(), []
+        elif route == ('GET', '/ready'):
+            ready = self.model_version is not None
+            status, body, headers = (200 if ready else 503), {'ready': ready, 'model': self.model_version}, []
+        else:
+            status, body, headers = 404, {'error': 'not found'}, []
+        await _send_json(send, status, body, headers)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.start()
+                await self.warm()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.stop()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def predict(self, receive):
+        try:
+            payload = json.loads(await _read_body(receive) or b'{}')
+        except BodyTooLarge:
+            return 413, {'error': f'request body over {MAX_BODY_BYTES} bytes'}, []
+        except ValueError as e:
+            return 400, {'error': f'invalid request: {e}'}, []
+        headline = str(payload.get('headline', '')).strip() if isinstance(payload, dict) else ''
+        if not headline:
+            return 400, {'error': 'headline is required'}, []
+
+        probs = self.cache.get(headline)
+        if probs is not None:
+            return 200, format_prediction(headline, probs), []
+
+        # Backpressure: refuse new work rather than queueing without bound
+        if self.in_flight >= MAX_PENDING:
+            self.rejected += 1
+            return 503, {'error': 'server busy'}, [(b'retry-after', str(RETRY_AFTER).encode())]
+
+        self.in_flight += 1
+        try:
+            probs = await asyncio.wait_for(self.batcher.predict(headline), REQUEST_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return 504, {'error': 'prediction timed out'}, []
+        except Exception as e:
+            return 503, {'error': f'model unavailable: {e}'}, []
+        finally:
+            self.in_flight -= 1
+
+        self.cache.set(headline, probs)
+        return 200, format_prediction(headline, probs), []
+
+    def health(self):
+        return {
+            'status': 'healthy',
+            'model': self.model_version or 'not_loaded',
+            'version': '1.0',
+            'in_flight': self.in_flight,
+            'max_pending': MAX_PENDING,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+            'inference_processes': INFERENCE_PROCESSES,
+            'pool_restarts': self.pool_restarts,
+            'prediction_cache': self.cache.stats(),
+        }
+
+
+async def _read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY_BYTES:
+            raise BodyTooLarge()
+        if not message.get('more_body'):
+            return body
+
+
+async def _send_json(send, status, body, headers):
+    data = json.dumps(body).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(data)).encode())] + headers,
+    })
+    await send({'type': 'http.response.body', 'body': data})
+
+
+app = DetectorApp()
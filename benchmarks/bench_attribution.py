@@ -0,0 +1,60 @@
+"""Cost of per-headline attributions next to plain prediction.
+
+Run from the repository root:  python benchmarks/bench_attribution.py [path/to/pipeline.pkl]
+
+Without a path, a pipeline with the RF_ML.ipynb settings is fitted on
+synthetic headlines (see bench_forest_engine.py).
+"""
+import os
+import sys
+import timeit
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from attribution import ForestExplainer
+from bench_forest_engine import fit_pipeline, synthetic_headlines
+from forest_engine import CompiledPipeline
+from inference import FAKE_LABEL
+
+# Attributions run on every request to the page; keep them under this per headline
+LATENCY_BUDGET_MS = 5.0
+
+
+def main():
+    texts, labels = synthetic_headlines(6000)
+    if len(sys.argv) > 1:
+        pipeline = joblib.load(sys.argv[1])
+    else:
+        pipeline = fit_pipeline(texts[:4000], labels[:4000])
+    compiled = CompiledPipeline(pipeline)
+    explainer = ForestExplainer.from_pipeline(compiled, FAKE_LABEL)
+    sample = texts[4000:4200]
+
+    # Bias plus contributions must reproduce the model's probability
+    probability, _ = explainer.contributions(compiled.vectorizer.transform(sample))
+    fake_col = list(pipeline.classes_).index(FAKE_LABEL)
+    assert np.allclose(probability, pipeline.predict_proba(sample)[:, fake_col])
+    print(f'Additivity OK on {len(sample)} headlines\n')
+
+    number = 2
+    per_headline = 1e3 / (number * len(sample))
+    cases = [
+        ('sklearn predict_proba', lambda: [pipeline.predict_proba([t]) for t in sample]),
+        ('compiled predict_proba', lambda: [compiled.predict_proba([t]) for t in sample]),
+        ('compiled + attributions', lambda: [explainer.explain_texts([t]) for t in sample]),
+    ]
+    print(f"{'one headline per call':<26} {'ms/headline':>11}")
+    for name, fn in cases:
+        print(f'{name:<26} {timeit.timeit(fn, number=number) * per_headline:>11.2f}')
+
+    explain_ms = timeit.timeit(cases[-1][1], number=number) * per_headline
+    status = 'within' if explain_ms <= LATENCY_BUDGET_MS else 'OVER'
+    print(f'\nAttributions {status} the {LATENCY_BUDGET_MS:.1f} ms budget ({explain_ms:.2f} ms)')
+
+
+if __name__ == '__main__':
+    main()
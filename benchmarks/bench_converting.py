@@ -0,0 +1,161 @@
+"""Streaming CSV-to-RDF conversion vs the original in-memory rdflib loop.
+
+Run from the repository root:
+    python benchmarks/bench_converting.py --rows 1000000 --compare-rows 20000
+
+Generates a synthetic final_combined_results.csv, checks that the streaming
+converter produces exactly the triples of the original iterrows/Graph
+implementation on --compare-rows rows, then times both. Also compares file
+size and rdflib parse time of per-mention vs interned (--intern-entities)
+entity nodes on the --compare-rows file.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from rdflib import Graph, Literal, RDF
+from rdflib.namespace import XSD
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import converting
+from converting import EX
+
+NAMES = ['Donald Trump (PERSON)', 'Hillary Clinton (PERSON)', 'Russia (GPE)', 'FBI (ORG)',
+         'Washington (GPE)', 'Reuters (ORG)', 'Barack Obama (PERSON)', 'Congress (ORG)']
+
+
+def write_synthetic_csv(path, rows, seed=42):
+    rng = random.Random(seed)
+    chunk = 100000
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        pd.DataFrame({
+            'title': [f'Headline {start + i} about "things"\\ and stuff' for i in range(n)],
+            'label': [rng.choice(['true', 'fake']) for _ in range(n)],
+            'subject': [rng.choice(['politicsNews', 'worldnews', 'News', 'left-news']) for _ in range(n)],
+            'dominant_topic': [rng.choice([0, 1, 2, 3, 4, 5, 6, None]) for _ in range(n)],
+            'topic_terms': [rng.choice(['trump, say, president', 'state, government, official']) for _ in range(n)],
+            'entities_str': [
+                '; '.join(rng.sample(NAMES, rng.randint(0, 4))) + rng.choice(['', '; broken entry'])
+                for _ in range(n)
+            ],
+        }).to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+
+
+def legacy_graph(csv_path):
+    """The original converting.py loop, kept here as the baseline"""
+    df = pd.read_csv(csv_path)
+    g = Graph()
+    for idx, row in df.iterrows():
+        article_uri = EX[f"article_{idx}"]
+        g.add((article_uri, RDF.type, EX.Article))
+        g.add((article_uri, EX.title, Literal(row['title'], datatype=XSD.string)))
+        g.add((article_uri, EX.topicTerms, Literal(row['topic_terms'], datatype=XSD.string)))
+        label_uri = EX[f"label_{row['label'].strip().upper()}"]
+        g.add((article_uri, EX.hasLabel, label_uri))
+        g.add((label_uri, RDF.type, EX.TruthLabel))
+        subject_uri = EX[f"subject_{row['subject'].strip().lower()}"]
+        g.add((article_uri, EX.hasSubject, subject_uri))
+        g.add((subject_uri, RDF.type, EX.Subject))
+        if not pd.isna(row['dominant_topic']):
+            topic_uri = EX[f"topic_{int(row['dominant_topic'])}"]
+            g.add((article_uri, EX.hasTopic, topic_uri))
+            g.add((topic_uri, RDF.type, EX.Topic))
+        if isinstance(row['entities_str'], str):
+            entities = [e.strip() for e in row['entities_str'].split(';') if '(' in e and ')' in e]
+            for ent_idx, ent in enumerate(entities):
+                name, etype = ent.rsplit('(', 1)
+                entity_uri = EX[f"article_{idx}_entity_{ent_idx}"]
+                g.add((entity_uri, RDF.type, EX.Entity))
+                g.add((entity_uri, EX.entityName, Literal(name.strip(), datatype=XSD.string)))
+                g.add((entity_uri, EX.entityType, Literal(etype.replace(')', '').strip(), datatype=XSD.string)))
+                g.add((article_uri, EX.hasEntity, entity_uri))
+    return g
+
+
+def measured(fn, *args):
+    """Run fn and return (seconds, peak RSS in MB while it ran) for this process"""
+    # Reset the high-water mark inherited from the parent at fork (Linux only)
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+    start = time.perf_counter()
+    fn(*args)
+    seconds = time.perf_counter() - start
+    with open('/proc/self/status') as f:
+        hwm_kb = next(int(line.split()[1]) for line in f if line.startswith('VmHWM:'))
+    return seconds, hwm_kb / 1024
+
+
+def run_isolated(fn, *args):
+    """Run fn in a fresh process so one run's memory doesn't count against the next"""
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        return pool.apply(measured, (fn,) + args)
+
+
+def legacy_convert(csv_path, output):
+    legacy_graph(csv_path).serialize(output, format='turtle', encoding='utf-8')
+
+
+def parse_seconds(path):
+    start = time.perf_counter()
+    n = len(Graph().parse(path, format='turtle'))
+    return time.perf_counter() - start, n
+
+
+def compare_interning(csv_path, tmp):
+    for intern_entities in (False, True):
+        output = os.path.join(tmp, f'intern-{intern_entities}.ttl')
+        converting.convert(csv_path, output, intern_entities=intern_entities)
+        seconds, n = parse_seconds(output)
+        mode = 'interned entities' if intern_entities else 'per-mention entities'
+        print(f'{mode}: {os.path.getsize(output) / 1e6:.1f} MB, {n} triples, rdflib parse {seconds:.1f}s')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--compare-rows', type=int, default=20000)
+    parser.add_argument('--workers', type=int, nargs='*', default=[],
+                        help='also time converting.py --workers N for each N')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        small_csv = os.path.join(tmp, 'small.csv')
+        write_synthetic_csv(small_csv, args.compare_rows)
+        small_out = os.path.join(tmp, 'small.ttl')
+        converting.convert(small_csv, small_out, chunksize=5000)
+        expected = legacy_graph(small_csv)
+        actual = Graph().parse(small_out, format='turtle')
+        assert set(actual) == set(expected), 'streaming output differs from the original converter'
+        print(f'Equivalence OK: {len(expected)} identical triples on {args.compare_rows} rows')
+        del expected, actual
+        compare_interning(small_csv, tmp)
+
+        big_csv = os.path.join(tmp, 'big.csv')
+        write_synthetic_csv(big_csv, args.rows)
+        seconds, rss = run_isolated(converting.convert, big_csv, os.path.join(tmp, 'big.nt'))
+        print(f'Streaming converter: {seconds:.1f}s for {args.rows} rows '
+              f'({seconds / args.rows * 1e6:.0f} us/row), peak RSS {rss:.0f} MB')
+
+        for workers in args.workers:
+            # Pool processes can't have children, so this one runs in the benchmark process
+            start = time.perf_counter()
+            converting.convert_parallel(big_csv, os.path.join(tmp, f'big-{workers}.nt'), workers=workers)
+            seconds = time.perf_counter() - start
+            print(f'Streaming converter, {workers} workers: {seconds:.1f}s for {args.rows} rows '
+                  f'({args.rows / seconds:.0f} rows/s)')
+
+        seconds, rss = run_isolated(legacy_convert, small_csv, os.path.join(tmp, 'legacy.ttl'))
+        print(f'Original converter: {seconds:.1f}s for {args.compare_rows} rows '
+              f'({seconds / args.compare_rows * 1e6:.0f} us/row), peak RSS {rss:.0f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Parity check and timing for the flat-array forest engine.
+
+Run from the repository root:  python benchmarks/bench_forest_engine.py [path/to/pipeline.pkl]
+
+Without a path, a synthetic headline corpus is used to fit a pipeline with
+the same settings as RF_ML.ipynb (TF-IDF 1-2 grams, 5,000 features,
+150 trees, max_depth=50).
+"""
+import os
+import random
+import sys
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.pipeline import Pipeline
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from forest_engine import CompiledForest
+
+
+def synthetic_headlines(n, seed=42):
+    rng = random.Random(seed)
+    vocab = [f'w{i}' for i in range(3000)]
+    fake_words = vocab[:300]
+    real_words = vocab[300:600]
+    texts, labels = [], []
+    for _ in range(n):
+        label = rng.random() < 0.5
+        words = rng.sample(real_words if label else fake_words, 3) + rng.sample(vocab, 7)
+        rng.shuffle(words)
+        texts.append(' '.join(words))
+        labels.append(int(label))
+    return texts, labels
+
+
+def fit_pipeline(texts, labels):
+    pipeline = Pipeline([
+        ('tfidf', TfidfVectorizer(stop_words='english', ngram_range=(1, 2), max_features=5000)),
+        ('model', RandomForestClassifier(n_estimators=150, max_depth=50, random_state=42)),
+    ])
+    return pipeline.fit(texts, labels)
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    texts, labels = synthetic_headlines(6000)
+    if len(sys.argv) > 1:
+        pipeline = joblib.load(sys.argv[1])
+    else:
+        pipeline = fit_pipeline(texts[:4000], labels[:4000])
+
+    vectorizer = pipeline.steps[0][1]
+    forest = pipeline.steps[-1][1]
+    compiled = CompiledForest.from_estimator(forest)
+    X = vectorizer.transform(texts[4000:])
+
+    expected = forest.predict_proba(X)
+    for n_threads in (1, 4):
+        actual = compiled.predict_proba(X, n_threads=n_threads)
+        assert np.allclose(actual, expected), f'parity failed with n_threads={n_threads}'
+    print(f'Parity OK on {X.shape[0]} headlines ({compiled.n_trees} trees, '
+          f'{len(compiled.feature)} nodes, depth {compiled.max_depth})\n')
+
+    print(f"{'batch':>6} {'sklearn ms':>11} {'compiled ms':>12} {'compiled x4 ms':>15}")
+    for batch_size in (1, 32, 1024):
+        X_batch = X[:batch_size]
+        repeat = 20 if batch_size < 1024 else 5
+        sk = best_of(lambda: forest.predict_proba(X_batch), repeat)
+        flat = best_of(lambda: compiled.predict_proba(X_batch), repeat)
+        flat4 = best_of(lambda: compiled.predict_proba(X_batch, n_threads=4), repeat)
+        print(f'{batch_size:>6} {sk * 1e3:>11.2f} {flat * 1e3:>12.2f} {flat4 * 1e3:>15.2f}')
+
+
+if __name__ == '__main__':
+    main()
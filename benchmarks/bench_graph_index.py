@@ -0,0 +1,112 @@
+"""Latency of the /graph/* query endpoints answered from GraphIndex.
+
+Run from the repository root:
+    python benchmarks/bench_graph_index.py --rows 200000
+
+Converts a synthetic CSV with interned entities, writes the binary
+snapshot, builds the index the way flask_app.py does at startup and
+reports p50/p99 per query type, both for the index call alone and through
+the Flask test client.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import converting
+from graph_index import GraphIndex
+from graph_snapshot import write_snapshot
+
+ENTITY_TYPES = ['PERSON', 'ORG', 'GPE', 'NORP']
+
+
+def write_synthetic_csv(path, rows, n_entities=20000, seed=42):
+    """Articles mentioning entities drawn from a Zipf-like popularity curve"""
+    rng = np.random.default_rng(seed)
+    names = [f'Entity {i} ({ENTITY_TYPES[i % len(ENTITY_TYPES)]})' for i in range(n_entities)]
+    weights = 1.0 / np.arange(1, n_entities + 1)
+    weights /= weights.sum()
+    mentions = rng.choice(n_entities, size=(rows, 4), p=weights)
+    counts = rng.integers(0, 5, size=rows)
+    pd.DataFrame({
+        'title': [f'Headline {i}' for i in range(rows)],
+        'label': rng.choice(['true', 'fake'], size=rows),
+        'subject': rng.choice(['politicsNews', 'worldnews', 'News', 'left-news', 'Government News'], size=rows),
+        'dominant_topic': rng.choice([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, np.nan], size=rows),
+        'topic_terms': 'trump, say, president',
+        'entities_str': ['; '.join(names[e] for e in row[:n]) for row, n in zip(mentions, counts)],
+    }).to_csv(path, index=False)
+
+
+def percentiles(fn, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        times.append((time.perf_counter() - start) * 1000)
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'articles.csv')
+        ttl_path = os.path.join(tmp, 'articles.nt')
+        write_synthetic_csv(csv_path, args.rows)
+        converting.convert(csv_path, ttl_path, intern_entities=True)
+        write_snapshot(ttl_path, os.path.join(tmp, 'snapshot'))
+
+        start = time.perf_counter()
+        index = GraphIndex.from_path(os.path.join(tmp, 'snapshot'))
+        print(f'Index build: {time.perf_counter() - start:.2f}s for {index.stats()}')
+
+        os.environ['GRAPH_SNAPSHOT'] = os.path.join(tmp, 'snapshot')
+        import flask_app
+        client = flask_app.app.test_client()
+
+        labels, subjects, topics = index.values['label'], index.values['subject'], index.values['topic']
+        top = [e['id'] for e in index.top_entities(per_page=200)['entities']]
+        n = args.queries
+        workloads = {
+            'articles by label+topic': (
+                [dict(label=rng.choice(labels), topic=rng.choice(topics), page=rng.randint(1, 20)) for _ in range(n)],
+                lambda q: index.articles(**q),
+                lambda q: client.get('/graph/articles', query_string=q)),
+            'articles by subject': (
+                [dict(subject=rng.choice(subjects), page=rng.randint(1, 100)) for _ in range(n)],
+                lambda q: index.articles(**q),
+                lambda q: client.get('/graph/articles', query_string=q)),
+            'counts by label x topic': (
+                [dict(by='label,topic', subject=rng.choice(subjects)) for _ in range(n)],
+                lambda q: index.counts(by=q['by'].split(','), subject=q['subject']),
+                lambda q: client.get('/graph/counts', query_string=q)),
+            'top entities for label': (
+                [dict(label=rng.choice(labels), page=rng.randint(1, 5)) for _ in range(n)],
+                lambda q: index.top_entities(**q),
+                lambda q: client.get('/graph/entities/top', query_string=q)),
+            'entity neighbors': (
+                [rng.choice(top[:20]) if rng.random() < 0.5 else rng.choice(top) for _ in range(n)],
+                lambda q: index.neighbors(q),
+                lambda q: client.get(f'/graph/entities/{q}/neighbors')),
+        }
+        for name, (queries, direct, http) in workloads.items():
+            p50, p99 = percentiles(direct, queries)
+            http_p50, http_p99 = percentiles(http, queries)
+            print(f'{name:26s} index p50 {p50:6.2f} ms  p99 {p99:6.2f} ms | '
+                  f'HTTP p50 {http_p50:6.2f} ms  p99 {http_p99:6.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Parity check and per-headline cost of the headline TF-IDF fast path.
+
+Run from the repository root:  python benchmarks/bench_headline_vectorizer.py [path/to/pipeline.pkl]
+
+Without a path, a vectorizer with the RF_ML.ipynb settings is fitted on
+synthetic headlines.
+"""
+import os
+import random
+import sys
+import timeit
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from headline_vectorizer import HeadlineVectorizer
+from inference import clean_text
+
+WORDS = ('trump obama clinton senate house vote court judge says new tax bill plan report '
+         'russia china korea police attack election campaign president white watch video '
+         'breaking shocking secret leaked officials announce government minister talks deal').split()
+
+
+def synthetic_headlines(n, seed=42):
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))) for _ in range(n)]
+
+
+def main():
+    headlines = [clean_text(h) for h in synthetic_headlines(5000)]
+    if len(sys.argv) > 1:
+        vectorizer = joblib.load(sys.argv[1]).steps[0][1]
+    else:
+        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2), max_features=5000)
+        vectorizer.fit(headlines)
+
+    fast = HeadlineVectorizer.from_vectorizer(vectorizer)
+    expected = vectorizer.transform(headlines)
+    actual = fast.transform(headlines)
+    assert np.array_equal(expected.indptr, actual.indptr)
+    assert np.array_equal(expected.indices, actual.indices)
+    assert np.array_equal(expected.data, actual.data), 'values differ'
+    print(f'Parity OK: identical CSR output for {len(headlines)} headlines\n')
+
+    sample = headlines[:200]
+    number = 20
+    per_headline = 1e6 / (number * len(sample))
+    single_sk = timeit.timeit(lambda: [vectorizer.transform([h]) for h in sample], number=number)
+    single_fast = timeit.timeit(lambda: [fast.transform([h]) for h in sample], number=number)
+    batch_sk = timeit.timeit(lambda: vectorizer.transform(sample), number=number)
+    batch_fast = timeit.timeit(lambda: fast.transform(sample), number=number)
+    print(f"{'mode':<24} {'sklearn us':>11} {'fast path us':>13}")
+    print(f"{'one headline per call':<24} {single_sk * per_headline:>11.1f} {single_fast * per_headline:>13.1f}")
+    print(f"{'200 headlines per call':<24} {batch_sk * per_headline:>11.1f} {batch_fast * per_headline:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
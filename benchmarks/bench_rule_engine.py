@@ -0,0 +1,55 @@
+"""Compare the compiled rule engine against per-indicator substring scans.
+
+Run from the repository root:  python benchmarks/bench_rule_engine.py
+"""
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rule_engine import RuleEngine, DEFAULT_RULES
+
+HEADLINES = [
+    "BREAKING NEWS: OBAMA'S SECRET PLAN TO DESTROY AMERICA Finally Exposed by Whistleblower",
+    "Chinese officials announce new trade agreement with European partners",
+    "Federal judge partially lifts Trump's latest refugee restrictions",
+    "Sanders supporters seethe over Clinton's leaked remarks to Wall Street",
+]
+
+
+def synthetic_rules(n, seed=42):
+    """Default rules padded with random two-word indicators up to n in total"""
+    rng = random.Random(seed)
+    rules = {category: list(indicators) for category, indicators in DEFAULT_RULES.items()}
+    word = lambda: ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+    while sum(len(v) for v in rules.values()) < n:
+        rules[rng.choice(list(rules))].append(f'{word()} {word()}')
+    return rules
+
+
+def naive_match(rules, headline):
+    headline_lower = headline.lower()
+    return {category for category, indicators in rules.items()
+            if any(indicator in headline_lower for indicator in indicators)}
+
+
+def main():
+    repeat = 2000
+    print(f"{'rules':>7} {'naive us/headline':>18} {'automaton us/headline':>22}")
+    for n in (38, 100, 1000, 5000, 20000):
+        rules = synthetic_rules(n)
+        engine = RuleEngine(rules)
+        for headline in HEADLINES:
+            assert engine.categories(headline) == naive_match(rules, headline)
+
+        naive = timeit.timeit(lambda: [naive_match(rules, h) for h in HEADLINES], number=repeat)
+        fast = timeit.timeit(lambda: [engine.categories(h) for h in HEADLINES], number=repeat)
+        per_call = 1e6 / (repeat * len(HEADLINES))
+        print(f'{n:>7} {naive * per_call:>18.2f} {fast * per_call:>22.2f}')
+
+
+if __name__ == '__main__':
+    main()
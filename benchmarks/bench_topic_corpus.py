@@ -0,0 +1,91 @@
+"""Peak memory of building the LDA corpus as Python lists vs streaming it to disk.
+
+Run from the repository root:
+    python benchmarks/bench_topic_corpus.py --docs 100000
+
+Writes a synthetic token file (one article per line), then in a fresh
+process per approach builds the dictionary and BoW corpus and iterates
+it once, the way LDA training would:
+
+    lists   the notebook: documents and [doc2bow(doc) ...] held in memory
+    stream  topic_corpus: TokenFile -> build_dictionary -> serialize_corpus
+
+Reports peak RSS of each process next to one that only imports the
+modules, and wall time.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topic_corpus import TokenFile, build_dictionary, serialize_corpus, write_token_file
+
+
+def write_synthetic_tokens(path, n_docs, vocab=50000, mean_length=250, seed=0):
+    """Zipf-distributed word ids, written in blocks so the generator itself stays small"""
+    rng = np.random.default_rng(seed)
+    words = np.array([f'word{i}' for i in range(vocab)], dtype=object)
+    weights = 1.0 / np.arange(1, vocab + 1)
+    weights /= weights.sum()
+    write_token_file([], path)
+    for start in range(0, n_docs, 10000):
+        lengths = rng.poisson(mean_length, min(10000, n_docs - start))
+        ids = rng.choice(vocab, lengths.sum(), p=weights)
+        write_token_file(np.split(words[ids], np.cumsum(lengths)[:-1]), path, mode='a')
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(mode, tokens_path, prefix):
+    start = time.perf_counter()
+    if mode == 'imports':
+        print(f'{mode:7s} peak {peak_rss_mb():8.1f} MB')
+        return
+    if mode == 'lists':
+        documents = [line.split() for line in open(tokens_path, encoding='utf-8')]
+        dictionary = build_dictionary(documents, no_below=5)
+        corpus = [dictionary.doc2bow(doc) for doc in documents]
+    else:
+        documents = TokenFile(tokens_path)
+        dictionary = build_dictionary(documents, no_below=5)
+        corpus = serialize_corpus(documents, dictionary, prefix, npz=False)
+    n_nnz = sum(len(doc) for doc in corpus)
+    print(f'{mode:7s} peak {peak_rss_mb():8.1f} MB  {time.perf_counter() - start:7.1f}s  '
+          f'({n_nnz} nonzeros, {len(dictionary)} terms)')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=100000)
+    parser.add_argument('--mode', choices=['imports', 'lists', 'stream'], help=argparse.SUPPRESS)
+    parser.add_argument('--tokens', help=argparse.SUPPRESS)
+    parser.add_argument('--prefix', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode, args.tokens, args.prefix)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tokens_path = os.path.join(tmp, 'tokens.txt')
+        write_synthetic_tokens(tokens_path, args.docs)
+        print(f'{args.docs} documents, token file {os.path.getsize(tokens_path) / 1e6:.0f} MB')
+        for mode in ('imports', 'lists', 'stream'):
+            # A fresh process per approach so peak RSS is not shared
+            subprocess.run([sys.executable, __file__, '--mode', mode, '--tokens', tokens_path,
+                            '--prefix', os.path.join(tmp, 'corpus')], check=True)
+        print(f"serialized corpus {os.path.getsize(os.path.join(tmp, 'corpus.mm')) / 1e6:.0f} MB on disk")
+
+
+if __name__ == '__main__':
+    main()
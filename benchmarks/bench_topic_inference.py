@@ -0,0 +1,77 @@
+"""Headline topic inference: TopicInferencer batches vs gensim get_document_topics.
+
+Run from the repository root:
+    python benchmarks/bench_topic_inference.py --headlines 2000
+
+Trains LDA on a synthetic corpus, exports it the way topic_model.py
+--export does, and times per-headline latency for several batch sizes
+against one get_document_topics call per headline. Tokenization is left
+out of both sides; agreement is against gensim with the same iteration cap.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topic_corpus import build_dictionary
+from topic_inference import TOPIC_MAX_ITERATIONS, TopicInferencer
+from topic_model import export_topic_model, train_lda
+
+
+def sampler(vocab=5000, num_topics=7, seed=0):
+    rng = np.random.default_rng(seed)
+    topic_words = rng.dirichlet(np.full(vocab, 0.02), num_topics)
+
+    def sample(length):
+        counts = rng.multinomial(length, rng.dirichlet(np.full(num_topics, 0.2)))
+        return [f'w{word}' for k, n in enumerate(counts) for word in rng.choice(vocab, n, p=topic_words[k])]
+    return sample, rng
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=5000)
+    parser.add_argument('--headlines', type=int, default=2000)
+    parser.add_argument('--num-topics', type=int, default=7)
+    args = parser.parse_args()
+
+    sample, rng = sampler(num_topics=args.num_topics)
+    documents = [sample(rng.integers(50, 200)) for _ in range(args.docs)]
+    dictionary = build_dictionary(documents, no_below=2)
+    lda = train_lda([dictionary.doc2bow(doc) for doc in documents], dictionary, args.num_topics, passes=5)
+    headlines = [sample(rng.integers(3, 15)) for _ in range(args.headlines)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'topic_model.npz')
+        export_topic_model(lda, path)
+        # Headlines are already token lists here
+        inferencer = TopicInferencer.from_path(path, tokenizer=lambda texts: texts)
+
+    lda.iterations = TOPIC_MAX_ITERATIONS
+    start = time.perf_counter()
+    reference = np.array([[p for _, p in lda.get_document_topics(dictionary.doc2bow(h), minimum_probability=0.0)]
+                          for h in headlines])
+    gensim_ms = (time.perf_counter() - start) * 1000 / len(headlines)
+    print(f'gensim get_document_topics  {gensim_ms:6.3f} ms/headline')
+
+    for batch_size in (1, 8, 32, 128, 512):
+        start = time.perf_counter()
+        for i in range(0, len(headlines), batch_size):
+            inferencer.infer(headlines[i:i + batch_size])
+        elapsed = (time.perf_counter() - start) * 1000
+        calls = -(-len(headlines) // batch_size)
+        print(f'TopicInferencer batch {batch_size:4d} {elapsed / len(headlines):6.3f} ms/headline, '
+              f'{elapsed / calls:6.2f} ms/call')
+
+    theta = inferencer.distributions(headlines)
+    print(f'dominant topic agreement with gensim {(theta.argmax(1) == reference.argmax(1)).mean():.2%}, '
+          f'mean |difference| {np.abs(theta - reference).mean():.4f}')
+
+
+if __name__ == '__main__':
+    main()
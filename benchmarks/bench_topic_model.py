@@ -0,0 +1,71 @@
+"""Topic assignment and training time: per-document loop vs batched doc-topic matrix.
+
+Run from the repository root:
+    python benchmarks/bench_topic_model.py --docs 20000 --workers 4
+
+Samples a synthetic corpus from a known LDA model, trains with LdaModel,
+LdaMulticore and a single online pass, then times the notebook's
+per-document get_document_topics loop against topic_columns() and
+reports how often the two agree on the dominant topic.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topic_model import build_dictionary, topic_columns, train_lda
+
+
+def synthetic_documents(n_docs, vocab=5000, num_topics=7, mean_length=150, seed=0):
+    rng = np.random.default_rng(seed)
+    topic_words = rng.dirichlet(np.full(vocab, 0.05), num_topics)
+    documents = []
+    for _ in range(n_docs):
+        counts = rng.multinomial(rng.poisson(mean_length), rng.dirichlet(np.full(num_topics, 0.2)))
+        words = np.concatenate([rng.choice(vocab, n, p=topic_words[k]) for k, n in enumerate(counts)])
+        documents.append([f'w{word}' for word in words])
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--num-topics', type=int, default=7)
+    parser.add_argument('--passes', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    documents = synthetic_documents(args.docs, num_topics=args.num_topics)
+    dictionary = build_dictionary(documents, no_below=5)
+    corpus = [dictionary.doc2bow(doc) for doc in documents]
+
+    for name, kwargs in (('LdaModel', {}), (f'LdaMulticore x{args.workers}', {'workers': args.workers}),
+                         ('online update()', {'online': True})):
+        start = time.perf_counter()
+        lda = train_lda(corpus, dictionary, args.num_topics, args.passes, **kwargs)
+        print(f'train {name:20s} {time.perf_counter() - start:7.2f}s')
+
+    start = time.perf_counter()
+    loop = [max(lda.get_document_topics(bow, minimum_probability=0.0), key=lambda t: t[1])[0] for bow in corpus]
+    terms = [', '.join(word for word, _ in lda.show_topic(topic, 10)) for topic in loop]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = topic_columns(lda, corpus)
+    batched_seconds = time.perf_counter() - start
+
+    assigned = columns['dominant_topic'].notna().to_numpy()
+    agree = (columns['dominant_topic'].to_numpy()[assigned] == np.asarray(loop)[assigned]).mean()
+    same_terms = (columns['topic_terms'].to_numpy()[assigned] == np.asarray(terms, dtype=object)[assigned]).mean()
+    print(f'per-document loop  {loop_seconds:7.2f}s')
+    print(f'topic_columns()    {batched_seconds:7.2f}s  ({loop_seconds / batched_seconds:.1f}x)')
+    print(f'dominant topic agreement {agree:.2%}, topic_terms agreement {same_terms:.2%} '
+          f'(inference starts from a random gamma, so borderline documents can flip)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Throughput of topic-modeling preprocessing: per-text apply vs nlp.pipe vs cache.
+
+Run from the repository root:
+    python benchmarks/bench_topic_preprocessing.py --docs 5000 --n-process 4
+
+Lemmatizes synthetic article texts the way the notebook used to (one
+nlp() call per text), then with lemmatize() cold and with a warm token
+cache, and checks that all three produce the same tokens.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from topic_preprocessing import MIN_TOKEN_LENGTH, SPACY_MODEL, lemmatize, load_nlp, normalize
+
+WORDS = ('the president said on Tuesday that 2017 budget talks with Congress, were "productive" and '
+         'officials expect an agreement soon; critics disagreed strongly about taxes, healthcare reform, '
+         'immigration policy, trade deals and military spending in Washington').split()
+
+
+def synthetic_texts(n, length=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return [' '.join(rng.choice(WORDS, length)) for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=5000)
+    parser.add_argument('--model', default=SPACY_MODEL)
+    parser.add_argument('--n-process', type=int, default=1)
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.docs)
+    nlp = load_nlp(args.model)
+    stop_words = nlp.Defaults.stop_words
+
+    start = time.perf_counter()
+    expected = [[token.lemma_ for token in nlp(normalize(text))
+                 if token.text not in stop_words and len(token.text) >= MIN_TOKEN_LENGTH] for text in texts]
+    print(f'{"apply:":14s}{time.perf_counter() - start:6.2f}s')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'tokens.db')
+        for name in ('pipe (cold)', 'pipe (cached)'):
+            start = time.perf_counter()
+            tokens = lemmatize(texts, nlp=nlp, cache_path=cache_path, n_process=args.n_process)
+            print(f'{name + ":":14s}{time.perf_counter() - start:6.2f}s')
+            assert tokens == expected
+
+
+if __name__ == '__main__':
+    main()
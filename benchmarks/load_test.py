@@ -0,0 +1,88 @@
+"""Closed-loop load test for the /predict endpoint.
+
+Start a server first, e.g. the Procfile setup or the async entry point:
+
+    PORT=8000 gunicorn -c gunicorn.conf.py flask_app:app
+    uvicorn asgi_app:app --port 8001
+
+then run:  python benchmarks/load_test.py http://127.0.0.1:8000 --concurrency 64 --requests 5000
+"""
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+HEADLINES = [
+    "BREAKING NEWS: OBAMA'S SECRET PLAN TO DESTROY AMERICA Finally Exposed by Whistleblower",
+    "Chinese officials announce new trade agreement with European partners",
+    "Federal judge partially lifts Trump's latest refugee restrictions",
+    "Sanders supporters seethe over Clinton's leaked remarks to Wall Street",
+    "British parliament votes on healthcare legislation amid public debate",
+]
+
+
+def run_client(url, n_requests, unique, latencies, statuses, lock):
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    rng = random.Random()
+    for _ in range(n_requests):
+        headline = rng.choice(HEADLINES)
+        if unique:
+            # Defeat the prediction cache so every request reaches the model
+            headline = f'{headline} {rng.randrange(10**9)}'
+        body = json.dumps({'headline': headline})
+        start = time.perf_counter()
+        try:
+            conn.request('POST', '/predict', body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+            status = 'error'
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] += 1
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('url')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--cached', action='store_true', help='reuse headlines so the cache can hit')
+    args = parser.parse_args()
+
+    latencies, statuses, lock = [], Counter(), threading.Lock()
+    per_client = args.requests // args.concurrency
+    threads = [
+        threading.Thread(target=run_client, args=(args.url, per_client, not args.cached, latencies, statuses, lock))
+        for _ in range(args.concurrency)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    print(f'{args.url}  concurrency={args.concurrency}  requests={len(latencies)}')
+    print(f'  throughput  {len(latencies) / wall:8.1f} req/s')
+    print(f'  p50         {percentile(latencies, 0.50) * 1e3:8.1f} ms')
+    print(f'  p99         {percentile(latencies, 0.99) * 1e3:8.1f} ms')
+    print(f'  statuses    {dict(statuses)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,24 @@
+import argparse
+import json
+import os
+import shutil
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from urllib.parse import quote
+
 import pandas as pd
-from rdflib import Graph, Namespace, Literal, RDF
+from rdflib import Namespace, RDF
 from rdflib.namespace import XSD
 
-# Load CSV
-df = pd.read_csv('final_combined_results.csv')
+from graph_snapshot import snapshot_path_for, write_snapshot
+
+INPUT_CSV = 'final_combined_results.csv'
+OUTPUT_TTL = 'articles_data2.ttl'
+CHUNK_SIZE = 50000
 
-# Create RDF graph
-g = Graph()
 EX = Namespace("http://example.org/misinfo#")
-g.bind("ex", EX)
 
 # Define classes
 ARTICLE = EX.Article
@@ -27,42 +37,452 @@ hasEntity = EX.hasEntity
 entityName = EX.entityName
 entityType = EX.entityType
 
-# Iterate through each row
-for idx, row in df.iterrows():
-    article_uri = EX[f"article_{idx}"]
-    g.add((article_uri, RDF.type, ARTICLE))
-    g.add((article_uri, title, Literal(row['title'], datatype=XSD.string)))
-    g.add((article_uri, topicTerms, Literal(row['topic_terms'], datatype=XSD.string)))
 
-    # Add object properties
-    label_uri = EX[f"label_{row['label'].strip().upper()}"]
-    g.add((article_uri, hasLabel, label_uri))
-    g.add((label_uri, RDF.type, TRUTHLABEL))
+# --- N-Triples term formatting (vectorized over pandas Series) ---
+def iri(term):
+    return f'<{term}>'
+
+
+def ex_iris(local_names):
+    """Series of local names -> Series of <http://example.org/misinfo#name> IRIs"""
+    return f'<{EX}' + local_names + '>'
+
+
+def encoded_iris(local_names):
+    """ex_iris of local names taken from the data, percent-encoded (a space becomes %20).
+
+    Each distinct name is encoded once rather than once per row.
+    """
+    unique = local_names.unique()
+    encoded = dict(zip(unique, (quote(name, safe='') for name in unique)))
+    return ex_iris(local_names.map(encoded))
+
+
+def string_literals(values):
+    """Series of values -> Series of "..."^^xsd:string literals, escaped like rdflib's N-Triples"""
+    escaped = (
+        # map(str), not astype(str): missing values must become 'nan' like Literal(nan) did, not stay NaN
+        values.map(str)
+        .str.replace('\\', '\\\\', regex=False)
+        .str.replace('\n', '\\n', regex=False)
+        .str.replace('"', '\\"', regex=False)
+        .str.replace('\r', '\\r', regex=False)
+    )
+    return '"' + escaped + f'"^^<{XSD.string}>'
+
+
+def triple_lines(subjects, predicate, objects):
+    """Series of N-Triples statements; predicate is a single term shared by all rows"""
+    return subjects + f' {iri(predicate)} ' + objects + ' .\n'
+
+
+def parse_entities(entities_str):
+    """Explode 'Name (TYPE); ...' strings into one row per entity.
+
+    Returns a DataFrame with columns article (the row index), ent_idx, name
+    and etype. ent_idx counts only well-formed entries, as the original
+    per-row loop did.
+    """
+    entities_str = entities_str[entities_str.map(lambda v: isinstance(v, str))]
+    # A chunk with no entities at all reads as a float column; there is nothing to split
+    parts = entities_str.astype(object).str.split(';').explode().str.strip()
+    parts = parts[parts.str.contains('(', regex=False) & parts.str.contains(')', regex=False)]
+    if parts.empty:
+        return pd.DataFrame({'article': [], 'ent_idx': [], 'name': [], 'etype': []})
+    split = parts.str.rsplit('(', n=1, expand=True)
+    entities = pd.DataFrame({
+        'ent_idx': parts.groupby(level=0).cumcount(),
+        'name': split[0].str.strip(),
+        'etype': split[1].str.replace(')', '', regex=False).str.strip(),
+    })
+    # Several entities share an article index; a unique index keeps Series arithmetic aligned
+    return entities.rename_axis('article').reset_index()
+
+
+def entity_keys(entities):
+    """Normalized (name, type) key of each mention: NFKC, collapsed whitespace, casefolded name"""
+    names = entities['name'].map(lambda name: ' '.join(unicodedata.normalize('NFKC', name).split()).casefold())
+    return names, entities['etype'].str.upper()
+
+
+def entity_iris(entities):
+    """Canonical entity_{TYPE}_{name} IRIs shared by every mention of the same entity.
+
+    The local name is percent-encoded as a whole (a space becomes %20), so
+    distinct keys such as 'a b' and 'a_b' get distinct IRIs.
+    """
+    names, etypes = entity_keys(entities)
+    return encoded_iris('entity_' + etypes + '_' + names)
+
 
-    subject_uri = EX[f"subject_{row['subject'].strip().lower()}"]
-    g.add((article_uri, hasSubject, subject_uri))
-    g.add((subject_uri, RDF.type, SUBJECT))
+def label_iris(chunk):
+    return encoded_iris('label_' + chunk['label'].astype(str).str.strip().str.upper())
 
-    if not pd.isna(row['dominant_topic']):
-        topic_uri = EX[f"topic_{int(row['dominant_topic'])}"]
-        g.add((article_uri, hasTopic, topic_uri))
-        g.add((topic_uri, RDF.type, TOPIC))
+
+def subject_iris(chunk):
+    # ISOT subjects contain spaces ("Government News"), which an IRI cannot
+    return encoded_iris('subject_' + chunk['subject'].astype(str).str.strip().str.lower())
+
+
+def topic_iris(chunk):
+    """Topic IRIs for the rows that have a dominant topic (index aligned with chunk)"""
+    topics = chunk['dominant_topic'].dropna()
+    return ex_iris('topic_' + topics.astype(float).astype(int).astype(str))
+
+
+def article_triples(chunk, intern_entities=False):
+    """Yield Series of N-Triples lines for every article in a CSV chunk.
+
+    With intern_entities, mentions point at canonical entity nodes (one
+    hasEntity edge per article and entity); the entity nodes themselves are
+    described by type_triples.
+    """
+    articles = ex_iris('article_' + chunk.index.to_series().astype(str))
+    yield triple_lines(articles, RDF.type, iri(ARTICLE))
+    yield triple_lines(articles, title, string_literals(chunk['title']))
+    # Articles without a dominant topic have no terms either (an empty cell, read as NaN)
+    terms = chunk['topic_terms'].dropna()
+    yield triple_lines(articles[terms.index], topicTerms, string_literals(terms))
+    yield triple_lines(articles, hasLabel, label_iris(chunk))
+    yield triple_lines(articles, hasSubject, subject_iris(chunk))
+    topics = topic_iris(chunk)
+    yield triple_lines(articles[topics.index], hasTopic, topics)
 
     # Add named entities
-    if isinstance(row['entities_str'], str):
-        entities = [e.strip() for e in row['entities_str'].split(';') if '(' in e and ')' in e]
-        for ent_idx, ent in enumerate(entities):
-            try:
-                name, etype = ent.rsplit('(', 1)
-                name = name.strip()
-                etype = etype.replace(')', '').strip()
-                entity_uri = EX[f"article_{idx}_entity_{ent_idx}"]
-                g.add((entity_uri, RDF.type, ENTITY))
-                g.add((entity_uri, entityName, Literal(name, datatype=XSD.string)))
-                g.add((entity_uri, entityType, Literal(etype, datatype=XSD.string)))
-                g.add((article_uri, hasEntity, entity_uri))
-            except ValueError:
-                continue  # skip malformed entries
-
-# Save to Turtle file
-g.serialize("articles_data2.ttl", format="turtle", encoding="utf-8")
+    entities = parse_entities(chunk['entities_str'])
+    if intern_entities:
+        if not entities.empty:
+            mentions = pd.DataFrame({
+                'article': ex_iris('article_' + entities['article'].astype(str)),
+                'entity': entity_iris(entities),
+            }).drop_duplicates()
+            yield triple_lines(mentions['article'], hasEntity, mentions['entity'])
+    elif not entities.empty:
+        article_ids = entities['article'].astype(str)
+        entity_articles = ex_iris('article_' + article_ids)
+        entity_nodes = ex_iris('article_' + article_ids + '_entity_' + entities['ent_idx'].astype(str))
+        yield triple_lines(entity_nodes, RDF.type, iri(ENTITY))
+        yield triple_lines(entity_nodes, entityName, string_literals(entities['name']))
+        yield triple_lines(entity_nodes, entityType, string_literals(entities['etype']))
+        yield triple_lines(entity_articles, hasEntity, entity_nodes)
+
+
+def unseen(lines, seen_types):
+    lines = pd.Series(lines.unique())
+    new = lines[~lines.isin(seen_types)]
+    seen_types.update(new)
+    return new
+
+
+def type_triples(chunk, seen_types, intern_entities=False):
+    """Yield label/subject/topic type statements not already in seen_types.
+
+    Many articles share the same label, subject and topic nodes; an rdflib
+    Graph would hold each type statement once, so the output does too. With
+    intern_entities the canonical entity nodes are described the same way,
+    with one entityName per distinct surface form.
+    """
+    for nodes, cls in ((label_iris(chunk), TRUTHLABEL), (subject_iris(chunk), SUBJECT), (topic_iris(chunk), TOPIC)):
+        yield unseen(triple_lines(pd.Series(nodes.unique()), RDF.type, iri(cls)), seen_types)
+
+    if intern_entities:
+        entities = parse_entities(chunk['entities_str'])
+        if not entities.empty:
+            nodes = entity_iris(entities)
+            surface_names = entities['name'].map(lambda name: ' '.join(name.split()))
+            yield unseen(triple_lines(nodes, RDF.type, iri(ENTITY)), seen_types)
+            yield unseen(triple_lines(nodes, entityName, string_literals(surface_names)), seen_types)
+            yield unseen(triple_lines(nodes, entityType, string_literals(entity_keys(entities)[1])), seen_types)
+
+
+def chunk_triples(chunk, seen_types, intern_entities=False):
+    """Yield Series of N-Triples lines for one CSV chunk"""
+    yield from article_triples(chunk, intern_entities)
+    yield from type_triples(chunk, seen_types, intern_entities)
+
+
+def write_header(out, output):
+    if not output.endswith('.nt'):
+        out.write(f'@prefix ex: <{EX}> .\n\n')
+
+
+def convert(input_csv=INPUT_CSV, output=OUTPUT_TTL, chunksize=CHUNK_SIZE, intern_entities=False):
+    """Stream the CSV into an N-Triples/Turtle file chunk by chunk.
+
+    N-Triples is a subset of Turtle, so the same statements are written to
+    either format; the Turtle file only gains a prefix declaration. Memory
+    is bounded by the chunk size, not the corpus.
+    """
+    seen_types = set()
+    n_triples = 0
+    with open(output, 'w', encoding='utf-8') as out:
+        write_header(out, output)
+        for chunk in pd.read_csv(input_csv, chunksize=chunksize):
+            for lines in chunk_triples(chunk, seen_types, intern_entities):
+                out.write(''.join(lines))
+                n_triples += len(lines)
+    return n_triples
+
+
+# --- Parallel conversion ---
+def convert_shard(chunk, shard_path, intern_entities=False):
+    """Convert one row range in a worker process.
+
+    URIs come from the chunk's index, which read_csv numbers globally, so
+    article_{idx} and article_{idx}_entity_{ent_idx} match a serial run.
+    Type statements are returned instead of written so the parent can
+    deduplicate them across shards.
+    """
+    n_triples = 0
+    with open(shard_path, 'w', encoding='utf-8') as out:
+        for lines in article_triples(chunk, intern_entities):
+            out.write(''.join(lines))
+            n_triples += len(lines)
+    types = set()
+    for lines in type_triples(chunk, types, intern_entities):
+        pass
+    return n_triples, types
+
+
+def convert_parallel(input_csv=INPUT_CSV, output=OUTPUT_TTL, chunksize=CHUNK_SIZE, workers=2,
+                     shard_dir=None, merge=True, intern_entities=False):
+    """Convert row ranges in worker processes, one N-Triples shard per range.
+
+    The parent only parses the CSV and hands chunks out, keeping at most
+    2 * workers chunks in flight. Shards land in shard_dir as
+    part-00000.nt, part-00001.nt, ... plus types.nt with the deduplicated
+    type statements; with merge=True they are concatenated in row order
+    into output and removed.
+    """
+    shard_dir = shard_dir or output + '.shards'
+    os.makedirs(shard_dir, exist_ok=True)
+    shard_paths = []
+    seen_types = set()
+    n_triples = 0
+
+    def collect(future):
+        nonlocal n_triples
+        count, types = future.result()
+        n_triples += count
+        seen_types.update(types)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for shard_no, chunk in enumerate(pd.read_csv(input_csv, chunksize=chunksize)):
+            shard_path = os.path.join(shard_dir, f'part-{shard_no:05d}.nt')
+            shard_paths.append(shard_path)
+            pending.append(pool.submit(convert_shard, chunk, shard_path, intern_entities))
+            if len(pending) >= 2 * workers:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+
+    types_path = os.path.join(shard_dir, 'types.nt')
+    with open(types_path, 'w', encoding='utf-8') as out:
+        out.write(''.join(sorted(seen_types)))
+    n_triples += len(seen_types)
+
+    if merge:
+        with open(output, 'w', encoding='utf-8') as out:
+            write_header(out, output)
+            for path in shard_paths + [types_path]:
+                with open(path, 'r', encoding='utf-8') as shard:
+                    shutil.copyfileobj(shard, out, 1 << 20)
+                os.remove(path)
+        os.rmdir(shard_dir)
+    return n_triples
+
+
+# --- Incremental updates ---
+FINGERPRINT_COLUMNS = ['title', 'label', 'subject', 'dominant_topic', 'topic_terms', 'entities_str']
+# Bumped whenever row_fingerprints or the statements for a row change; an older manifest triggers a full build
+MANIFEST_VERSION = 4
+
+
+def canonical_strings(values):
+    """A column as strings that do not depend on the dtype pandas inferred for its chunk.
+
+    One empty dominant_topic turns a chunk's int64 column into float64, so
+    numbers are compared as floats; missing values become ''.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        values = values.astype('float64')
+    return values.astype(str).where(values.notna(), '')
+
+
+def row_fingerprints(chunk):
+    """64-bit content hash of every row, keyed by article index"""
+    return pd.util.hash_pandas_object(chunk[FINGERPRINT_COLUMNS].apply(canonical_strings), index=False)
+
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return {
+        'hashes': {int(idx): h for idx, h in manifest['hashes'].items()},
+        'types': set(manifest['types']),
+        'intern_entities': manifest.get('intern_entities', False),
+    }
+
+
+def save_manifest(path, hashes, types, intern_entities=False):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'hashes': {str(idx): h for idx, h in hashes.items()},
+                   'types': sorted(types), 'intern_entities': intern_entities}, f)
+    os.replace(tmp_path, path)
+
+
+def article_index(line):
+    """Article index a statement belongs to (via its subject), or None"""
+    prefix = f'<{EX}article_'
+    if not line.startswith(prefix):
+        return None
+    local = line[len(prefix):line.index('>')]
+    return int(local.split('_', 1)[0])
+
+
+def convert_incremental(input_csv=INPUT_CSV, output=OUTPUT_TTL, manifest_path=None, delta_path=None,
+                        chunksize=CHUNK_SIZE, intern_entities=False):
+    """Update the snapshot in output with only the articles that changed.
+
+    The manifest records a content fingerprint per article index. New and
+    changed rows are converted; statements about changed and removed
+    articles are dropped from the snapshot. Label, subject, topic (and
+    interned entity) type statements are recomputed from every row, so a
+    node no article uses any more loses its statements as it would in a
+    full rebuild. The delta is a SPARQL Update (DELETE DATA / INSERT DATA)
+    that turns the previous snapshot into the new one, e.g. for graphs.py's
+    persistent store.
+
+    Articles are keyed by row position, because that is what their IRIs
+    (article_{idx}) are made of. When rows were only appended, the snapshot
+    is appended to in place, so the cost is one hashing pass over the CSV
+    plus conversion of the new rows. Inserting or deleting a row anywhere
+    else renumbers every row after it, and all of those are rewritten.
+    Without a manifest, or when it was written with a different
+    intern_entities setting or fingerprint version, this does a full build
+    and writes one.
+    """
+    manifest_path = manifest_path or output + '.manifest.json'
+    delta_path = delta_path or os.path.splitext(output)[0] + '.delta.ru'
+    manifest = load_manifest(manifest_path) if os.path.exists(output) else None
+    if manifest is not None and manifest['intern_entities'] != intern_entities:
+        manifest = None
+    old_hashes = manifest['hashes'] if manifest else {}
+    old_types = manifest['types'] if manifest else set()
+    previous = pd.Series(old_hashes, dtype='uint64')
+
+    # Pass over the CSV: fingerprint every row, keep only new/changed ones, collect the type statements
+    hashes = {}
+    types = set()
+    pending = []
+    changed = set()
+    for chunk in pd.read_csv(input_csv, chunksize=chunksize):
+        for _ in type_triples(chunk, types, intern_entities):
+            pass
+        fingerprints = row_fingerprints(chunk)
+        hashes.update(zip(chunk.index.tolist(), fingerprints.tolist()))
+        known = fingerprints[fingerprints.index.isin(previous.index)]
+        changed_rows = known.index[known.to_numpy() != previous.reindex(known.index).to_numpy()]
+        changed.update(changed_rows.tolist())
+        todo = ~chunk.index.isin(known.index) | chunk.index.isin(changed_rows)
+        if todo.any():
+            pending.append(chunk[todo])
+    removed = set(old_hashes) - set(hashes)
+    stale = changed | removed
+    added_types = sorted(types - old_types)
+    removed_types = old_types - types
+
+    counts = {'added_articles': len(hashes) - len(old_hashes) + len(removed),
+              'changed_articles': len(changed), 'removed_articles': len(removed),
+              'deleted_triples': 0, 'inserted_triples': 0}
+
+    with open(delta_path, 'w', encoding='utf-8') as delta:
+        delta.write('DELETE DATA {\n')
+        if manifest is None:
+            snapshot = open(output, 'w', encoding='utf-8')
+            write_header(snapshot, output)
+        elif stale or removed_types:
+            # Rewrite the snapshot without statements about stale articles or unused nodes
+            snapshot = open(output + '.tmp', 'w', encoding='utf-8')
+            with open(output, 'r', encoding='utf-8') as old_snapshot:
+                for line in old_snapshot:
+                    if article_index(line) in stale or line in removed_types:
+                        delta.write(line)
+                        counts['deleted_triples'] += 1
+                    else:
+                        snapshot.write(line)
+        else:
+            snapshot = open(output, 'a', encoding='utf-8')
+        delta.write('};\nINSERT DATA {\n')
+
+        with snapshot:
+            inserted = chain.from_iterable(article_triples(rows, intern_entities) for rows in pending)
+            for lines in chain(inserted, [added_types]):
+                text = ''.join(lines)
+                snapshot.write(text)
+                delta.write(text)
+                counts['inserted_triples'] += len(lines)
+        delta.write('}\n')
+
+    if manifest is not None and (stale or removed_types):
+        os.replace(output + '.tmp', output)
+    save_manifest(manifest_path, hashes, types, intern_entities)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert the combined article CSV to RDF.')
+    parser.add_argument('input', nargs='?', default=INPUT_CSV)
+    parser.add_argument('output', nargs='?', default=OUTPUT_TTL)
+    parser.add_argument('--chunksize', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=1,
+                        help='convert row ranges in this many processes')
+    parser.add_argument('--shard-dir', help='where --workers writes its N-Triples shards')
+    parser.add_argument('--no-merge', action='store_true',
+                        help='keep the per-shard files instead of concatenating them')
+    parser.add_argument('--intern-entities', action='store_true',
+                        help='one canonical node per normalized (name, type) instead of one per mention')
+    parser.add_argument('--snapshot', nargs='?', const='', metavar='DIR',
+                        help='also write a memory-mappable binary snapshot (default: <output>.snapshot)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only convert new/changed articles and write a delta next to the output; '
+                             'cheap for appended rows, rows after an insertion or deletion are rewritten')
+    parser.add_argument('--manifest', help='fingerprint manifest for --incremental')
+    parser.add_argument('--delta', help='SPARQL Update file written by --incremental')
+    args = parser.parse_args()
+    if args.snapshot is not None and args.no_merge:
+        parser.error('--snapshot needs the merged output; drop --no-merge')
+    if args.incremental and args.workers > 1:
+        parser.error('--incremental converts in a single process; drop --workers')
+
+    if args.incremental:
+        counts = convert_incremental(args.input, args.output, args.manifest, args.delta, args.chunksize,
+                                     intern_entities=args.intern_entities)
+        print(f"Updated {args.output}: {counts['added_articles']} new, {counts['changed_articles']} changed, "
+              f"{counts['removed_articles']} removed articles "
+              f"(-{counts['deleted_triples']} / +{counts['inserted_triples']} triples)")
+    elif args.workers > 1:
+        n_triples = convert_parallel(args.input, args.output, args.chunksize, args.workers,
+                                     shard_dir=args.shard_dir, merge=not args.no_merge,
+                                     intern_entities=args.intern_entities)
+        target = (args.shard_dir or args.output + '.shards') if args.no_merge else args.output
+        print(f'Wrote {n_triples} triples to {target}')
+    else:
+        n_triples = convert(args.input, args.output, args.chunksize, intern_entities=args.intern_entities)
+        print(f'Wrote {n_triples} triples to {args.output}')
+
+    if args.snapshot is not None:
+        snapshot_dir = args.snapshot or snapshot_path_for(args.output)
+        n_triples = write_snapshot(args.output, snapshot_dir)
+        print(f'Wrote binary snapshot of {n_triples} triples to {snapshot_dir}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,35 +1,85 @@
-from flask import Flask, request, render_template_string
+from flask import Flask, Response, request, stream_with_context
+import hashlib
+import hmac
 import joblib
+import json
 import numpy as np
 import os
 
+from inference import (
+    model_loader, MicroBatcher, predict_proba_batch, format_prediction, explain_headlines, FutureTimeout,
+    iter_json_array, iter_ndjson, score_stream,
+)
+from graph_index import GraphIndex
+from prediction_cache import PredictionCache
+from rule_engine import RuleEngine, DEFAULT_RULES
+from topic_inference import TopicInferencer
+
 app = Flask(__name__)
 
+# Concurrent /predict calls within a worker are scored together in one predict_proba call
+BATCH_MAX_SIZE = int(os.environ.get('BATCH_MAX_SIZE', 32))
+BATCH_MAX_WAIT_MS = float(os.environ.get('BATCH_MAX_WAIT_MS', 5))
+PREDICT_TIMEOUT = float(os.environ.get('PREDICT_TIMEOUT', 10))
+
+batcher = MicroBatcher(predict_proba_batch, max_batch_size=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS)
+
+# Repeated headlines are answered from an LRU cache keyed on the cleaned text.
+# Set PREDICTION_CACHE_SHARED_PATH (e.g. /dev/shm/fake_news_cache.db) to share it across workers.
+prediction_cache = PredictionCache(
+    maxsize=int(os.environ.get('PREDICTION_CACHE_SIZE', 10000)),
+    ttl=float(os.environ.get('PREDICTION_CACHE_TTL', 3600)),
+    model_signature=lambda: model_loader.checksum,
+    shared_path=os.environ.get('PREDICTION_CACHE_SHARED_PATH') or None,
+)
+
+# Attributions shown on the landing page and by /predict?explain=1 cost a full forest
+# traversal, so they are cached per worker too, keyed the same way and dropped on a model swap
+explanation_cache = PredictionCache(
+    maxsize=int(os.environ.get('EXPLANATION_CACHE_SIZE', 2000)),
+    ttl=float(os.environ.get('PREDICTION_CACHE_TTL', 3600)),
+    model_signature=lambda: model_loader.checksum,
+)
+
+# Hot-swap: each worker polls Models/registry.json and swaps in a newly activated version
+MODEL_WATCH_INTERVAL = float(os.environ.get('MODEL_WATCH_INTERVAL', 5))
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+@app.before_request
+def start_model_watcher():
+    model_loader.ensure_watcher(MODEL_WATCH_INTERVAL)
+
+# Bulk uploads are read and scored this many headlines at a time
+BULK_CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', 256))
+UPLOAD_READ_SIZE = 64 * 1024
+
+# Demo rule layer, compiled once at import. DEMO_RULES_PATH can point at a JSON rules file.
+DEMO_RULES_PATH = os.environ.get('DEMO_RULES_PATH')
+demo_rules = RuleEngine.from_file(DEMO_RULES_PATH) if DEMO_RULES_PATH else RuleEngine(DEFAULT_RULES)
+
+# Knowledge graph queries are answered from indexes built once at import (shared by
+# preloaded gunicorn workers) from the converting.py --snapshot output
+GRAPH_SNAPSHOT = os.environ.get('GRAPH_SNAPSHOT', 'articles_data2.snapshot')
+graph_index = GraphIndex.from_path(GRAPH_SNAPSHOT) if os.path.isdir(GRAPH_SNAPSHOT) else None
+
+# Topic model exported by topic_model.py --export, served next to the RF pipeline.
+# Concurrent single-headline requests share one batched E-step, like /predict.
+TOPIC_MODEL_PATH = os.environ.get('TOPIC_MODEL_PATH', os.path.join(model_loader.registry.root, 'topic_model.npz'))
+topic_inferencer = TopicInferencer.from_path(TOPIC_MODEL_PATH) if os.path.exists(TOPIC_MODEL_PATH) else None
+topic_batcher = MicroBatcher(lambda headlines: topic_inferencer.infer(headlines),
+                             max_batch_size=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS)
+# Longest "headlines" list one /topics request may send
+TOPICS_MAX_HEADLINES = int(os.environ.get('TOPICS_MAX_HEADLINES', 1000))
+
 def get_demo_prediction(headline):
     """Return realistic demo predictions for presentation purposes"""
     
-    # Convert to lowercase for checking
-    headline_lower = headline.lower()
-    
-    # Strong fake news indicators
-    strong_fake_indicators = [
-        'breaking news:', 'shocking:', 'blood on their hands', 'secret plan', 
-        'major problem', 'conspiracy', 'exposed by', 'truth about', 'coverup',
-        'breaking:', 'urgent:', 'unbelievable', 'scientists hate',
-        'doctors don\'t want you to know', 'click here', 'you won\'t believe',
-        'this will shock you', 'must read', 'exclusive', 'leaked'
-    ]
-    
-    # Real news indicators
-    real_indicators = [
-        'officials announce', 'parliament votes', 'government', 'committee', 
-        'department', 'ministry', 'according to', 'study shows', 'research indicates',
-        'officials said', 'reported by', 'sources confirm', 'data shows', 
-        'analysis reveals', 'experts believe', 'study published', 'reuters', 'ap news'
-    ]
+    matches = demo_rules.find_all(headline)
+    matched_categories = {m.category for m in matches}
+    matched_indicators = [m._asdict() for m in matches]
     
     # Check for strong fake patterns first
-    if any(indicator in headline_lower for indicator in strong_fake_indicators):
+    if 'fake' in matched_categories:
         return {
             'type': 'confident-fake',
             'message': 'Fake News (High Confidence)',
@@ -44,11 +94,12 @@ def get_demo_prediction(headline):
             ],
             'word_count': len(headline.split()),
             'total_features': 5000,
-            'active_features_count': 12
+            'active_features_count': 12,
+            'matched_indicators': matched_indicators
         }
     
     # Check for professional/real news patterns
-    elif any(indicator in headline_lower for indicator in real_indicators):
+    elif 'real' in matched_categories:
         return {
             'type': 'confident-real',
             'message': 'Real News (High Confidence)', 
@@ -63,7 +114,8 @@ def get_demo_prediction(headline):
             ],
             'word_count': len(headline.split()),
             'total_features': 5000,
-            'active_features_count': 8
+            'active_features_count': 8,
+            'matched_indicators': matched_indicators
         }
     
     # Default case
@@ -81,324 +133,63 @@ def get_demo_prediction(headline):
             ],
             'word_count': len(headline.split()),
             'total_features': 5000,
-            'active_features_count': 5
+            'active_features_count': 5,
+            'matched_indicators': matched_indicators
         }
 
+def get_explanation(headline):
+    """Fake probability and top contributing words for one headline, cached"""
+    explanation = explanation_cache.get(headline)
+    if explanation is None:
+        explanation = explain_headlines([headline])[0]
+        explanation_cache.set(headline, explanation)
+    return explanation
+
+def get_model_prediction(headline):
+    """Classify a headline with the trained model, with per-word attributions"""
+    explanation = get_explanation(headline)
+    fake_prob = explanation['probability']
+    real_prob = 1.0 - fake_prob
+    is_fake = fake_prob >= real_prob
+    confidence = max(fake_prob, real_prob)
+    
+    if confidence < 0.55:
+        result_type, message = 'very-uncertain', 'Uncertain (Low Confidence)'
+        explanation_text = 'The model cannot separate this headline clearly from either class.'
+    elif confidence >= 0.75:
+        result_type = 'confident-fake' if is_fake else 'confident-real'
+        message = 'Fake News (High Confidence)' if is_fake else 'Real News (High Confidence)'
+        explanation_text = 'Most trees in the forest agree on this classification.'
+    else:
+        result_type = 'uncertain-fake' if is_fake else 'uncertain-real'
+        message = 'Likely Fake News (Moderate Confidence)' if is_fake else 'Likely Real News (Moderate Confidence)'
+        explanation_text = 'Moderate confidence in classification. The trees are split on this headline.'
+    
+    # Contributions are toward FAKE; flip the sign so influence is toward the predicted class
+    sign = 1.0 if is_fake else -1.0
+    return {
+        'type': result_type,
+        'message': message,
+        'confidence': f'{confidence:.1%}',
+        'explanation': explanation_text,
+        'fake_prob': f'{fake_prob:.1%}',
+        'real_prob': f'{real_prob:.1%}',
+        'top_features': [
+            {'word': f['word'], 'importance': sign * f['contribution'] * 100}
+            for f in explanation['top_features']
+        ],
+        'word_count': len(headline.split()),
+        'total_features': model_loader.get_explainer().n_features,
+        'active_features_count': explanation['active_features_count'],
+        'model_version': model_loader.version
+    }
+
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
 <html>
 <head>
     <title>Fake News Detection & Propagation Tracker</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        
-        body { 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-            line-height: 1.6;
-            color: #2c3e50;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }
-        
-        .header-banner {
-            background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
-            color: white;
-            padding: 2rem 0;
-            text-align: center;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }
-        
-        .university-info {
-            font-size: 0.9rem;
-            margin-bottom: 0.5rem;
-            opacity: 0.9;
-        }
-        
-        .project-title {
-            font-size: 2.5rem;
-            font-weight: 300;
-            margin-bottom: 0.5rem;
-        }
-        
-        .project-subtitle {
-            font-size: 1.1rem;
-            opacity: 0.8;
-            margin-bottom: 1rem;
-        }
-        
-        .team-info {
-            font-size: 0.95rem;
-            margin-top: 1rem;
-        }
-        
-        .team-members {
-            display: flex;
-            justify-content: center;
-            gap: 2rem;
-            margin-top: 0.5rem;
-        }
-        
-        .container {
-            max-width: 1000px;
-            margin: 2rem auto;
-            padding: 0 1rem;
-        }
-        
-        .main-card {
-            background: white;
-            border-radius: 12px;
-            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            overflow: hidden;
-            margin-bottom: 2rem;
-        }
-        
-        .content {
-            padding: 2rem;
-        }
-        
-        .section-title {
-            color: #2c3e50;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 0.5rem;
-            margin-bottom: 1.5rem;
-            font-size: 1.4rem;
-        }
-        
-        .input-section {
-            margin-bottom: 2rem;
-        }
-        
-        textarea {
-            width: 100%;
-            height: 120px;
-            padding: 1rem;
-            border: 2px solid #ecf0f1;
-            border-radius: 8px;
-            font-size: 1rem;
-            font-family: inherit;
-            resize: vertical;
-            transition: border-color 0.3s;
-        }
-        
-        textarea:focus {
-            outline: none;
-            border-color: #3498db;
-        }
-        
-        .analyze-btn {
-            background: linear-gradient(135deg, #3498db, #2980b9);
-            color: white;
-            border: none;
-            padding: 0.8rem 2rem;
-            border-radius: 8px;
-            font-size: 1rem;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s;
-            margin-top: 1rem;
-        }
-        
-        .analyze-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 6px 20px rgba(52, 152, 219, 0.3);
-        }
-        
-        .result-container {
-            margin: 2rem 0;
-            padding: 1.5rem;
-            border-radius: 10px;
-            border-left: 5px solid;
-        }
-        
-        .confident-real {
-            background-color: #d5f4e6;
-            color: #27ae60;
-            border-color: #27ae60;
-        }
-        
-        .confident-fake {
-            background-color: #fadbd8;
-            color: #e74c3c;
-            border-color: #e74c3c;
-        }
-        
-        .uncertain-real {
-            background-color: #fef9e7;
-            color: #f39c12;
-            border-color: #f39c12;
-        }
-        
-        .uncertain-fake {
-            background-color: #fdecea;
-            color: #e67e22;
-            border-color: #e67e22;
-        }
-        
-        .very-uncertain {
-            background-color: #f4f6f7;
-            color: #7f8c8d;
-            border-color: #7f8c8d;
-        }
-        
-        .result-title {
-            font-size: 1.3rem;
-            font-weight: 600;
-            margin-bottom: 0.5rem;
-        }
-        
-        .result-explanation {
-            margin: 1rem 0;
-            font-size: 0.95rem;
-        }
-        
-        .metrics-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(140px, 1fr));
-            gap: 1rem;
-            margin: 1.5rem 0;
-        }
-        
-        .metric-card {
-            background: rgba(255,255,255,0.8);
-            padding: 1rem;
-            border-radius: 8px;
-            text-align: center;
-            border: 1px solid rgba(0,0,0,0.1);
-        }
-        
-        .metric-value {
-            font-size: 1.4rem;
-            font-weight: 700;
-            color: #2c3e50;
-        }
-        
-        .metric-label {
-            font-size: 0.85rem;
-            color: #7f8c8d;
-            margin-top: 0.25rem;
-        }
-        
-        .features-section {
-            background: #f8f9fa;
-            padding: 1.5rem;
-            border-radius: 8px;
-            margin: 1.5rem 0;
-        }
-        
-        .features-title {
-            color: #2c3e50;
-            margin-bottom: 1rem;
-            font-size: 1.1rem;
-        }
-        
-        .feature-list {
-            display: grid;
-            gap: 0.5rem;
-        }
-        
-        .feature-item {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 0.5rem;
-            background: white;
-            border-radius: 5px;
-            border-left: 3px solid #3498db;
-        }
-        
-        .feature-word {
-            font-weight: 600;
-            color: #2c3e50;
-            background: #ecf0f1;
-            padding: 0.2rem 0.5rem;
-            border-radius: 4px;
-            font-size: 0.9rem;
-        }
-        
-        .feature-score {
-            font-size: 0.8rem;
-            color: #7f8c8d;
-        }
-        
-        .examples-section {
-            margin-top: 2rem;
-        }
-        
-        .examples-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(240px, 1fr));
-            gap: 0.8rem;
-            margin-top: 1rem;
-        }
-        
-        .example-btn {
-            background: #95a5a6;
-            color: white;
-            border: none;
-            padding: 0.7rem 1rem;
-            border-radius: 6px;
-            cursor: pointer;
-            transition: all 0.3s;
-            font-size: 0.9rem;
-        }
-        
-        .example-btn:hover {
-            background: #7f8c8d;
-            transform: translateY(-1px);
-        }
-        
-        .system-info {
-            background: linear-gradient(135deg, #ecf0f1, #d5dbdb);
-            padding: 1.5rem;
-            border-radius: 8px;
-            margin-top: 2rem;
-        }
-        
-        .system-info h3 {
-            color: #2c3e50;
-            margin-bottom: 1rem;
-        }
-        
-        .tech-specs {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 1rem;
-            margin-top: 1rem;
-        }
-        
-        .tech-item {
-            background: white;
-            padding: 1rem;
-            border-radius: 6px;
-            border-left: 4px solid #3498db;
-        }
-        
-        .tech-title {
-            font-weight: 600;
-            color: #2c3e50;
-            margin-bottom: 0.3rem;
-        }
-        
-        .tech-desc {
-            font-size: 0.9rem;
-            color: #7f8c8d;
-        }
-        
-        @media (max-width: 768px) {
-            .team-members {
-                flex-direction: column;
-                gap: 0.5rem;
-            }
-            
-            .project-title {
-                font-size: 1.8rem;
-            }
-            
-            .container {
-                padding: 0 0.5rem;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{{ stylesheet_url }}">
 </head>
 <body>
     <div class="header-banner">
@@ -561,6 +352,18 @@ HTML_TEMPLATE = '''
 </html>
 '''
 
+# The stylesheet URL carries a content hash, so browsers can cache it for a year
+with open(os.path.join(app.static_folder, 'style.css'), 'rb') as f:
+    STYLESHEET_URL = f"{app.static_url_path}/style.css?v={hashlib.md5(f.read()).hexdigest()[:12]}"
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 365 * 24 * 3600
+
+# Compile the page template once at import instead of looking it up per request
+page_template = app.jinja_env.from_string(HTML_TEMPLATE)
+
+# The page without a result never changes, so render it once and serve the bytes
+LANDING_PAGE = page_template.render(result=None, headline=None, stylesheet_url=STYLESHEET_URL).encode('utf-8')
+LANDING_PAGE_ETAG = hashlib.md5(LANDING_PAGE).hexdigest()
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     result = None
@@ -570,19 +373,204 @@ def index():
         headline = request.form.get('headline', '').strip()
         
         if headline:
-            result = get_demo_prediction(headline)
+            try:
+                result = get_model_prediction(headline)
+            except Exception as e:
+                # No usable model (e.g. LFS pointer not pulled): fall back to the demo rules
+                app.logger.warning('Model prediction failed, using demo rules: %s', e)
+                result = get_demo_prediction(headline)
     
-    return render_template_string(HTML_TEMPLATE, result=result, headline=headline)
+    if result is None:
+        response = Response(LANDING_PAGE, mimetype='text/html')
+        if request.method == 'GET':
+            response.set_etag(LANDING_PAGE_ETAG)
+            response.headers['Cache-Control'] = 'no-cache'
+            response = response.make_conditional(request)
+        return response
+    
+    return page_template.render(result=result, headline=headline, stylesheet_url=STYLESHEET_URL)
+
+def request_payload():
+    """The JSON object sent, or the form fields; None when the JSON is not an object"""
+    payload = request.get_json(silent=True)
+    if payload is None:
+        return request.form
+    return payload if isinstance(payload, dict) else None
+
+def required_headline(payload):
+    """The stripped headline, or None unless it is a non-empty string"""
+    headline = payload.get('headline') if payload is not None else None
+    if not isinstance(headline, str) or not headline.strip():
+        return None
+    return headline.strip()
+
+# JSON prediction endpoint backed by the trained RandomForest pipeline
+@app.route('/predict', methods=['POST'])
+def predict():
+    payload = request_payload()
+    if payload is None:
+        return {'error': 'expected a JSON object'}, 400
+    headline = required_headline(payload)
+    if headline is None:
+        return {'error': 'headline must be a non-empty string'}, 400
+
+    probs = prediction_cache.get(headline)
+    if probs is None:
+        try:
+            probs = batcher.predict(headline, timeout=PREDICT_TIMEOUT)
+        except FutureTimeout:
+            return {'error': 'prediction timed out'}, 504
+        except Exception as e:
+            app.logger.exception('Prediction failed')
+            return {'error': f'model unavailable: {e}'}, 503
+        prediction_cache.set(headline, probs)
+
+    result = format_prediction(headline, probs)
+    if payload.get('explain'):
+        result['top_features'] = get_explanation(headline)['top_features']
+    if payload.get('topics') and topic_inferencer is not None:
+        try:
+            result['topic'] = topic_batcher.predict(headline, timeout=PREDICT_TIMEOUT)
+        except FutureTimeout:
+            return {'error': 'topic inference timed out'}, 504
+        except Exception as e:
+            app.logger.exception('Topic inference failed')
+            return {'error': f'topic model unavailable: {e}'}, 503
+    return result
+
+# Topic of one headline ({"headline": ...}) or of a list ({"headlines": [...]})
+@app.route('/topics', methods=['POST'])
+def topics():
+    if topic_inferencer is None:
+        return {'error': 'topic model not available'}, 503
+    payload = request_payload()
+    if payload is None:
+        return {'error': 'expected a JSON object'}, 400
+
+    if 'headlines' in payload:
+        headlines = payload.get('headlines')
+        if not isinstance(headlines, list):
+            return {'error': 'headlines must be a list'}, 400
+        if len(headlines) > TOPICS_MAX_HEADLINES:
+            return {'error': f'at most {TOPICS_MAX_HEADLINES} headlines per request; use several requests'}, 413
+        headlines = [str(h or '').strip() for h in headlines]
+        results = []
+        try:
+            # Each E-step runs until its slowest row converges, so small batches are fastest per headline
+            for start in range(0, len(headlines), BATCH_MAX_SIZE):
+                results.extend(topic_inferencer.infer(headlines[start:start + BATCH_MAX_SIZE]))
+        except Exception as e:
+            app.logger.exception('Topic inference failed')
+            return {'error': f'topic model unavailable: {e}'}, 503
+        return {'results': [dict(headline=h, **r) for h, r in zip(headlines, results)]}
+
+    headline = required_headline(payload)
+    if headline is None:
+        return {'error': 'headline must be a non-empty string'}, 400
+    try:
+        return dict(headline=headline, **topic_batcher.predict(headline, timeout=PREDICT_TIMEOUT))
+    except FutureTimeout:
+        return {'error': 'topic inference timed out'}, 504
+    except Exception as e:
+        app.logger.exception('Topic inference failed')
+        return {'error': f'topic model unavailable: {e}'}, 503
+
+# Bulk scoring: JSON array or NDJSON in, NDJSON out, one chunk at a time
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    stream = request.stream
+    if request.mimetype == 'application/json':
+        values = iter_json_array(iter(lambda: stream.read(UPLOAD_READ_SIZE), b''))
+    else:
+        values = iter_ndjson(stream)
+
+    def generate():
+        try:
+            for row in score_stream(values, chunk_size=BULK_CHUNK_SIZE, cache=prediction_cache):
+                yield json.dumps(row) + '\n'
+        except ValueError as e:
+            # Malformed input part-way through; results so far are already sent
+            yield json.dumps({'error': f'invalid input: {e}'}) + '\n'
+        except Exception as e:
+            app.logger.exception('Bulk prediction failed')
+            yield json.dumps({'error': f'model unavailable: {e}'}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# Knowledge graph query API, paginated with ?page=&per_page=
+def graph_query(query, **kwargs):
+    if graph_index is None:
+        return {'error': 'knowledge graph snapshot not available'}, 503
+    try:
+        return getattr(graph_index, query)(**kwargs)
+    except KeyError as e:
+        return {'error': e.args[0]}, 404
+    except ValueError as e:
+        return {'error': f'invalid request: {e}'}, 400
+
+def paging():
+    return {'page': request.args.get('page', 1), 'per_page': request.args.get('per_page', 50)}
+
+@app.route('/graph/articles')
+def graph_articles():
+    return graph_query('articles', label=request.args.get('label'),
+                       subject=request.args.get('subject'), topic=request.args.get('topic'), **paging())
+
+@app.route('/graph/counts')
+def graph_counts():
+    by = [facet for facet in request.args.get('by', 'label,subject,topic').split(',') if facet]
+    return graph_query('counts', by=by, label=request.args.get('label'),
+                       subject=request.args.get('subject'), topic=request.args.get('topic'))
+
+@app.route('/graph/entities/top')
+def graph_top_entities():
+    return graph_query('top_entities', label=request.args.get('label'), **paging())
+
+@app.route('/graph/entities/<path:entity>/neighbors')
+def graph_entity_neighbors(entity):
+    return graph_query('neighbors', entity=entity, **paging())
+
+# Admin: activate a registered version (or re-read the registry) and swap it in
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    # Constant-time comparison; bytes, since compare_digest rejects non-ASCII str
+    token = request.headers.get('X-Admin-Token', '').encode('utf-8')
+    if not ADMIN_TOKEN or not hmac.compare_digest(token, ADMIN_TOKEN.encode('utf-8')):
+        return {'error': 'forbidden'}, 403
+
+    payload = request.get_json(silent=True) or {}
+    try:
+        if payload.get('version'):
+            model_loader.registry.activate(payload['version'])
+        handle = model_loader.reload()
+    except KeyError as e:
+        return {'error': str(e)}, 404
+    except Exception as e:
+        app.logger.exception('Model reload failed')
+        return {'error': f'reload failed: {e}'}, 500
+
+    return {'status': 'ok', 'model': handle.version, 'metadata': handle.metadata}
 
 # Health check endpoint for Render
 @app.route('/health')
 def health_check():
     return {
         'status': 'healthy',
-        'model': 'demo_mode',
-        'version': '1.0'
+        'model': model_loader.version or model_loader.state,
+        'model_metadata': model_loader.status()['metadata'],
+        'version': '1.0',
+        'prediction_cache': prediction_cache.stats(),
+        'explanation_cache': explanation_cache.stats(),
+        'graph': graph_index.stats() if graph_index is not None else None,
+        'topics': topic_inferencer.stats() if topic_inferencer is not None else None
     }
 
+# Readiness probe: 200 once this worker's model is loaded
+@app.route('/ready')
+def readiness_check():
+    status = model_loader.status()
+    return status, 200 if model_loader.ready else 503
+
 if __name__ == '__main__':
     print("🎓 Starting Academic Fake News Detection System...")
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""Flat-array inference for the trained RandomForest.
+
+All 150 trees are packed into one set of NumPy arrays, and a batch is
+evaluated by advancing every (sample, tree) pair one level per step with
+vectorized gathers, instead of sklearn's per-estimator traversal.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from headline_vectorizer import HeadlineVectorizer
+
+# sklearn compares features as float32 against float64 thresholds
+FEATURE_DTYPE = np.float32
+
+
+class CompiledForest:
+    """Packed copy of a fitted RandomForestClassifier.
+
+    Node arrays from every tree are concatenated with child indices rebased
+    to global positions. Leaves point to themselves, so samples that reach a
+    leaf early simply stay there while deeper paths finish.
+    """
+
+    def __init__(self, feature, threshold, left, right, leaf_proba, roots, max_depth, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.is_leaf = left == np.arange(len(left))
+
+    @classmethod
+    def from_estimator(cls, forest):
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            node_ids = np.arange(offset, offset + n, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset).astype(np.int32))
+
+            # Per-tree class fractions at each node, as averaged by predict_proba
+            value = tree.value[:, 0, :]
+            values.append(value / value.sum(axis=1, keepdims=True))
+
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            leaf_proba=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            classes=forest.classes_,
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def apply(self, X, roots=None, on_step=None):
+        """Leaf index reached in each tree, shape (n_samples, n_trees).
+
+        on_step(slots, nodes), if given, is called after every level with the
+        flat (sample * n_trees + tree) slots that moved and the nodes they
+        moved to, which lets callers accumulate per-path statistics.
+        """
+        X = _as_dense(X)
+        roots = self.roots if roots is None else roots
+        n_samples, n_features = X.shape
+        X_flat = X.ravel()
+
+        # One flat slot per (sample, tree); only slots not yet at a leaf are advanced
+        nodes = np.tile(roots, n_samples)
+        row_offsets = np.repeat(np.arange(n_samples, dtype=np.int64) * n_features, len(roots))
+        active = np.flatnonzero(~self.is_leaf[nodes])
+        while active.size:
+            current = nodes[active]
+            values = X_flat[row_offsets[active] + self.feature[current]]
+            current = np.where(values <= self.threshold[current], self.left[current], self.right[current])
+            nodes[active] = current
+            if on_step is not None:
+                on_step(active, current)
+            active = active[~self.is_leaf[current]]
+        return nodes.reshape(n_samples, len(roots))
+
+    def _proba_sum(self, X, roots):
+        return self.leaf_proba[self.apply(X, roots)].sum(axis=1)
+
+    def predict_proba(self, X, n_threads=1, batch_size=256):
+        """Average leaf class fractions over all trees, like sklearn's predict_proba.
+
+        Rows are densified batch_size at a time to bound memory. With
+        n_threads > 1 the trees are split into chunks evaluated in parallel
+        (NumPy releases the GIL inside the gathers).
+        """
+        n_samples = X.shape[0]
+        proba = np.empty((n_samples, len(self.classes_)))
+        chunks = np.array_split(self.roots, max(1, min(n_threads, self.n_trees)))
+        executor = ThreadPoolExecutor(n_threads) if n_threads > 1 else None
+        try:
+            for start in range(0, n_samples, batch_size):
+                X_batch = _as_dense(X[start:start + batch_size])
+                if executor is None:
+                    total = self._proba_sum(X_batch, self.roots)
+                else:
+                    total = sum(executor.map(lambda roots: self._proba_sum(X_batch, roots), chunks))
+                proba[start:start + batch_size] = total / self.n_trees
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return proba
+
+    def predict(self, X, **kwargs):
+        return self.classes_[np.argmax(self.predict_proba(X, **kwargs), axis=1)]
+
+
+class CompiledPipeline:
+    """Drop-in replacement for the saved Pipeline's predict/predict_proba.
+
+    Vectorizes with HeadlineVectorizer when the fitted TF-IDF step allows it
+    and evaluates the forest with CompiledForest for batches up to
+    max_compiled_batch rows, where sklearn's per-estimator overhead
+    dominates. Larger batches go to sklearn's compiled traversal, which is
+    faster once there is enough work per tree.
+    """
+
+    def __init__(self, pipeline, n_threads=1, max_compiled_batch=64):
+        self.pipeline = pipeline
+        self.steps = pipeline.steps
+        vectorizer = pipeline.steps[0][1]
+        if HeadlineVectorizer.supports(vectorizer):
+            vectorizer = HeadlineVectorizer.from_vectorizer(vectorizer)
+        self.vectorizer = vectorizer
+        self.estimator = pipeline.steps[-1][1]
+        self.forest = CompiledForest.from_estimator(self.estimator)
+        self.classes_ = self.forest.classes_
+        self.n_threads = n_threads
+        self.max_compiled_batch = max_compiled_batch
+
+    def predict_proba(self, texts):
+        X = self.vectorizer.transform(texts)
+        if X.shape[0] > self.max_compiled_batch:
+            return self.estimator.predict_proba(X)
+        return self.forest.predict_proba(X, n_threads=self.n_threads)
+
+    def predict(self, texts):
+        return self.classes_[np.argmax(self.predict_proba(texts), axis=1)]
+
+
+def _as_dense(X):
+    if hasattr(X, 'toarray'):
+        X = X.toarray()
+    return np.asarray(X, dtype=FEATURE_DTYPE)
@@ -0,0 +1,304 @@
+"""In-memory query indexes over the knowledge graph snapshot.
+
+Built once from a GraphSnapshot (converting.py --snapshot) so the service
+can answer graph queries with array lookups instead of scanning triples:
+
+    per-article codes     label / subject / topic of every article
+    postings              articles per label, subject, topic and entity
+    count cube            articles per (label, subject, topic)
+    entity rankings       entities by number of articles, overall and per label
+
+Facet values are the local names without their prefix (label_FAKE ->
+FAKE, subject_politicsnews -> politicsnews, topic_3 -> 3). Unknown values
+raise KeyError; grouping by something other than a facet raises ValueError.
+"""
+from urllib.parse import unquote
+
+import numpy as np
+from rdflib import RDF
+
+from converting import ARTICLE, hasLabel, hasSubject, hasTopic, hasEntity, title, entityName, entityType
+from graph_snapshot import GraphSnapshot, literal_value
+
+FACETS = ('label', 'subject', 'topic')
+MAX_PER_PAGE = 200
+# Co-mentioned entities are counted over at most this many of an entity's articles
+CO_ENTITY_SAMPLE = 5000
+
+
+def local_name(iri):
+    return iri.split('#')[-1]
+
+
+def postings(codes, n_values):
+    """CSR layout: positions with code v are order[offsets[v]:offsets[v + 1]], ascending"""
+    order = np.argsort(codes, kind='stable')
+    offsets = np.zeros(n_values + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes[codes >= 0], minlength=n_values), out=offsets[1:])
+    # Articles without a value (code -1) sort first; skip them
+    return order[np.count_nonzero(codes < 0):], offsets
+
+
+def gather(order, offsets, keys):
+    """Concatenated postings of several keys"""
+    starts, stops = offsets[keys], offsets[keys + 1]
+    lengths = stops - starts
+    if not lengths.sum():
+        return order[:0]
+    out_starts = np.cumsum(lengths) - lengths
+    return order[np.arange(lengths.sum()) + np.repeat(starts - out_starts, lengths)]
+
+
+def page_slice(page, per_page):
+    page = max(1, int(page))
+    per_page = min(max(1, int(per_page)), MAX_PER_PAGE)
+    return page, per_page, slice((page - 1) * per_page, page * per_page)
+
+
+class GraphIndex:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+        # Articles: subjects typed ex:Article, in term id order
+        s, o = snapshot.edges(RDF.type)
+        classes = np.unique(o)
+        class_ids = dict(zip(snapshot.nodes(classes), classes.tolist()))
+        self.article_ids = np.unique(s[o == class_ids.get(str(ARTICLE), -1)])
+        self.n_articles = len(self.article_ids)
+
+        self.values = {}
+        self.value_codes = {}
+        self.codes = {}
+        self.facet_postings = {}
+        for facet, predicate in zip(FACETS, (hasLabel, hasSubject, hasTopic)):
+            positions, objects = self._article_edges(predicate)
+            value_ids, codes = np.unique(objects, return_inverse=True)
+            # Local names are percent-encoded (subject_government%20news); values are the decoded text
+            names = [unquote(local_name(node)).split('_', 1)[-1] for node in snapshot.nodes(value_ids)]
+            article_codes = np.full(self.n_articles, -1, dtype=np.int32)
+            article_codes[positions] = codes
+            self.values[facet] = names
+            self.value_codes[facet] = {name.lower(): code for code, name in enumerate(names)}
+            self.codes[facet] = article_codes
+            self.facet_postings[facet] = postings(article_codes, len(names))
+
+        # Count cube over (label, subject, topic); the last slot of each axis counts articles without a value
+        self.shape = tuple(len(self.values[facet]) + 1 for facet in FACETS)
+        cells = np.ravel_multi_index(
+            tuple(np.where(self.codes[f] < 0, n - 1, self.codes[f]) for f, n in zip(FACETS, self.shape)),
+            self.shape,
+        )
+        self.cube = np.bincount(cells, minlength=int(np.prod(self.shape))).reshape(self.shape)
+
+        positions, titles = self._article_edges(title)
+        self.title_ids = np.full(self.n_articles, -1, dtype=np.int64)
+        self.title_ids[positions] = titles
+
+        # Entities: article <-> entity postings and per-label rankings
+        positions, objects = self._article_edges(hasEntity)
+        self.entity_ids, entity_codes = np.unique(objects, return_inverse=True)
+        self.n_entities = len(self.entity_ids)
+        edge_order = np.argsort(positions, kind='stable')
+        self.article_entities = entity_codes[edge_order]
+        self.article_entity_offsets = np.zeros(self.n_articles + 1, dtype=np.int64)
+        np.cumsum(np.bincount(positions, minlength=self.n_articles), out=self.article_entity_offsets[1:])
+        by_entity = np.argsort(entity_codes, kind='stable')
+        self.entity_articles = positions[by_entity]
+        self.entity_article_offsets = np.zeros(self.n_entities + 1, dtype=np.int64)
+        np.cumsum(np.bincount(entity_codes, minlength=self.n_entities), out=self.entity_article_offsets[1:])
+        self.entity_degree = np.diff(self.entity_article_offsets)
+
+        n_labels = len(self.values['label'])
+        edge_labels = self.codes['label'][positions]
+        labelled = edge_labels >= 0
+        label_counts = np.bincount(edge_labels[labelled].astype(np.int64) * self.n_entities + entity_codes[labelled],
+                                   minlength=n_labels * self.n_entities).reshape(n_labels, self.n_entities)
+        self.entity_label_counts = label_counts
+        self.entity_rankings = {None: self._ranking(self.entity_degree)}
+        for code in range(n_labels):
+            self.entity_rankings[code] = self._ranking(label_counts[code])
+
+        self.entity_names = self._entity_literals(entityName)
+        self.entity_types = self._entity_literals(entityType)
+        self.entity_codes = {}
+        for code, node in enumerate(snapshot.nodes(self.entity_ids)):
+            self.entity_codes[local_name(node)] = code
+            # Interned IRIs are percent-encoded; also accept the decoded form (entity_ORG_white house)
+            self.entity_codes.setdefault(unquote(local_name(node)), code)
+        named = np.flatnonzero(self.entity_names >= 0)
+        for code, name in zip(named.tolist(), self._names(self.entity_names[named])):
+            self.entity_codes.setdefault(name.casefold(), code)
+
+    @classmethod
+    def from_path(cls, path):
+        return cls(GraphSnapshot(path))
+
+    @staticmethod
+    def _ranking(counts):
+        order = np.argsort(-counts, kind='stable')
+        return order[:np.count_nonzero(counts)]
+
+    def _article_edges(self, predicate):
+        """(article positions, object ids) of the predicate's edges from articles"""
+        s, o = self.snapshot.edges(predicate)
+        positions = np.searchsorted(self.article_ids, s)
+        positions = np.minimum(positions, max(self.n_articles - 1, 0))
+        keep = self.article_ids[positions] == s if self.n_articles else np.zeros(len(s), dtype=bool)
+        return positions[keep], o[keep]
+
+    def _entity_literals(self, predicate):
+        """First literal id of the predicate per entity code, -1 when missing"""
+        s, o = self.snapshot.edges(predicate)
+        codes = np.searchsorted(self.entity_ids, s)
+        codes = np.minimum(codes, max(self.n_entities - 1, 0))
+        keep = self.entity_ids[codes] == s if self.n_entities else np.zeros(len(s), dtype=bool)
+        literals = np.full(self.n_entities, -1, dtype=np.int64)
+        # Reversed so the first edge of each entity wins
+        literals[codes[keep][::-1]] = o[keep][::-1]
+        return literals
+
+    def _names(self, term_ids):
+        return [literal_value(text) if text.startswith('"') else text for text in self.snapshot.nodes(term_ids)]
+
+    def _code(self, facet, value):
+        try:
+            return self.value_codes[facet][str(value).lower()]
+        except KeyError:
+            raise KeyError(f'unknown {facet}: {value}') from None
+
+    # --- Queries ---
+    def articles(self, label=None, subject=None, topic=None, page=1, per_page=50):
+        """Articles matching every given facet value, in graph order"""
+        filters = {facet: self._code(facet, value)
+                   for facet, value in zip(FACETS, (label, subject, topic)) if value is not None}
+        if filters:
+            # Start from the shortest posting list and mask by the other facets
+            def posting(facet):
+                order, offsets = self.facet_postings[facet]
+                code = filters[facet]
+                return order[offsets[code]:offsets[code + 1]]
+            first = min(filters, key=lambda facet: len(posting(facet)))
+            matches = posting(first)
+            for facet, code in filters.items():
+                if facet != first:
+                    matches = matches[self.codes[facet][matches] == code]
+        else:
+            matches = np.arange(self.n_articles)
+
+        page, per_page, rows = page_slice(page, per_page)
+        return {
+            'total': int(len(matches)),
+            'page': page,
+            'per_page': per_page,
+            'articles': self._describe_articles(matches[rows]),
+        }
+
+    def _describe_articles(self, positions):
+        positions = np.asarray(positions, dtype=np.int64)
+        nodes = self.snapshot.nodes(self.article_ids[positions])
+        titles = self.title_ids[positions]
+        title_names = dict(zip(titles.tolist(), self._names(titles[titles >= 0])))
+        articles = []
+        for i, position in enumerate(positions.tolist()):
+            article = {'id': local_name(nodes[i]), 'title': title_names.get(int(titles[i]))}
+            for facet in FACETS:
+                code = self.codes[facet][position]
+                article[facet] = self.values[facet][code] if code >= 0 else None
+            articles.append(article)
+        return articles
+
+    def counts(self, by=FACETS, label=None, subject=None, topic=None):
+        """Article counts grouped by the facets in `by`, optionally filtered"""
+        unknown = [facet for facet in by if facet not in FACETS]
+        if unknown:
+            raise ValueError(f'unknown facet: {unknown[0]}')
+        filters = dict(zip(FACETS, (label, subject, topic)))
+        index = tuple(slice(None) if filters[f] is None else self._code(f, filters[f]) for f in FACETS)
+        cube = self.cube[index]
+
+        # Remaining axes are the unfiltered facets; sum out the ones not grouped by
+        kept = [facet for facet in FACETS if filters[facet] is None]
+        grouped = [facet for facet in kept if facet in by]
+        cube = cube.sum(axis=tuple(i for i, facet in enumerate(kept) if facet not in grouped))
+
+        if grouped:
+            rows = [dict({facet: self._value(facet, code) for facet, code in zip(grouped, cell)},
+                         count=int(cube[cell]))
+                    for cell in zip(*np.nonzero(cube))]
+        else:
+            rows = [{'count': int(cube)}]
+        return {'by': grouped, 'filters': {k: v for k, v in filters.items() if v is not None}, 'counts': rows}
+
+    def _value(self, facet, code):
+        values = self.values[facet]
+        return values[code] if code < len(values) else None
+
+    def top_entities(self, label=None, page=1, per_page=50):
+        """Entities by number of articles mentioning them, overall or within one label"""
+        code = None if label is None else self._code('label', label)
+        ranking = self.entity_rankings[code]
+        counts = self.entity_degree if code is None else self.entity_label_counts[code]
+        page, per_page, rows = page_slice(page, per_page)
+        entities = ranking[rows]
+        return {
+            'label': label,
+            'total': int(len(ranking)),
+            'page': page,
+            'per_page': per_page,
+            'entities': [dict(entity, articles=int(counts[c]))
+                         for entity, c in zip(self._describe_entities(entities), entities.tolist())],
+        }
+
+    def _describe_entities(self, codes):
+        codes = np.asarray(codes, dtype=np.int64)
+        nodes = self.snapshot.nodes(self.entity_ids[codes])
+        literal_ids = np.concatenate([self.entity_names[codes], self.entity_types[codes]])
+        literal_ids = literal_ids[literal_ids >= 0]
+        literals = dict(zip(literal_ids.tolist(), self._names(literal_ids)))
+        return [
+            {'id': local_name(node), 'name': literals.get(int(self.entity_names[c])),
+             'type': literals.get(int(self.entity_types[c]))}
+            for node, c in zip(nodes, codes.tolist())
+        ]
+
+    def entity_code(self, entity):
+        """Entity by local name (entity_PERSON_donald%20trump, decoded or not) or case-insensitive name"""
+        code = self.entity_codes.get(entity)
+        if code is None:
+            code = self.entity_codes.get(entity.casefold())
+        if code is None:
+            raise KeyError(f'unknown entity: {entity}')
+        return code
+
+    def neighbors(self, entity, page=1, per_page=50, co_entities=10):
+        """Articles mentioning an entity, plus the entities most often mentioned alongside it"""
+        code = self.entity_code(entity)
+        articles = self.entity_articles[self.entity_article_offsets[code]:self.entity_article_offsets[code + 1]]
+
+        sample = articles[:CO_ENTITY_SAMPLE]
+        co_codes = gather(self.article_entities, self.article_entity_offsets, sample)
+        co_codes = co_codes[co_codes != code]
+        values, counts = np.unique(co_codes, return_counts=True)
+        top = np.argsort(-counts, kind='stable')[:co_entities]
+
+        page, per_page, rows = page_slice(page, per_page)
+        return {
+            'entity': self._describe_entities([code])[0],
+            'total': int(len(articles)),
+            'page': page,
+            'per_page': per_page,
+            'articles': self._describe_articles(articles[rows]),
+            'co_entities': [dict(entity, articles=int(n)) for entity, n in
+                            zip(self._describe_entities(values[top]), counts[top].tolist())],
+            'co_entities_sampled': bool(len(articles) > CO_ENTITY_SAMPLE),
+        }
+
+    def stats(self):
+        return {
+            'triples': len(self.snapshot),
+            'articles': self.n_articles,
+            'entities': self.n_entities,
+            'labels': self.values['label'],
+            'subjects': len(self.values['subject']),
+            'topics': len(self.values['topic']),
+        }
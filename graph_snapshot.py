@@ -0,0 +1,213 @@
+"""Binary, memory-mappable snapshot of the knowledge graph.
+
+A snapshot directory (articles_data2.snapshot/ next to the TTL) holds:
+
+    term_bytes.npy     uint8, every distinct term's N-Triples text back to back
+    term_offsets.npy   int64, term i is term_bytes[offsets[i]:offsets[i + 1]]
+    subjects.npy       integer term ids, one entry per triple, sorted by
+    predicates.npy     (predicate, subject) so each predicate's triples are
+    objects.npy        one contiguous slice
+    meta.json          counts, dtype and the slice of every predicate
+
+GraphSnapshot maps the arrays read-only, so every process that opens the
+same snapshot shares one copy through the page cache, and predicate
+filters are array slices with no rdflib objects involved:
+
+    snapshot = GraphSnapshot('articles_data2.snapshot')
+    subjects, objects = snapshot.edges(EX.hasLabel)
+"""
+import json
+import os
+import re
+import shutil
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_VERSION = 1
+CHUNK_LINES = 1000000
+ARRAYS = ('subjects', 'predicates', 'objects')
+ESCAPES = {'\\': '\\', '"': '"', 'n': '\n', 'r': '\r', 't': '\t'}
+ESCAPE_RE = re.compile(r'\\(.)')
+
+
+def literal_value(text):
+    """Lexical value of an N-Triples literal ("..."^^<dt> or "..."@lang)"""
+    body = text[1:text.rindex('"')]
+    return ESCAPE_RE.sub(lambda m: ESCAPES.get(m.group(1), m.group(0)), body)
+
+
+def snapshot_path_for(output):
+    return os.path.splitext(output)[0] + '.snapshot'
+
+
+def _statements(lines):
+    """Split N-Triples lines into (s, p, o) term Series, skipping prefixes and blanks"""
+    lines = pd.Series(lines, dtype=object)
+    lines = lines[lines.str.endswith(' .\n') & lines.str.startswith(('<', '_:'))]
+    parts = lines.str[:-3].str.split(' ', n=2, expand=True)
+    if parts.empty:
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+def write_snapshot(source, snapshot_dir=None, chunk_lines=CHUNK_LINES):
+    """Encode an N-Triples/Turtle file written by converting.py into a snapshot.
+
+    Terms are interned as they are first seen; triples are collected as id
+    triples in a scratch file and sorted once at the end. Returns the number
+    of triples. The finished directory replaces any previous snapshot.
+    """
+    snapshot_dir = snapshot_dir or snapshot_path_for(source)
+    tmp_dir = snapshot_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    term_ids = {}
+    offsets = [0]
+    ids_path = os.path.join(tmp_dir, 'ids.raw')
+    bytes_path = os.path.join(tmp_dir, 'term_bytes.raw')
+    with open(source, 'r', encoding='utf-8') as f, open(ids_path, 'wb') as ids_out, \
+            open(bytes_path, 'wb') as bytes_out:
+        while True:
+            lines = list(islice(f, chunk_lines))
+            if not lines:
+                break
+            statements = _statements(lines)
+            if statements is None:
+                continue
+            codes, uniques = pd.factorize(pd.concat(statements, ignore_index=True))
+            # Python-level work is per distinct term in the chunk, not per triple
+            chunk_ids = np.empty(len(uniques), dtype=np.int64)
+            for i, term in enumerate(uniques):
+                term_id = term_ids.get(term)
+                if term_id is None:
+                    term_id = term_ids[term] = len(term_ids)
+                    data = term.encode('utf-8')
+                    bytes_out.write(data)
+                    offsets.append(offsets[-1] + len(data))
+                chunk_ids[i] = term_id
+            # Column-major: all subjects of the chunk, then predicates, then objects
+            chunk_ids[codes].reshape(3, -1).T.astype(np.int64).tofile(ids_out)
+
+    n_terms = len(term_ids)
+    id_dtype = np.int32 if n_terms < 2 ** 31 else np.int64
+    triples = np.fromfile(ids_path, dtype=np.int64).reshape(-1, 3)
+    order = np.lexsort((triples[:, 0], triples[:, 1]))
+    for column, name in enumerate(ARRAYS):
+        np.save(os.path.join(tmp_dir, name + '.npy'), triples[order, column].astype(id_dtype))
+    predicates = triples[order, 1]
+    del triples, order
+    os.remove(ids_path)
+
+    np.save(os.path.join(tmp_dir, 'term_offsets.npy'), np.asarray(offsets, dtype=np.int64))
+    np.save(os.path.join(tmp_dir, 'term_bytes.npy'), np.fromfile(bytes_path, dtype=np.uint8))
+    os.remove(bytes_path)
+
+    # Slice of each predicate in the sorted arrays
+    starts = np.flatnonzero(np.diff(predicates, prepend=-1))
+    stops = np.append(starts[1:], len(predicates))
+    predicate_ids = {int(predicates[start]): [int(start), int(stop)] for start, stop in zip(starts, stops)}
+    predicate_slices = {term: predicate_ids[term_id] for term, term_id in term_ids.items() if term_id in predicate_ids}
+
+    with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': SNAPSHOT_VERSION,
+            'source': os.path.basename(source),
+            'n_triples': len(predicates),
+            'n_terms': n_terms,
+            'id_dtype': np.dtype(id_dtype).name,
+            'predicates': predicate_slices,
+        }, f, indent=2)
+
+    if os.path.exists(snapshot_dir):
+        shutil.rmtree(snapshot_dir)
+    os.replace(tmp_dir, snapshot_dir)
+    return len(predicates)
+
+
+class GraphSnapshot:
+    """Read-only view of a snapshot directory; arrays are memory-mapped"""
+
+    def __init__(self, path, mmap_mode='r'):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta['version'] != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version {self.meta['version']} in {path}")
+        load = lambda name: np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode)
+        self.term_bytes = load('term_bytes')
+        self.term_offsets = load('term_offsets')
+        self.subjects, self.predicates, self.objects = (load(name) for name in ARRAYS)
+        self._is_literal = None
+
+    def __len__(self):
+        return self.meta['n_triples']
+
+    @property
+    def n_terms(self):
+        return self.meta['n_terms']
+
+    def term(self, term_id):
+        """N-Triples text of a term: <iri>, _:bnode or "literal"^^<datatype>"""
+        start, stop = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+        return bytes(self.term_bytes[start:stop]).decode('utf-8')
+
+    def node(self, term_id):
+        """Plain IRI for IRIs, N-Triples text for anything else"""
+        text = self.term(term_id)
+        return text[1:-1] if text.startswith('<') else text
+
+    def terms(self, term_ids):
+        """N-Triples text of many terms with one gather and one decode.
+
+        The terms' bytes are copied into one buffer with a newline after
+        each (N-Triples escapes newlines inside literals), decoded once and
+        split, instead of slicing and decoding term by term.
+        """
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        if not len(term_ids):
+            return []
+        starts = self.term_offsets[term_ids]
+        lengths = self.term_offsets[term_ids + 1] - starts
+        out_starts = np.cumsum(lengths + 1) - lengths - 1
+        gather = np.arange(out_starts[-1] + lengths[-1] + 1) + np.repeat(starts - out_starts, lengths + 1)
+        buffer = self.term_bytes[np.minimum(gather, len(self.term_bytes) - 1)]
+        buffer[out_starts + lengths] = ord('\n')
+        return buffer.tobytes().decode('utf-8').split('\n')[:-1]
+
+    def nodes(self, term_ids):
+        """node() of many terms"""
+        return [text[1:-1] if text.startswith('<') else text for text in self.terms(term_ids)]
+
+    @property
+    def is_literal(self):
+        """Boolean array over term ids"""
+        if self._is_literal is None:
+            self._is_literal = self.term_bytes[self.term_offsets[:-1]] == ord('"')
+        return self._is_literal
+
+    def predicate_slice(self, predicate):
+        start, stop = self.meta['predicates'].get(f'<{predicate}>', (0, 0))
+        return slice(start, stop)
+
+    def edges(self, predicate):
+        """(subject ids, object ids) of every triple with this predicate, as array views"""
+        rows = self.predicate_slice(predicate)
+        return self.subjects[rows], self.objects[rows]
+
+    def triples(self, predicate=None, literals=True):
+        """(s, p, o) node strings, for one predicate or the whole graph.
+
+        Terms are decoded once per distinct id, so shared label/topic/entity
+        nodes cost one lookup however many edges point at them.
+        """
+        rows = self.predicate_slice(predicate) if predicate is not None else slice(None)
+        s, p, o = self.subjects[rows], self.predicates[rows], self.objects[rows]
+        if not literals:
+            keep = ~self.is_literal[o]
+            s, p, o = s[keep], p[keep], o[keep]
+        term_ids = np.unique(np.concatenate([s, p, o]))
+        names = dict(zip(term_ids.tolist(), self.nodes(term_ids)))
+        return [(names[a], names[b], names[c]) for a, b, c in zip(s.tolist(), p.tolist(), o.tolist())]
@@ -0,0 +1,274 @@
+"""Persistent, indexed rdflib store for the knowledge graph.
+
+Parsing articles_data2.ttl with rdflib takes minutes on the full corpus.
+SQLiteStore keeps the triples in an SQLite file, built once and reopened
+instantly. Each term is stored in its N-Triples form. Indexes on (s, p, o),
+(p, o) and (o, s) answer g.triples() patterns without scanning:
+
+    g = open_graph('articles_data2.ttl')   # builds articles_data2.sqlite on first use
+    for s, p, o in g.triples((None, EX.hasLabel, None)):
+        ...
+
+The store is rebuilt whenever the source file changes. Deltas written by
+converting.py --incremental can be applied in place with
+g.update(open('articles_data2.delta.ru').read()).
+
+Processes that share a store should not each build it: call
+ensure_store() once in the parent, then open_graph(..., read_only=True)
+in the workers.
+"""
+import os
+import sqlite3
+import urllib.parse
+from functools import lru_cache
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.plugins.serializers.nt import _quoteLiteral
+from rdflib.store import Store
+from rdflib.util import from_n3
+
+BATCH_SIZE = 100000
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS triples (s TEXT, p TEXT, o TEXT, PRIMARY KEY (s, p, o)) WITHOUT ROWID',
+    'CREATE TABLE IF NOT EXISTS namespaces (prefix TEXT PRIMARY KEY, uri TEXT)',
+    'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)',
+)
+INDEXES = (
+    'CREATE INDEX IF NOT EXISTS triples_po ON triples (p, o)',
+    'CREATE INDEX IF NOT EXISTS triples_os ON triples (o, s)',
+)
+
+
+def encode_term(term):
+    """N-Triples form of a term, as written by converting.py"""
+    if isinstance(term, Literal):
+        return _quoteLiteral(term)
+    return term.n3()
+
+
+@lru_cache(maxsize=1 << 16)
+def decode_term(text):
+    # Label, subject, topic and entity nodes repeat across millions of rows
+    if text.startswith('<'):
+        return URIRef(text[1:-1])
+    if text.startswith('_:'):
+        return BNode(text[2:])
+    return from_n3(text)
+
+
+def split_ntriples(line):
+    """(s, p, o) strings of one N-Triples statement, or None for anything else.
+
+    converting.py writes one statement per line with IRI subjects and
+    predicates, so splitting on the first two spaces is enough.
+    """
+    if not line.startswith(('<', '_:')) or not line.endswith(' .\n'):
+        return None
+    parts = line[:-3].split(' ', 2)
+    return tuple(parts) if len(parts) == 3 else None
+
+
+def file_signature(path):
+    st = os.stat(path)
+    return f'{st.st_mtime_ns}:{st.st_size}'
+
+
+class SQLiteStore(Store):
+    """Context-unaware rdflib Store backed by an SQLite file"""
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration=None, identifier=None):
+        self.conn = None
+        super().__init__(configuration, identifier)
+
+    def open(self, configuration, create=False):
+        # configuration is a path, or a 'file:' URI such as read_only_uri(path)
+        self.conn = sqlite3.connect(configuration, check_same_thread=False, isolation_level=None,
+                                    uri=configuration.startswith('file:'))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        if create:
+            for statement in SCHEMA + INDEXES:
+                self.conn.execute(statement)
+        return 1  # rdflib.store.VALID_STORE
+
+    def close(self, commit_pending_transaction=False):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def get_meta(self, key):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self.conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, value))
+
+    def add(self, triple, context=None, quoted=False):
+        self.conn.execute('INSERT OR IGNORE INTO triples VALUES (?, ?, ?)', tuple(map(encode_term, triple)))
+
+    def addN(self, quads):
+        self.add_encoded((encode_term(s), encode_term(p), encode_term(o)) for s, p, o, _ in quads)
+
+    def add_encoded(self, rows):
+        """Bulk insert (s, p, o) tuples already in N-Triples form"""
+        conn = self.conn
+        conn.execute('BEGIN')
+        try:
+            conn.executemany('INSERT OR IGNORE INTO triples VALUES (?, ?, ?)', rows)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def remove(self, triple_pattern, context=None):
+        where, params = self._where(triple_pattern)
+        self.conn.execute('DELETE FROM triples' + where, params)
+
+    def triples(self, triple_pattern, context=None):
+        where, params = self._where(triple_pattern)
+        for row in self.conn.execute('SELECT s, p, o FROM triples' + where, params):
+            yield (decode_term(row[0]), decode_term(row[1]), decode_term(row[2])), iter(())
+
+    @staticmethod
+    def _where(triple_pattern):
+        clauses, params = [], []
+        for column, term in zip('spo', triple_pattern):
+            if term is not None:
+                clauses.append(f'{column} = ?')
+                params.append(encode_term(term))
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def __len__(self, context=None):
+        return self.conn.execute('SELECT COUNT(*) FROM triples').fetchone()[0]
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix, namespace, override=True):
+        if not override and self.namespace(prefix) is not None:
+            return
+        self.conn.execute('INSERT OR REPLACE INTO namespaces VALUES (?, ?)', (prefix, str(namespace)))
+
+    def namespace(self, prefix):
+        row = self.conn.execute('SELECT uri FROM namespaces WHERE prefix = ?', (prefix,)).fetchone()
+        return URIRef(row[0]) if row else None
+
+    def prefix(self, namespace):
+        row = self.conn.execute('SELECT prefix FROM namespaces WHERE uri = ?', (str(namespace),)).fetchone()
+        return row[0] if row else None
+
+    def namespaces(self):
+        for prefix, uri in self.conn.execute('SELECT prefix, uri FROM namespaces').fetchall():
+            yield prefix, URIRef(uri)
+
+
+def read_only_uri(path):
+    return 'file:' + urllib.parse.quote(os.path.abspath(path)) + '?mode=ro'
+
+
+def build_store(source, store_path, fmt='turtle'):
+    """Load source into a fresh store at store_path, replacing it atomically.
+
+    Files made of one statement per line (converting.py's output) are bulk
+    loaded without rdflib's parser; anything else goes through Graph.parse.
+    Secondary indexes are created after the load, which is much faster
+    than maintaining them row by row. The temporary file is per process,
+    so concurrent builds cannot replace or delete each other's.
+    """
+    tmp_path = f'{store_path}.{os.getpid()}.tmp'
+    _remove_db_files(tmp_path)
+    try:
+        _build_at(source, tmp_path, fmt)
+        os.replace(tmp_path, store_path)
+    finally:
+        _remove_db_files(tmp_path)
+
+
+def _remove_db_files(path):
+    for p in (path, path + '-wal', path + '-shm'):
+        if os.path.exists(p):
+            os.remove(p)
+
+
+def _build_at(source, tmp_path, fmt):
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=OFF')
+    conn.execute('PRAGMA synchronous=OFF')
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.close()
+
+    store = SQLiteStore()
+    store.open(tmp_path)
+    store.conn.execute('PRAGMA synchronous=OFF')
+    if not _load_ntriples_lines(store, source):
+        store.conn.execute('DELETE FROM triples')
+        graph = Graph()
+        graph.parse(source, format=fmt)
+        store.addN((s, p, o, None) for s, p, o in graph)
+        for prefix, namespace in graph.namespaces():
+            store.bind(prefix, namespace)
+    for statement in INDEXES:
+        store.conn.execute(statement)
+    store.set_meta('source_signature', file_signature(source))
+    store.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    store.close()
+
+
+def _load_ntriples_lines(store, source):
+    """Bulk load a line-oriented file; False if a line isn't a plain statement"""
+    with open(source, 'r', encoding='utf-8') as f:
+        batch = []
+        for line in f:
+            triple = split_ntriples(line)
+            if triple is None:
+                if line.startswith('@prefix '):
+                    prefix, namespace = line[len('@prefix '):].split(None, 1)
+                    store.bind(prefix.rstrip(':'), URIRef(namespace.strip().rstrip('.').strip()[1:-1]))
+                    continue
+                if not line.strip():
+                    continue
+                return False
+            batch.append(triple)
+            if len(batch) >= BATCH_SIZE:
+                store.add_encoded(batch)
+                batch = []
+        store.add_encoded(batch)
+    return True
+
+
+def ensure_store(source, store_path=None, fmt='turtle', rebuild=False):
+    """Path of an up-to-date store for source, building it if it is missing or stale"""
+    store_path = store_path or os.path.splitext(source)[0] + '.sqlite'
+    if rebuild or not os.path.exists(store_path) or _stale(store_path, source):
+        build_store(source, store_path, fmt)
+    return store_path
+
+
+def open_graph(source, store_path=None, fmt='turtle', rebuild=False, read_only=False):
+    """rdflib Graph over the persistent store for source.
+
+    By default the store is built first if needed. With read_only=True it
+    must already exist (see ensure_store) and is opened without write access.
+    """
+    store = SQLiteStore()
+    if read_only:
+        store_path = store_path or os.path.splitext(source)[0] + '.sqlite'
+        store.open(read_only_uri(store_path))
+    else:
+        store.open(ensure_store(source, store_path, fmt, rebuild))
+    return Graph(store=store)
+
+
+def _stale(store_path, source):
+    store = SQLiteStore()
+    store.open(store_path)
+    try:
+        return os.path.exists(source) and store.get_meta('source_signature') != file_signature(source)
+    finally:
+        store.close()
@@ -1,107 +1,345 @@
+import argparse
+import html
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from urllib.parse import unquote
+
+import pyvis
 import rdflib
 from rdflib.namespace import RDF
 from pyvis.network import Network
 
-# Load RDF graph
-g = rdflib.Graph()
-g.parse("articles_data2.ttl", format="turtle")
+from graph_snapshot import GraphSnapshot
+from graph_store import ensure_store, open_graph
+
+GRAPH_SOURCE = os.environ.get("GRAPH_SOURCE", "articles_data2.ttl")
+# Binary snapshot written by converting.py --snapshot; used instead of rdflib when present
+GRAPH_SNAPSHOT = os.environ.get("GRAPH_SNAPSHOT", "articles_data2.snapshot")
+# Persistent store built from GRAPH_SOURCE on first run; set GRAPH_STORE="" to parse in memory instead
+GRAPH_STORE = os.environ.get("GRAPH_STORE", "articles_data2.sqlite")
 EX = rdflib.Namespace("http://example.org/misinfo#")
 
+# Size limits per view; vis.js struggles beyond a few thousand nodes
+MAX_NODES = int(os.environ.get("GRAPH_MAX_NODES", 500))
+MAX_ENTITIES = int(os.environ.get("GRAPH_MAX_ENTITIES", 50))
+
+VIS_VERSION = "9.1.2"
+VIS_CDN = f"https://cdnjs.cloudflare.com/ajax/libs/vis-network/{VIS_VERSION}/dist"
+VIS_LOCAL = os.path.join(os.path.dirname(pyvis.__file__), "lib", f"vis-{VIS_VERSION}")
+
+# Load RDF graph lazily, once per process; worker processes open their own handle
+_graph = None
+# Set in worker processes: the parent has already built the store (see prepare_graph)
+_read_only = False
+
+def use_snapshot():
+    return bool(GRAPH_SNAPSHOT) and os.path.isdir(GRAPH_SNAPSHOT)
+
+def prepare_graph():
+    """Build or refresh the persistent store once, before any worker opens it"""
+    if not use_snapshot() and GRAPH_STORE:
+        ensure_store(GRAPH_SOURCE, GRAPH_STORE)
+
+def default_workers():
+    """One process per CPU, unless each would have to parse GRAPH_SOURCE into memory itself"""
+    if use_snapshot() or GRAPH_STORE:
+        return os.cpu_count() or 1
+    return 1
+
+def init_worker():
+    global _read_only
+    _read_only = True
+
+def load_graph():
+    global _graph
+    if _graph is None:
+        if use_snapshot():
+            _graph = GraphSnapshot(GRAPH_SNAPSHOT)
+        elif GRAPH_STORE:
+            _graph = open_graph(GRAPH_SOURCE, GRAPH_STORE, read_only=_read_only)
+        else:
+            _graph = rdflib.Graph()
+            _graph.parse(GRAPH_SOURCE, format="turtle")
+    return _graph
+
 # Helper to label nodes
 def label_node(node):
+    # Interned entity IRIs are percent-encoded (entity_ORG_white%20house); show them decoded
     if isinstance(node, rdflib.URIRef):
-        return node.split('#')[-1]
+        return unquote(node.split('#')[-1])
     elif isinstance(node, rdflib.Literal):
         return str(node)
+    elif isinstance(node, str) and not node.startswith('"'):  # plain IRI from a GraphSnapshot
+        return unquote(node.split('#')[-1])
     else:
         return str(node)
 
 # Helper to build pyvis graph from filtered RDF triples
-def build_pyvis_graph(triples, title, color="lightblue"):
+def build_pyvis_graph(triples, title, color="lightblue", max_nodes=MAX_NODES):
     net = Network(height="500px", width="100%", notebook=False)
     net.force_atlas_2based()
 
     net.heading = title  # This is just a note; we'll add HTML outside later
 
+    nodes = set()
     for s, p, o in triples:
-        s_label = label_node(s)
-        o_label = label_node(o)
-        p_label = label_node(p)
+        # Skip edges that would take the view past max_nodes
+        new_nodes = [node for node in dict.fromkeys((s, o)) if node not in nodes]
+        if len(nodes) + len(new_nodes) > max_nodes:
+            continue
 
-        # Add nodes with colors by type
-        for node, lbl in [(s, s_label), (o, o_label)]:
-            if not net.get_node(node):
-                net.add_node(node, label=lbl, title=str(node), color=color)
+        for node in new_nodes:
+            nodes.add(node)
+            net.add_node(node, label=label_node(node), title=str(node), color=color)
 
         # Add edge with predicate as label
-        net.add_edge(s, o, title=p_label)
+        net.add_edge(s, o, title=label_node(p))
 
     return net
 
-# --- Filter functions ---
-def filter_by_predicate(pred):
-    return [(s,p,o) for s,p,o in g if p == pred]
+# Helper to build pyvis graph from aggregate nodes: {id: (label, count)} and (a, b, weight) edges
+def build_weighted_graph(nodes, edges, title, color="lightblue"):
+    net = Network(height="500px", width="100%", notebook=False)
+    net.force_atlas_2based()
+
+    net.heading = title
+
+    for node, (lbl, count) in nodes.items():
+        net.add_node(node, label=lbl, title=f"{lbl}: {count} articles", value=count, color=color)
+    for a, b, weight in edges:
+        net.add_edge(a, b, value=weight, title=f"{weight} articles")
+
+    return net
+
+# --- Aggregation ---
+def group_node(*keys):
+    return "articles:" + "/".join(label_node(k) for k in keys if k is not None)
 
-# Build graphs
-graphs = []
+def aggregate_by_object(triples, max_nodes=MAX_NODES):
+    """One 'N articles' node per object, linked to it with weight N"""
+    counts = Counter(o for _, _, o in triples)
+    nodes, edges = {}, []
+    for obj, n in counts.most_common(max_nodes // 2):
+        group = group_node(obj)
+        nodes[obj] = (label_node(obj), n)
+        nodes[group] = (f"{n} articles", n)
+        edges.append((group, obj, n))
+    return nodes, edges
 
-# 1. Articles -> Labels
-graphs.append(("Articles and their Labels", filter_by_predicate(EX.hasLabel), "#97C2FC"))
+def aggregate_articles(label_triples, subject_triples, topic_triples, max_nodes=MAX_NODES):
+    """Collapse articles into one node per (label, subject, topic) combination"""
+    subject_of = {s: o for s, _, o in subject_triples}
+    topic_of = {s: o for s, _, o in topic_triples}
+    combos = Counter((o, subject_of.get(s), topic_of.get(s)) for s, _, o in label_triples)
 
-# 2. Articles -> Subjects
-graphs.append(("Articles and their Subjects", filter_by_predicate(EX.hasSubject), "#FFA07A"))
+    nodes, edges = {}, []
+    for combo, n in combos.most_common():
+        new_nodes = [k for k in combo if k is not None and k not in nodes]
+        if len(nodes) + len(new_nodes) + 1 > max_nodes:
+            break
+        group = group_node(*combo)
+        nodes[group] = (f"{n} articles", n)
+        for key in combo:
+            if key is None:
+                continue
+            label, total = nodes.get(key, (label_node(key), 0))
+            nodes[key] = (label, total + n)
+            edges.append((group, key, n))
+    return nodes, edges
 
-# 3. Articles -> Topics
-graphs.append(("Articles and their Topics", filter_by_predicate(EX.hasTopic), "#90EE90"))
+def top_entities(entity_triples, label_triples, max_entities=MAX_ENTITIES):
+    """Highest-degree entities linked to the labels of the articles mentioning them.
 
-# 4. Articles -> Entities
-graphs.append(("Articles and their Entities", filter_by_predicate(EX.hasEntity), "#DA70D6"))
+    Degree is the number of articles mentioning an entity, which is only
+    meaningful for graphs converted with --intern-entities.
+    """
+    label_of = {s: o for s, _, o in label_triples}
+    degree = Counter(o for _, _, o in entity_triples)
+    top = {entity for entity, _ in degree.most_common(max_entities)}
+    mentions = Counter((e, label_of.get(s)) for s, _, e in entity_triples if e in top)
 
-# 5. Full integrated graph (excluding literals as nodes)
-full_triples = [(s,p,o) for s,p,o in g if not isinstance(o, rdflib.Literal)]
-graphs.append(("Full Knowledge Graph", full_triples, "#FFB347"))
+    nodes = {entity: (label_node(entity), degree[entity]) for entity in top}
+    edges = []
+    for (entity, label), n in mentions.items():
+        if label is None:
+            continue
+        total = nodes.get(label, (label_node(label), 0))[1]
+        nodes[label] = (label_node(label), total + n)
+        edges.append((entity, label, n))
+    return nodes, edges
 
-# Create pyvis networks
-nets = [build_pyvis_graph(triples, title, color) for title, triples, color in graphs]
+def drill_down(focus, triples, max_nodes=MAX_NODES):
+    """Articles linked to the focus node (or the focus article itself) with all their links"""
+    def matches(node):
+        return str(node) == focus or label_node(node) == focus
 
-# Save all networks into one HTML page using pyvis' save_html and simple HTML wrapper
-html_parts = []
-for idx, net in enumerate(nets):
-    html_file = f"graph_{idx}.html"
-    net.save_graph(html_file)
+    articles = {s for s, _, o in triples if matches(o)} | {s for s, _, _ in triples if matches(s)}
+    # Each article brings its label/subject/topic/entities along; keep a stable sample
+    articles = set(sorted(articles, key=str)[:max(1, max_nodes // 4)])
+    return [t for t in triples if t[0] in articles]
 
-    # Extract just the <body> content from each saved html to embed
-    with open(html_file, "r", encoding="utf-8") as f:
-        content = f.read()
-    body_start = content.find("<body>")
-    body_end = content.find("</body>")
-    body_content = content[body_start + 6 : body_end]
+# --- Filter functions ---
+@lru_cache(maxsize=None)
+def filter_by_predicate(pred):
+    """Triples with this predicate; cached, since several views share the label triples"""
+    graph = load_graph()
+    if isinstance(graph, GraphSnapshot):
+        return graph.triples(pred)
+    return list(graph.triples((None, pred, None)))
+
+def iri_triples():
+    """Every triple whose object is not a literal: the baseline full graph, rdf:type edges included"""
+    graph = load_graph()
+    if isinstance(graph, GraphSnapshot):
+        return graph.triples(literals=False)
+    return [t for t in graph if not isinstance(t[2], rdflib.Literal)]
+
+# --- Views ---
+def view_specs(args):
+    """(title, kind, color) of every view to render"""
+    if args.focus:
+        return [(f"Subgraph around {args.focus}", "focus", "#FFB347")]
+    if args.raw:
+        return [
+            ("Articles and their Labels", "raw_labels", "#97C2FC"),
+            ("Articles and their Subjects", "raw_subjects", "#FFA07A"),
+            ("Articles and their Topics", "raw_topics", "#90EE90"),
+            ("Articles and their Entities", "raw_entities", "#DA70D6"),
+            ("Full Knowledge Graph", "raw_full", "#FFB347"),
+        ]
+    return [
+        ("Articles and their Labels", "labels", "#97C2FC"),
+        ("Articles and their Subjects", "subjects", "#FFA07A"),
+        ("Articles and their Topics", "topics", "#90EE90"),
+        (f"Top {args.max_entities} Entities by Label", "entities", "#DA70D6"),
+        ("Full Knowledge Graph (articles grouped by label, subject and topic)", "full", "#FFB347"),
+    ]
+
+def build_view(title, kind, color, args):
+    """pyvis network for one view; loads only the predicates the view needs"""
+    by_kind = {"labels": EX.hasLabel, "subjects": EX.hasSubject, "topics": EX.hasTopic, "entities": EX.hasEntity}
+    name = kind[len("raw_"):] if kind.startswith("raw_") else kind
 
-    # Add a section header and the graph
-    html_parts.append(f"<h2>{graphs[idx][0]}</h2>\n{body_content}")
+    if kind == "raw_full":
+        return build_pyvis_graph(iri_triples(), title, color, args.max_nodes)
+    if kind == "focus":
+        all_triples = [t for pred in by_kind.values() for t in filter_by_predicate(pred)]
+        return build_pyvis_graph(drill_down(args.focus, all_triples, args.max_nodes), title, color, args.max_nodes)
+    if kind.startswith("raw_"):
+        return build_pyvis_graph(filter_by_predicate(by_kind[name]), title, color, args.max_nodes)
 
-# Create the full HTML page with all graphs
-full_html = f"""
-<!DOCTYPE html>
+    if kind == "entities":
+        nodes, edges = top_entities(filter_by_predicate(EX.hasEntity), filter_by_predicate(EX.hasLabel),
+                                    args.max_entities)
+    elif kind == "full":
+        nodes, edges = aggregate_articles(filter_by_predicate(EX.hasLabel), filter_by_predicate(EX.hasSubject),
+                                          filter_by_predicate(EX.hasTopic), args.max_nodes)
+    else:
+        nodes, edges = aggregate_by_object(filter_by_predicate(by_kind[kind]), args.max_nodes)
+    return build_weighted_graph(nodes, edges, title, color)
+
+# --- HTML ---
+PAGE_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8" />
     <title>Knowledge Graph Visualizations</title>
+    {vis}
     <style>
         body {{ font-family: Arial, sans-serif; margin: 20px; }}
         h2 {{ border-bottom: 2px solid #444; padding-bottom: 5px; }}
         .graph-container {{ margin-bottom: 50px; }}
+        .graph {{ border: 1px solid lightgray; }}
     </style>
 </head>
 <body>
     <h1>Knowledge Graph Visualizations</h1>
-    {''.join(f'<div class="graph-container">{part}</div>' for part in html_parts)}
-</body>
+"""
+
+PAGE_FOOT = """</body>
 </html>
 """
 
-# Save the combined file
-with open("all_graphs_combined.html", "w", encoding="utf-8") as f:
-    f.write(full_html)
+VIEW_TEMPLATE = """    <div class="graph-container">
+        <h2>{title}</h2>
+        <div id="graph-{index}" class="graph" style="width: {width}; height: {height};"></div>
+        <script type="text/javascript">
+            new vis.Network(document.getElementById("graph-{index}"),
+                            {{nodes: new vis.DataSet({nodes}), edges: new vis.DataSet({edges})}},
+                            {options});
+        </script>
+    </div>
+"""
+
+def vis_resources(inline=False):
+    """The vis-network library, included once for every view on the page"""
+    if not inline:
+        return (f'<link rel="stylesheet" href="{VIS_CDN}/dist/vis-network.min.css" />\n'
+                f'    <script src="{VIS_CDN}/vis-network.min.js"></script>')
+    with open(os.path.join(VIS_LOCAL, "vis-network.css"), "r", encoding="utf-8") as f:
+        css = f.read()
+    with open(os.path.join(VIS_LOCAL, "vis-network.min.js"), "r", encoding="utf-8") as f:
+        js = f.read()
+    return f"<style>{css}</style>\n    <script>{js}</script>"
+
+def to_js(value):
+    # JSON inside <script>: keep a "</script>" in a node title from closing the tag
+    return json.dumps(value).replace("</", "<\\/")
+
+def render_view(index, spec, args):
+    """HTML fragment for one view, rendered in memory"""
+    title, kind, color = spec
+    net = build_view(title, kind, color, args)
+    nodes, edges, _, height, width, options = net.get_network_data()
+    return VIEW_TEMPLATE.format(index=index, title=html.escape(title), width=width, height=height,
+                                nodes=to_js(nodes), edges=to_js(edges), options=options)
+
+def write_page(path, parts, inline_vis=False):
+    """Stream the combined page to disk, one view fragment at a time.
+
+    Written to a temporary file first, so a view that fails leaves any
+    previous page in place rather than a truncated one.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(PAGE_HEAD.format(vis=vis_resources(inline_vis)))
+            for part in parts:
+                f.write(part)
+            f.write(PAGE_FOOT)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the knowledge graph as interactive HTML views.")
+    parser.add_argument("--focus", help="drill down: render only the subgraph around this node (e.g. label_FAKE, topic_3)")
+    parser.add_argument("--max-nodes", type=int, default=MAX_NODES, help="node cap per view")
+    parser.add_argument("--max-entities", type=int, default=MAX_ENTITIES, help="entities kept in the entity views, by degree")
+    parser.add_argument("--output", default="all_graphs_combined.html")
+    parser.add_argument("--raw", action="store_true", help="one node per article instead of aggregate nodes (still capped)")
+    parser.add_argument("--workers", type=int,
+                        help="build views in this many processes (default: one per CPU, or 1 when "
+                             "GRAPH_STORE is empty and there is no snapshot)")
+    parser.add_argument("--inline-vis", action="store_true",
+                        help="embed vis-network in the page (once) instead of loading it from the CDN")
+    args = parser.parse_args()
+
+    specs = view_specs(args)
+    workers = max(1, min(args.workers or default_workers(), len(specs)))
+    if workers == 1:
+        write_page(args.output, (render_view(i, spec, args) for i, spec in enumerate(specs)), args.inline_vis)
+    else:
+        prepare_graph()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            parts = pool.map(render_view, range(len(specs)), specs, [args] * len(specs))
+            write_page(args.output, parts, args.inline_vis)
+
+    print(f"All graphs saved to {args.output} — open this in any modern browser.")
 
-print("All graphs saved to all_graphs_combined.html — open this in any modern browser.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import gc
+import os
+
+bind = f":{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# Threads let concurrent /predict calls inside a worker share micro-batches
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# Import the app (and load the model) once in the master, then fork workers
+# that share the forest's memory copy-on-write
+preload_app = os.environ.get('PRELOAD_APP', '1') == '1'
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from inference import model_loader
+    try:
+        model_loader.warm()
+        server.log.info('Model loaded in master in %.2fs', model_loader.load_seconds)
+    except Exception:
+        server.log.exception('Model preload failed; workers will retry lazily')
+    # Keep the garbage collector from touching (and so copying) the shared objects
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    # Without preloading, warm each worker in the background so /ready flips
+    # to 200 without waiting for the first request
+    from inference import model_loader
+    if not model_loader.ready:
+        model_loader.load_async()
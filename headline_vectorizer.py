@@ -0,0 +1,122 @@
+"""Specialized TF-IDF transform for short headlines.
+
+Rebuilds the fitted TfidfVectorizer's analyzer (lowercase, token regex,
+stop word removal, n-grams) as a few tight loops over a handful of tokens
+and assembles the CSR arrays directly, skipping sklearn's generic
+CountVectorizer -> TfidfTransformer -> normalize chain. The output matches
+the pipeline's `tfidf` step value for value.
+"""
+import math
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class HeadlineVectorizer:
+    def __init__(self, vocabulary, idf, token_pattern, stop_words=None, ngram_range=(1, 1),
+                 lowercase=True, norm='l2', sublinear_tf=False, binary=False):
+        self.vocabulary = vocabulary
+        self.idf = None if idf is None else [float(v) for v in idf]
+        self.token_re = re.compile(token_pattern)
+        self.stop_words = frozenset(stop_words) if stop_words else None
+        self.ngram_range = ngram_range
+        self.lowercase = lowercase
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.n_features = len(vocabulary)
+
+    @staticmethod
+    def supports(vectorizer):
+        """Whether a fitted TfidfVectorizer uses only options this class reproduces"""
+        return (
+            getattr(vectorizer, 'analyzer', None) == 'word'
+            and vectorizer.tokenizer is None
+            and vectorizer.preprocessor is None
+            and vectorizer.strip_accents is None
+            and vectorizer.norm in ('l2', None)
+            # transform() computes in float64; other dtypes would round differently
+            and np.dtype(getattr(vectorizer, 'dtype', np.float64)) == np.float64
+            and hasattr(vectorizer, 'vocabulary_')
+        )
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer):
+        if not cls.supports(vectorizer):
+            raise ValueError('vectorizer uses options the headline fast path does not support')
+        return cls(
+            vocabulary=dict(vectorizer.vocabulary_),
+            idf=vectorizer.idf_ if vectorizer.use_idf else None,
+            token_pattern=vectorizer.token_pattern,
+            stop_words=vectorizer.get_stop_words(),
+            ngram_range=vectorizer.ngram_range,
+            lowercase=vectorizer.lowercase,
+            norm=vectorizer.norm,
+            sublinear_tf=vectorizer.sublinear_tf,
+            binary=vectorizer.binary,
+        )
+
+    def _counts(self, text):
+        """Vocabulary index -> term count for one document"""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self.token_re.findall(text)
+        if self.stop_words is not None:
+            stop_words = self.stop_words
+            tokens = [t for t in tokens if t not in stop_words]
+
+        vocabulary = self.vocabulary
+        counts = {}
+        min_n, max_n = self.ngram_range
+        n_tokens = len(tokens)
+        for n in range(min_n, min(max_n, n_tokens) + 1):
+            if n == 1:
+                grams = tokens
+            else:
+                grams = [' '.join(tokens[i:i + n]) for i in range(n_tokens - n + 1)]
+            for gram in grams:
+                index = vocabulary.get(gram)
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+        return counts
+
+    def transform_one(self, text):
+        """Sorted feature indices and TF-IDF weights for one headline"""
+        counts = self._counts(text)
+        indices = sorted(counts)
+        idf = self.idf
+        weights = []
+        for index in indices:
+            value = 1.0 if self.binary else float(counts[index])
+            if self.sublinear_tf:
+                value = math.log(value) + 1.0
+            if idf is not None:
+                value *= idf[index]
+            weights.append(value)
+
+        if self.norm == 'l2':
+            # Same sequential sum of squares as sklearn's row normalization
+            total = 0.0
+            for value in weights:
+                total += value * value
+            if total != 0.0:
+                norm = math.sqrt(total)
+                weights = [value / norm for value in weights]
+        return indices, weights
+
+    def transform(self, texts):
+        """CSR matrix equal to the fitted vectorizer's transform(texts)"""
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            row_indices, row_weights = self.transform_one(text)
+            indices.extend(row_indices)
+            data.extend(row_weights)
+            indptr.append(len(indices))
+        return sp.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32),
+             np.asarray(indptr, dtype=np.int32)),
+            shape=(len(indptr) - 1, self.n_features),
+        )
@@ -0,0 +1,425 @@
+import codecs
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import queue
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from attribution import ForestExplainer
+from forest_engine import CompiledPipeline
+from model_registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+# 'compiled' evaluates the forest with forest_engine's flat arrays instead of sklearn
+FOREST_ENGINE = os.environ.get('FOREST_ENGINE', 'sklearn')
+FOREST_THREADS = int(os.environ.get('FOREST_THREADS', 1))
+
+# Labels used when the pipeline was trained in RF_ML.ipynb
+FAKE_LABEL = 0
+REAL_LABEL = 1
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+
+def clean_text(text):
+    """Same normalization applied to the training titles in RF_ML.ipynb"""
+    text = str(text).lower()
+    return _PUNCTUATION_RE.sub('', text)
+
+
+# --- Model loading ---
+class ModelLoader:
+    """Serve the active model version from the registry, one copy per process.
+
+    Under gunicorn with preload_app (see gunicorn.conf.py) the master calls
+    warm() before forking, so every worker shares the forest's node arrays
+    copy-on-write instead of unpickling its own copy. Otherwise each worker
+    loads lazily, optionally in the background, and status() tells the
+    readiness probe when the model is warm.
+
+    reload() loads the new version off to the side and then swaps a single
+    reference, so requests that already hold the old handle finish on it.
+    """
+
+    def __init__(self, registry, mmap_mode=None):
+        self.registry = registry
+        self.mmap_mode = mmap_mode
+        self.state = 'cold'
+        self.error = None
+        self.load_seconds = None
+        self.swaps = 0
+        self.handle = None
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watcher_pid = None
+        self._explainer = None
+
+    def get(self):
+        return self.get_handle().pipeline
+
+    def get_handle(self):
+        handle = self.handle
+        if handle is None:
+            handle = self.load()
+        return handle
+
+    @property
+    def version(self):
+        handle = self.handle
+        return handle.version if handle is not None else None
+
+    @property
+    def checksum(self):
+        handle = self.handle
+        return handle.sha256 if handle is not None else None
+
+    def _load_active(self):
+        start = time.perf_counter()
+        # mmap_mode only helps for arrays joblib stores as plain numpy
+        # buffers in an uncompressed dump; sklearn trees copy their nodes
+        handle = self.registry.load(mmap_mode=self.mmap_mode)
+        if FOREST_ENGINE == 'compiled':
+            handle = handle._replace(pipeline=CompiledPipeline(handle.pipeline, n_threads=FOREST_THREADS))
+        self.load_seconds = time.perf_counter() - start
+        return handle
+
+    def load(self):
+        with self._lock:
+            if self.handle is not None:
+                return self.handle
+            self.state = 'loading'
+            try:
+                self.handle = self._load_active()
+            except Exception as e:
+                self.state = 'failed'
+                self.error = str(e)
+                raise
+            self.state = 'ready'
+            self.error = None
+            return self.handle
+
+    def get_explainer(self):
+        """Attribution explainer for the current model, rebuilt after a swap"""
+        handle = self.get_handle()
+        cached = self._explainer
+        if cached is None or cached[0] is not handle:
+            cached = (handle, ForestExplainer.from_pipeline(handle.pipeline, FAKE_LABEL))
+            self._explainer = cached
+        return cached[1]
+
+    def load_async(self):
+        """Start loading in a background thread; the readiness probe reports progress"""
+        def _load():
+            try:
+                self.load()
+            except Exception:
+                pass  # recorded in self.error
+        threading.Thread(target=_load, name='model-loader', daemon=True).start()
+
+    def warm(self):
+        """Load the model and its explainer and run one prediction so the first request isn't slow.
+
+        Called before fork, this also puts the explainer's compiled arrays
+        in the memory the workers share.
+        """
+        handle = self.get_handle()
+        handle.pipeline.predict_proba([clean_text('warm up the model')])
+        self.get_explainer()
+        return handle
+
+    def reload(self):
+        """Load the registry's active version and swap it in if it changed"""
+        with self._reload_lock:
+            handle = self._load_active()
+            current = self.handle
+            if current is not None and (current.version, current.sha256) == (handle.version, handle.sha256):
+                return current
+            handle.pipeline.predict_proba([clean_text('warm up the model')])
+            # Build the new explainer before the swap, so requests never build it themselves
+            self._explainer = (handle, ForestExplainer.from_pipeline(handle.pipeline, FAKE_LABEL))
+            self.handle = handle
+            self.state = 'ready'
+            self.error = None
+            self.swaps += 1
+            logger.info('Swapped model %s -> %s', current.version if current else None, handle.version)
+            return handle
+
+    def ensure_watcher(self, interval):
+        """Poll the registry every interval seconds and hot-swap on change.
+
+        Safe to call on every request: only the first call in each process
+        (including each forked worker) starts the thread.
+        """
+        pid = os.getpid()
+        if interval <= 0 or self._watcher_pid == pid:
+            return
+        with self._lock:
+            if self._watcher_pid == pid:
+                return
+            self._watcher_pid = pid
+            threading.Thread(target=self._watch, args=(interval,), name='model-watcher', daemon=True).start()
+
+    def _watch(self, interval):
+        last = self.registry.signature()
+        while True:
+            time.sleep(interval)
+            signature = self.registry.signature()
+            if signature == last:
+                continue
+            last = signature
+            try:
+                self.reload()
+            except Exception:
+                # Keep serving the old model, e.g. if the new file is still being written
+                logger.exception('Model reload failed')
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+    def status(self):
+        handle = self.handle
+        return {
+            'state': self.state,
+            'version': handle.version if handle else None,
+            'path': handle.path if handle else None,
+            'metadata': handle.metadata if handle else None,
+            'load_seconds': self.load_seconds,
+            'swaps': self.swaps,
+            'error': self.error,
+            'pid': os.getpid(),
+        }
+
+
+model_loader = ModelLoader(ModelRegistry(), mmap_mode=os.environ.get('MODEL_MMAP_MODE') or None)
+
+
+def get_pipeline():
+    """Return the process-wide pipeline, loading it on first use"""
+    return model_loader.get()
+
+
+def predict_proba_batch(headlines, pipeline=None):
+    """Score a list of headlines with one predict_proba call"""
+    pipeline = pipeline if pipeline is not None else get_pipeline()
+    classes = list(pipeline.classes_)
+    fake_col = classes.index(FAKE_LABEL)
+    real_col = classes.index(REAL_LABEL)
+
+    proba = pipeline.predict_proba([clean_text(h) for h in headlines])
+    return [
+        {'fake_prob': float(row[fake_col]), 'real_prob': float(row[real_col])}
+        for row in proba
+    ]
+
+
+def explain_headlines(headlines, top_k=5):
+    """Fake-class probability and top contributing words for each headline"""
+    explainer = model_loader.get_explainer()
+    return explainer.explain_texts([clean_text(h) for h in headlines], top_k=top_k)
+
+
+def format_prediction(headline, probs):
+    """Turn raw class probabilities into the JSON returned by the API"""
+    is_fake = probs['fake_prob'] >= probs['real_prob']
+    return {
+        'headline': headline,
+        'label': 'FAKE' if is_fake else 'REAL',
+        'confidence': max(probs['fake_prob'], probs['real_prob']),
+        'fake_prob': probs['fake_prob'],
+        'real_prob': probs['real_prob'],
+    }
+
+
+# --- Micro-batching ---
+class MicroBatcher:
+    """Coalesce concurrent single-item requests into batched calls.
+
+    Requests are queued and a background thread collects them until either
+    max_batch_size items are waiting or max_wait_ms has passed since the first
+    one arrived, then calls predict_fn once for the whole batch.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=5):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self):
+        # Threads don't survive a fork, so each gunicorn worker starts its own
+        pid = os.getpid()
+        if self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == pid and self._thread.is_alive():
+                return
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._queue,), name='micro-batcher', daemon=True
+            )
+            self._thread.start()
+            self._pid = pid
+
+    def submit(self, item):
+        """Queue one item and return a Future for its result"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def predict(self, item, timeout=None):
+        future = self.submit(item)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise
+
+    def _collect(self, work_queue):
+        batch = [work_queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(work_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, work_queue):
+        while True:
+            batch = self._collect(work_queue)
+            # Skip requests whose caller already gave up
+            batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self.predict_fn([item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+# --- Streaming batch input ---
+_JSON_SEPARATORS = ' \t\r\n,'
+_JSON_TERMINATORS = _JSON_SEPARATORS + ']'
+
+
+def iter_json_array(byte_chunks):
+    """Yield the elements of a JSON array as its bytes arrive.
+
+    Only the current unparsed tail is kept in memory, so arbitrarily large
+    uploads can be consumed element by element.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buf = ''
+    opened = False
+
+    for chunk in itertools.chain(byte_chunks, [None]):
+        final = chunk is None
+        buf += text_decoder.decode(b'' if final else chunk, final=final)
+        pos = 0
+        while True:
+            while pos < len(buf) and buf[pos] in _JSON_SEPARATORS:
+                pos += 1
+            if pos == len(buf):
+                break
+            if not opened:
+                if buf[pos] != '[':
+                    raise ValueError('expected a JSON array')
+                opened = True
+                pos += 1
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break  # element is split across chunks, wait for more
+            # A number or literal is only complete once a separator follows it:
+            # '1.5e10' split after '1.' or '1.5e' would otherwise decode as 1 or 1.5
+            if not final and buf[pos] not in '"[{' and (end == len(buf) or buf[end] not in _JSON_TERMINATORS):
+                break
+            yield value
+            pos = end
+        buf = buf[pos:]
+
+    if opened:
+        raise ValueError('unterminated JSON array')
+
+
+def iter_ndjson(lines):
+    """Yield one decoded JSON value per non-empty line"""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def normalize_item(value):
+    """Accept either a bare headline string or an object with a headline/title"""
+    if isinstance(value, dict):
+        headline = value.get('headline', value.get('title', ''))
+        return value.get('id'), str(headline or '').strip()
+    return None, str(value or '').strip()
+
+
+def score_stream(values, chunk_size=256, pipeline=None, cache=None):
+    """Classify an iterable of items chunk by chunk, yielding results in order.
+
+    Each chunk is scored as soon as it is full, so results for the first
+    chunk are produced before later input has even been read. Headlines found
+    in the optional prediction cache are not re-scored.
+    """
+    iterator = enumerate(values)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+
+        rows = []
+        for index, value in chunk:
+            item_id, headline = normalize_item(value)
+            row = {'index': index}
+            if item_id is not None:
+                row['id'] = item_id
+            rows.append((row, headline))
+
+        pending = []
+        for row, headline in rows:
+            if not headline:
+                continue
+            cached = cache.get(headline) if cache is not None else None
+            if cached is not None:
+                row.update(format_prediction(headline, cached))
+            else:
+                pending.append((row, headline))
+
+        if pending:
+            probs = predict_proba_batch([headline for _, headline in pending], pipeline=pipeline)
+            for (row, headline), p in zip(pending, probs):
+                row.update(format_prediction(headline, p))
+                if cache is not None:
+                    cache.set(headline, p)
+
+        for row, headline in rows:
+            if not headline:
+                row['error'] = 'headline is required'
+            yield row
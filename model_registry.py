@@ -0,0 +1,186 @@
+"""Versioned model artifacts for the fake news detector.
+
+Layout under the registry root (Models/ by default):
+
+    registry.json                         manifest: active version + metadata
+    <version>/fake_news_rf_pipeline.pkl   one directory per registered version
+
+A root without a manifest still works: the plain
+Models/fake_news_rf_pipeline.pkl is served as version "legacy".
+
+Usage:
+    python model_registry.py list
+    python model_registry.py register path/to/pipeline.pkl [--version v2] [--no-activate]
+    python model_registry.py activate v2
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections import namedtuple
+
+import joblib
+
+REGISTRY_ROOT = os.environ.get('MODEL_REGISTRY_ROOT', 'Models')
+MANIFEST_FILENAME = 'registry.json'
+PIPELINE_FILENAME = 'fake_news_rf_pipeline.pkl'
+LEGACY_VERSION = 'legacy'
+
+ModelHandle = namedtuple('ModelHandle', ['version', 'path', 'sha256', 'metadata', 'pipeline'])
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_signature(path):
+    """Cheap fingerprint of a file; changes whenever the file is replaced"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f'{st.st_mtime_ns}:{st.st_size}'
+
+
+def describe_pipeline(pipeline):
+    """Metadata recorded for each version: vocabulary size, forest shape, classes"""
+    vectorizer = pipeline.steps[0][1]
+    model = pipeline.steps[-1][1]
+    return {
+        'vocab_size': len(getattr(vectorizer, 'vocabulary_', {})),
+        'n_estimators': getattr(model, 'n_estimators', None),
+        'max_depth': getattr(model, 'max_depth', None),
+        'classes': [int(c) for c in getattr(model, 'classes_', [])],
+    }
+
+
+class ModelRegistry:
+    def __init__(self, root=REGISTRY_ROOT):
+        self.root = root
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.root, MANIFEST_FILENAME)
+
+    def read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'active': None, 'versions': {}}
+
+    def _write_manifest(self, manifest):
+        # Write to a temp file and rename so readers never see a partial manifest
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.registry-', suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def versions(self):
+        return self.read_manifest()['versions']
+
+    def entry(self, version=None):
+        """Return (version, manifest entry) for version, or the active one"""
+        manifest = self.read_manifest()
+        version = version or manifest['active']
+        if version is None:
+            if os.path.exists(os.path.join(self.root, PIPELINE_FILENAME)):
+                return LEGACY_VERSION, {'path': PIPELINE_FILENAME}
+            raise FileNotFoundError(f'no model registered in {self.root}')
+        if version not in manifest['versions']:
+            raise KeyError(f'unknown model version: {version}')
+        return version, manifest['versions'][version]
+
+    def signature(self):
+        """Changes whenever the active model may have changed"""
+        if os.path.exists(self.manifest_path):
+            return file_signature(self.manifest_path)
+        return file_signature(os.path.join(self.root, PIPELINE_FILENAME))
+
+    def load(self, version=None, mmap_mode=None):
+        """Load a version (default: active), verifying its checksum"""
+        version, entry = self.entry(version)
+        path = os.path.join(self.root, entry['path'])
+        sha256 = file_sha256(path)
+        if entry.get('sha256') and entry['sha256'] != sha256:
+            raise ValueError(f'checksum mismatch for model version {version}: {path}')
+        pipeline = joblib.load(path, mmap_mode=mmap_mode)
+        metadata = {key: value for key, value in entry.items() if key != 'path'}
+        metadata.update(describe_pipeline(pipeline))
+        metadata['sha256'] = sha256
+        return ModelHandle(version, path, sha256, metadata, pipeline)
+
+    def register(self, source, version=None, activate=True):
+        """Copy a pipeline into the registry and record its checksum and metadata"""
+        version = version or time.strftime('%Y%m%d-%H%M%S')
+        manifest = self.read_manifest()
+        if version in manifest['versions'] or version == LEGACY_VERSION:
+            raise ValueError(f'model version already exists: {version}')
+
+        version_dir = os.path.join(self.root, version)
+        os.makedirs(version_dir, exist_ok=True)
+        dest = os.path.join(version_dir, PIPELINE_FILENAME)
+        shutil.copy2(source, dest + '.tmp')
+        os.replace(dest + '.tmp', dest)
+
+        entry = {
+            'path': os.path.join(version, PIPELINE_FILENAME),
+            'sha256': file_sha256(dest),
+            'size': os.path.getsize(dest),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        entry.update(describe_pipeline(joblib.load(dest)))
+
+        manifest['versions'][version] = entry
+        if activate:
+            manifest['active'] = version
+        self._write_manifest(manifest)
+        return version
+
+    def activate(self, version):
+        manifest = self.read_manifest()
+        if version not in manifest['versions']:
+            raise KeyError(f'unknown model version: {version}')
+        manifest['active'] = version
+        self._write_manifest(manifest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', default=REGISTRY_ROOT)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list')
+    register = commands.add_parser('register')
+    register.add_argument('source')
+    register.add_argument('--version')
+    register.add_argument('--no-activate', action='store_true')
+    activate = commands.add_parser('activate')
+    activate.add_argument('version')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.root)
+    if args.command == 'list':
+        manifest = registry.read_manifest()
+        for version, entry in sorted(manifest['versions'].items()):
+            marker = '*' if version == manifest['active'] else ' '
+            print(f"{marker} {version}  sha256={entry['sha256'][:12]}  "
+                  f"vocab={entry.get('vocab_size')}  trees={entry.get('n_estimators')}")
+        if not manifest['versions']:
+            print(f'No versions registered; serving {LEGACY_VERSION} {PIPELINE_FILENAME}')
+    elif args.command == 'register':
+        version = registry.register(args.source, args.version, activate=not args.no_activate)
+        print(f'Registered {version}')
+    elif args.command == 'activate':
+        registry.activate(args.version)
+        print(f'Activated {args.version}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from inference import clean_text
+
+
+def cache_key(headline):
+    """Normalize a headline the way the model sees it (clean_text + collapsed whitespace)"""
+    return ' '.join(clean_text(headline).split())
+
+
+class SharedCacheStore:
+    """SQLite-backed store shared by all gunicorn workers on the same host.
+
+    Point it at a path on tmpfs (e.g. /dev/shm) to keep it in memory.
+    """
+
+    def __init__(self, path, maxsize):
+        self.path = path
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._writes = 0
+        conn = self._conn()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS predictions '
+            '(key TEXT PRIMARY KEY, value TEXT, expires REAL, signature TEXT)'
+        )
+        conn.commit()
+
+    def _conn(self):
+        # sqlite connections can't be shared across threads or forks
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key, signature):
+        row = self._conn().execute(
+            'SELECT value, expires FROM predictions WHERE key = ? AND signature IS ?',
+            (key, signature),
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value, expires, signature):
+        conn = self._conn()
+        conn.execute(
+            'INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)',
+            (key, json.dumps(value), expires, signature),
+        )
+        self._writes += 1
+        if self._writes % 1000 == 0:
+            self.prune(signature)
+
+    def prune(self, signature):
+        """Drop expired and stale-model rows, then trim to maxsize soonest-expiring first"""
+        conn = self._conn()
+        conn.execute(
+            'DELETE FROM predictions WHERE expires < ? OR signature IS NOT ?',
+            (time.time(), signature),
+        )
+        conn.execute(
+            'DELETE FROM predictions WHERE key IN '
+            '(SELECT key FROM predictions ORDER BY expires DESC LIMIT -1 OFFSET ?)',
+            (self.maxsize,),
+        )
+
+    def clear(self):
+        self._conn().execute('DELETE FROM predictions')
+
+
+class PredictionCache:
+    """Bounded LRU cache of predictions with TTL expiry.
+
+    Entries are dropped when model_signature() changes (e.g. the active model
+    version is swapped) so a new model never serves stale results. An
+    optional SharedCacheStore lets workers reuse each other's predictions.
+    """
+
+    def __init__(self, maxsize=10000, ttl=3600, model_signature=None, shared_path=None,
+                 check_interval=1.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.model_signature = model_signature
+        self.check_interval = check_interval
+        self.shared = SharedCacheStore(shared_path, maxsize) if shared_path else None
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._signature = model_signature() if model_signature else None
+        self._last_check = time.monotonic()
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_model(self):
+        # Called with the lock held; check the model at most once per interval
+        if not self.model_signature:
+            return
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        signature = self.model_signature()
+        if signature != self._signature:
+            self._signature = signature
+            self._entries.clear()
+            self.invalidations += 1
+
+    def get(self, headline):
+        key = cache_key(headline)
+        with self._lock:
+            if self.maxsize <= 0:
+                return None
+            self._check_model()
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires >= time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            signature = self._signature
+
+        if self.shared is not None:
+            found = self.shared.get(key, signature)
+            if found is not None:
+                with self._lock:
+                    self._store(key, *found)
+                    self.shared_hits += 1
+                return found[0]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, headline, value):
+        key = cache_key(headline)
+        expires = time.time() + self.ttl
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            self._store(key, value, expires)
+            signature = self._signature
+        if self.shared is not None:
+            self.shared.set(key, value, expires, signature)
+
+    def _store(self, key, value, expires):
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'shared': self.shared is not None,
+            }
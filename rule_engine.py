@@ -0,0 +1,123 @@
+import json
+from collections import deque, namedtuple
+
+Match = namedtuple('Match', ['indicator', 'category', 'start', 'end'])
+
+# Default indicators used by the demo pre-filter in flask_app.py
+DEFAULT_RULES = {
+    # Strong fake news indicators
+    'fake': [
+        'breaking news:', 'shocking:', 'blood on their hands', 'secret plan',
+        'major problem', 'conspiracy', 'exposed by', 'truth about', 'coverup',
+        'breaking:', 'urgent:', 'unbelievable', 'scientists hate',
+        'doctors don\'t want you to know', 'click here', 'you won\'t believe',
+        'this will shock you', 'must read', 'exclusive', 'leaked'
+    ],
+    # Real news indicators
+    'real': [
+        'officials announce', 'parliament votes', 'government', 'committee',
+        'department', 'ministry', 'according to', 'study shows', 'research indicates',
+        'officials said', 'reported by', 'sources confirm', 'data shows',
+        'analysis reveals', 'experts believe', 'study published', 'reuters', 'ap news'
+    ],
+}
+
+
+def load_rules(path):
+    """Read rules from a JSON file of the form {"category": ["indicator", ...]}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+    if not isinstance(rules, dict) or not all(isinstance(v, list) for v in rules.values()):
+        raise ValueError(f'{path}: expected an object mapping categories to lists of indicators')
+    return rules
+
+
+def _offset_table(text):
+    """Index in text of the character each position of text.lower() comes from"""
+    origin = []
+    for i, ch in enumerate(text):
+        origin.extend([i] * len(ch.lower()))
+    return origin
+
+
+class RuleEngine:
+    """Aho-Corasick automaton over every indicator of every category.
+
+    All indicators are compiled into one trie with failure links, so matching
+    a headline is a single pass over its characters no matter how many rules
+    are loaded. Matching is case-insensitive substring matching, the same as
+    `indicator in headline.lower()`.
+    """
+
+    def __init__(self, rules):
+        self.rules = {category: list(indicators) for category, indicators in rules.items()}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for category, indicators in self.rules.items():
+            for indicator in indicators:
+                self._add(indicator.lower(), category)
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(load_rules(path))
+
+    def __len__(self):
+        return sum(len(indicators) for indicators in self.rules.values())
+
+    def _add(self, indicator, category):
+        if not indicator:
+            return
+        state = 0
+        for ch in indicator:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        if (indicator, category) not in self._out[state]:
+            self._out[state] += ((indicator, category),)
+
+    def _build_failure_links(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        pending = deque(goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for ch, nxt in goto[state].items():
+                pending.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                # A state also emits everything its longest proper suffix emits
+                out[nxt] += out[fail[nxt]]
+
+    def find_all(self, text):
+        """Return every (possibly overlapping) indicator match in text.
+
+        start and end are offsets into text itself, so text[start:end] is the
+        matched span even where lowercasing changes the length ('İ' -> 'i̇').
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        lowered = text.lower()
+        origin = _offset_table(text) if len(lowered) != len(text) else None
+        matches = []
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for indicator, category in out[state]:
+                start, end = i + 1 - len(indicator), i + 1
+                if origin is not None:
+                    start, end = origin[start], origin[end - 1] + 1
+                matches.append(Match(indicator, category, start, end))
+        return matches
+
+    def categories(self, text):
+        """Set of categories with at least one match in text"""
+        return {m.category for m in self.find_all(text)}
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+HEADLINES = [
+    'Senate passes sweeping tax bill after late night vote',
+    'Trump says media is the enemy of the people',
+    'BREAKING: Hillary secretly hospitalized, insiders claim',
+    'Markets rally as Fed holds interest rates steady',
+    'Shocking video proves election was rigged',
+    'Pope endorses candidate in surprise statement',
+    'House committee subpoenas former adviser over Russia contacts',
+    'Doctors hate this one weird trick for weight loss',
+    'White House announces new trade talks with China',
+    'Celebrity reveals the truth about vaccines and autism',
+    'Supreme Court hears arguments on travel ban',
+    'Obama caught on tape admitting fraud, sources say',
+]
+
+
+# Unseen words, stop words, punctuation, case, repeats and an empty title
+UNSEEN_HEADLINES = [
+    'Senate VOTES on the tax bill, again!',
+    'Hillary Clinton and the Pope: a rigged election?',
+    'zebra quantum marmalade',
+    'the of and a an',
+    '',
+    'vote vote vote vote rigged rigged',
+    "Fed's rates: markets rally — then fall",
+]
+
+
+@pytest.fixture(scope='session')
+def headlines():
+    from inference import clean_text
+
+    return [clean_text(title) for title in HEADLINES + UNSEEN_HEADLINES]
+
+
+@pytest.fixture(scope='session')
+def small_pipeline():
+    """TF-IDF + RandomForest pipeline shaped like RF_ML.ipynb's, fitted on a few synthetic titles"""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import Pipeline
+
+    from inference import clean_text
+
+    titles = [clean_text(title) for title in HEADLINES * 5]
+    labels = [i % 2 for i in range(len(HEADLINES))] * 5
+    pipeline = Pipeline([
+        ('tfidf', TfidfVectorizer(stop_words='english', ngram_range=(1, 2), max_features=200)),
+        ('model', RandomForestClassifier(n_estimators=15, max_depth=8, random_state=42)),
+    ])
+    return pipeline.fit(titles, labels)
@@ -0,0 +1,59 @@
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import asgi_app
+
+
+def call(app, method, path, body=b'', chunk_size=None):
+    chunk_size = chunk_size or max(len(body), 1)
+    messages = [{'type': 'http.request', 'body': body[i:i + chunk_size], 'more_body': True}
+                for i in range(0, len(body), chunk_size)] or [{'type': 'http.request', 'body': b''}]
+    messages[-1]['more_body'] = False
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({'type': 'http', 'method': method, 'path': path}, receive, send))
+    return sent[0]['status'], json.loads(sent[1]['body'])
+
+
+class BrokenPool:
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool('worker died')
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.fixture
+def app():
+    app = asgi_app.DetectorApp()
+    yield app
+    app.stop()
+
+
+def test_oversized_body_is_413(app):
+    body = json.dumps({'headline': 'x' * asgi_app.MAX_BODY_BYTES}).encode()
+    status = call(app, 'POST', '/predict', body, chunk_size=4096)[0]
+    assert status == 413
+    assert call(app, 'POST', '/predict', b'{broken')[0] == 400
+
+
+def test_broken_pool_is_replaced(app):
+    app.start()
+    app.pool.shutdown()
+    app.pool = BrokenPool()
+
+    status, payload = call(app, 'POST', '/predict', b'{"headline": "Senate passes tax bill"}')
+
+    assert status == 503
+    assert isinstance(app.pool, ProcessPoolExecutor)
+    assert app.health()['pool_restarts'] == 1
@@ -0,0 +1,33 @@
+import numpy as np
+
+from attribution import ForestExplainer
+from forest_engine import CompiledPipeline
+from inference import FAKE_LABEL
+
+
+def test_contributions_add_up_to_the_probability(small_pipeline, headlines):
+    explainer = ForestExplainer.from_pipeline(small_pipeline, FAKE_LABEL)
+    X = small_pipeline.steps[0][1].transform(headlines)
+    fake_col = list(small_pipeline.classes_).index(FAKE_LABEL)
+
+    probability, contributions = explainer.contributions(X)
+
+    expected = small_pipeline.predict_proba(headlines)[:, fake_col]
+    assert np.allclose(probability, expected, rtol=0, atol=1e-12)
+    assert np.allclose(explainer.bias + contributions.sum(axis=1), expected, rtol=0, atol=1e-12)
+
+
+def test_explanations_from_compiled_pipeline(small_pipeline, headlines):
+    explainer = ForestExplainer.from_pipeline(CompiledPipeline(small_pipeline), FAKE_LABEL)
+    fake_col = list(small_pipeline.classes_).index(FAKE_LABEL)
+
+    explanations = explainer.explain_texts(headlines, top_k=3)
+
+    expected = small_pipeline.predict_proba(headlines)[:, fake_col]
+    for explanation, probability in zip(explanations, expected):
+        assert abs(explanation['probability'] - probability) < 1e-12
+        assert len(explanation['top_features']) <= min(3, explanation['active_features_count'])
+        total = explanation['bias'] + explanation['absent_contribution'] + sum(
+            feature['contribution'] for feature in explanation['top_features'])
+        if explanation['active_features_count'] <= 3:
+            assert abs(total - probability) < 1e-12
@@ -0,0 +1,102 @@
+import sys
+
+import pandas as pd
+import pytest
+
+import converting
+
+ROWS = [
+    ('Senate passes tax bill', 'true', 'politicsNews', 3, 'tax, bill', 'Senate (ORG); Congress (ORG)'),
+    ('Trump tweets again', 'fake', 'News', 1, 'trump, tweet', 'Trump (PERSON)'),
+    ('Markets rally', 'fake', 'News', 3, 'market, stock', ''),
+    ('Election fraud claims', 'fake', 'politics', 0, 'vote, fraud', 'FBI (ORG)'),
+]
+
+
+def write_csv(path, rows):
+    pd.DataFrame(rows, columns=converting.FINGERPRINT_COLUMNS).to_csv(path, index=False)
+
+
+def statements(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return sorted(line for line in f if line.strip() and not line.startswith('@prefix'))
+
+
+@pytest.mark.parametrize('intern_entities', [False, True])
+def test_incremental_after_delete_matches_full_rebuild(tmp_path, intern_entities):
+    csv_path, ttl_path, full_path = tmp_path / 'in.csv', str(tmp_path / 'out.ttl'), str(tmp_path / 'full.ttl')
+    write_csv(csv_path, ROWS)
+    converting.convert_incremental(csv_path, ttl_path, intern_entities=intern_entities)
+
+    # Drop the only REAL article: label_TRUE and subject_politicsnews lose their last article
+    write_csv(csv_path, ROWS[1:])
+    counts = converting.convert_incremental(csv_path, ttl_path, intern_entities=intern_entities)
+    converting.convert(csv_path, full_path, intern_entities=intern_entities)
+
+    assert counts['removed_articles'] == 1
+    assert statements(ttl_path) == statements(full_path)
+    assert not [line for line in statements(ttl_path) if 'label_TRUE' in line]
+
+
+def test_fingerprints_ignore_chunk_dtypes(tmp_path):
+    csv_path, ttl_path, full_path = tmp_path / 'in.csv', str(tmp_path / 'out.ttl'), str(tmp_path / 'full.ttl')
+    write_csv(csv_path, ROWS)
+    converting.convert_incremental(csv_path, ttl_path)
+
+    # An empty dominant_topic turns the column from int64 into float64
+    write_csv(csv_path, ROWS + [('No topic here', 'true', 'News', None, '', '')])
+    counts = converting.convert_incremental(csv_path, ttl_path)
+    converting.convert(csv_path, full_path)
+
+    assert counts['added_articles'] == 1
+    assert counts['changed_articles'] == 0
+    assert counts['deleted_triples'] == 0
+    assert statements(ttl_path) == statements(full_path)
+
+
+def test_incremental_rejects_workers(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, 'argv', ['converting.py', str(tmp_path / 'in.csv'), '--incremental', '--workers', '2'])
+    with pytest.raises(SystemExit):
+        converting.main()
+
+
+def test_entity_iris_are_distinct_per_key():
+    entities = converting.parse_entities(pd.Series(['a b (ORG); a_b (ORG); A  B (org); 50% (PERCENT)']))
+    iris = converting.entity_iris(entities).tolist()
+
+    assert iris[0] == iris[2]  # same normalized key
+    assert len({iris[0], iris[1], iris[3]}) == 3
+    assert iris[0] == f'<{converting.EX}entity_ORG_a%20b>'
+
+
+def test_missing_topic_terms_write_no_triple(tmp_path):
+    csv_path, ttl_path = tmp_path / 'in.csv', str(tmp_path / 'out.ttl')
+    write_csv(csv_path, ROWS + [('No topic here', 'true', 'News', None, '', '')])
+    converting.convert(csv_path, ttl_path)
+
+    lines = statements(ttl_path)
+    assert not [line for line in lines if '"nan"' in line]
+    assert len([line for line in lines if 'topicTerms' in line]) == len(ROWS)
+
+
+def test_multi_word_subjects_make_valid_iris(tmp_path):
+    import rdflib
+
+    from graph_index import GraphIndex
+    from graph_snapshot import GraphSnapshot, write_snapshot
+
+    csv_path, ttl_path = tmp_path / 'in.csv', str(tmp_path / 'out.ttl')
+    write_csv(csv_path, ROWS + [('Budget agreed', 'true', 'Government News', 2, 'budget', '')])
+    converting.convert(csv_path, ttl_path)
+
+    graph = rdflib.Graph().parse(ttl_path, format='turtle')
+    assert (None, converting.hasSubject, converting.EX['subject_government%20news']) in graph
+
+    write_snapshot(ttl_path, str(tmp_path / 'snap'))
+    snapshot = GraphSnapshot(str(tmp_path / 'snap'))
+    predicates = {p for _, p, _ in snapshot.triples()}
+    assert predicates <= {str(p) for p in (rdflib.RDF.type, converting.title, converting.topicTerms,
+                                           converting.hasLabel, converting.hasSubject, converting.hasTopic,
+                                           converting.hasEntity, converting.entityName, converting.entityType)}
+    counts = GraphIndex(snapshot).counts(by=['subject'], subject='Government News')
+    assert counts['counts'] == [{'count': 1}]
@@ -0,0 +1,135 @@
+import json
+
+import joblib
+import pytest
+
+import flask_app
+import inference
+from model_registry import ModelRegistry
+
+
+@pytest.fixture
+def client(small_pipeline, tmp_path, monkeypatch):
+    """Test client serving small_pipeline from a temporary registry"""
+    path = tmp_path / 'pipeline.pkl'
+    joblib.dump(small_pipeline, path)
+    registry = ModelRegistry(str(tmp_path / 'Models'))
+    registry.register(str(path), 'v1')
+    loader = inference.ModelLoader(registry)
+    monkeypatch.setattr(inference, 'model_loader', loader)
+    monkeypatch.setattr(flask_app, 'model_loader', loader)
+    flask_app.prediction_cache.clear()
+    flask_app.explanation_cache.clear()
+    return flask_app.app.test_client()
+
+
+def count_calls(monkeypatch, module, name):
+    calls = []
+    original = getattr(module, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+    monkeypatch.setattr(module, name, wrapper)
+    return calls
+
+
+def test_landing_page_explanations_are_cached(client, monkeypatch):
+    calls = count_calls(monkeypatch, flask_app, 'explain_headlines')
+    for headline in ('Senate passes tax bill', '  senate passes TAX bill!  '):
+        response = client.post('/', data={'headline': headline})
+        assert response.status_code == 200
+        assert b'Key Features' in response.data
+    assert len(calls) == 1
+
+    response = client.post('/predict', json={'headline': 'Senate passes tax bill', 'explain': True})
+    assert response.status_code == 200
+    assert response.get_json()['top_features']
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize('headers', [{}, {'X-Admin-Token': 'wrong'}, {'X-Admin-Token': 'sÃ©cret'}])
+def test_admin_reload_rejects_bad_tokens(monkeypatch, headers):
+    monkeypatch.setattr(flask_app, 'ADMIN_TOKEN', 'sécret')
+    response = flask_app.app.test_client().post('/admin/reload', headers=headers)
+    assert response.status_code == 403
+
+
+def test_admin_reload_disabled_without_token(monkeypatch):
+    monkeypatch.setattr(flask_app, 'ADMIN_TOKEN', None)
+    response = flask_app.app.test_client().post('/admin/reload', headers={'X-Admin-Token': ''})
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize('body', [['Senate passes tax bill'], {'headline': None}, {'headline': 42},
+                                  {'headline': '   '}, {}, 'Senate passes tax bill'])
+def test_predict_rejects_invalid_payloads(client, body):
+    response = client.post('/predict', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_predict_accepts_json_and_form(client):
+    for response in (client.post('/predict', json={'headline': 'Senate passes tax bill'}),
+                     client.post('/predict', data={'headline': 'Senate passes tax bill'})):
+        assert response.status_code == 200
+        assert response.get_json()['label'] in ('FAKE', 'REAL')
+
+
+def ndjson(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_predict_batch_streams_rows_in_order(client):
+    body = json.dumps(['Senate passes tax bill', {'id': 'x', 'headline': 'Markets rally'}, '', None])
+    rows = ndjson(client.post('/predict/batch', data=body, content_type='application/json'))
+
+    assert [row['index'] for row in rows] == [0, 1, 2, 3]
+    assert rows[1]['id'] == 'x' and rows[1]['label'] in ('FAKE', 'REAL')
+    assert rows[2]['error'] == rows[3]['error'] == 'headline is required'
+
+
+def test_predict_batch_reports_malformed_input_after_valid_rows(client, monkeypatch):
+    monkeypatch.setattr(flask_app, 'BULK_CHUNK_SIZE', 1)
+    body = '["Senate passes tax bill", "Markets rally", {broken'
+    rows = ndjson(client.post('/predict/batch', data=body, content_type='application/json'))
+
+    assert [row['index'] for row in rows[:-1]] == [0, 1]
+    assert rows[-1]['error'].startswith('invalid input:')
+
+    rows = ndjson(client.post('/predict/batch', data='{"headline": "a"}\nnot json\n',
+                              content_type='application/x-ndjson'))
+    assert rows[-1]['error'].startswith('invalid input:')
+
+
+def test_predict_batch_reports_model_failures(client, monkeypatch):
+    def broken(headlines, pipeline=None):
+        raise RuntimeError('no model')
+    monkeypatch.setattr(inference, 'predict_proba_batch', broken)
+    rows = ndjson(client.post('/predict/batch', data='["Senate passes tax bill"]', content_type='application/json'))
+    assert rows == [{'error': 'model unavailable: no model'}]
+
+
+class FailingInferencer:
+    def infer(self, texts):
+        raise RuntimeError('tokenizer crashed')
+
+
+class EchoInferencer:
+    def infer(self, texts):
+        return [{'topic': 0, 'topic_terms': 'a, b', 'distribution': [1.0]} for _ in texts]
+
+
+def test_topics_caps_the_batch(client, monkeypatch):
+    monkeypatch.setattr(flask_app, 'topic_inferencer', EchoInferencer())
+    monkeypatch.setattr(flask_app, 'TOPICS_MAX_HEADLINES', 3)
+    assert client.post('/topics', json={'headlines': ['a', 'b', 'c']}).status_code == 200
+    assert client.post('/topics', json={'headlines': ['a', 'b', 'c', 'd']}).status_code == 413
+
+
+def test_topic_failures_are_503(client, monkeypatch):
+    monkeypatch.setattr(flask_app, 'topic_inferencer', FailingInferencer())
+    assert client.post('/topics', json={'headlines': ['Senate passes tax bill']}).status_code == 503
+    assert client.post('/topics', json={'headline': 'Senate passes tax bill'}).status_code == 503
+    response = client.post('/predict', json={'headline': 'Senate passes tax bill', 'topics': True})
+    assert response.status_code == 503
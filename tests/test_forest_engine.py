@@ -0,0 +1,24 @@
+import numpy as np
+
+from forest_engine import CompiledForest, CompiledPipeline
+
+
+def test_predict_proba_matches_sklearn_exactly(small_pipeline, headlines):
+    vectorizer, forest = small_pipeline.steps[0][1], small_pipeline.steps[-1][1]
+    X = vectorizer.transform(headlines)
+    compiled = CompiledForest.from_estimator(forest)
+
+    assert np.array_equal(compiled.predict_proba(X), forest.predict_proba(X))
+    # Threads sum their trees in a different order, so only rounding may differ
+    assert np.allclose(compiled.predict_proba(X, n_threads=3), forest.predict_proba(X), rtol=0, atol=1e-12)
+    assert np.array_equal(compiled.classes_, forest.classes_)
+
+
+def test_compiled_pipeline_matches_sklearn(small_pipeline, headlines):
+    compiled = CompiledPipeline(small_pipeline)
+
+    assert np.array_equal(compiled.predict_proba(headlines), small_pipeline.predict_proba(headlines))
+    assert np.array_equal(compiled.predict(headlines), small_pipeline.predict(headlines))
+    # Batches over max_compiled_batch go to sklearn's traversal
+    large = CompiledPipeline(small_pipeline, max_compiled_batch=1)
+    assert np.array_equal(large.predict_proba(headlines), small_pipeline.predict_proba(headlines))
@@ -0,0 +1,127 @@
+import random
+from collections import Counter, defaultdict
+from itertools import combinations
+from urllib.parse import unquote
+
+import pandas as pd
+import pytest
+import rdflib
+
+import converting
+import flask_app
+from graph_index import FACETS, GraphIndex
+from graph_snapshot import GraphSnapshot, write_snapshot
+
+SUBJECTS = ['politicsNews', 'worldnews', 'News', 'Government News', 'left-news']
+ENTITIES = ['Trump (PERSON)', 'Senate (ORG)', 'White House (ORG)', 'FBI (ORG)', 'Moscow (GPE)',
+            'Obama (PERSON)', 'Reuters (ORG)', 'Congress (ORG)']
+
+
+@pytest.fixture(scope='module')
+def graph(tmp_path_factory):
+    """(GraphIndex, rdflib graph) over the same randomly generated articles"""
+    tmp_path = tmp_path_factory.mktemp('graph')
+    rng = random.Random(0)
+    rows = []
+    for i in range(300):
+        topic = rng.choice([0, 1, 2, 3, None])
+        rows.append((f'Headline number {i}', rng.choice(['true', 'fake']), rng.choice(SUBJECTS), topic,
+                     '' if topic is None else f'term{topic}, other',
+                     '; '.join(rng.sample(ENTITIES, rng.randint(0, 4)))))
+    csv_path, ttl_path = tmp_path / 'in.csv', str(tmp_path / 'out.ttl')
+    pd.DataFrame(rows, columns=converting.FINGERPRINT_COLUMNS).to_csv(csv_path, index=False)
+    converting.convert(csv_path, ttl_path, intern_entities=True)
+    write_snapshot(ttl_path, str(tmp_path / 'snap'))
+    return GraphIndex(GraphSnapshot(str(tmp_path / 'snap'))), rdflib.Graph().parse(ttl_path, format='turtle')
+
+
+def value(node):
+    return unquote(node.split('#')[-1]).split('_', 1)[-1]
+
+
+@pytest.fixture(scope='module')
+def naive(graph):
+    """Facet values and entities of every article, from a scan of all triples"""
+    _, rdf = graph
+    predicates = dict(zip((converting.hasLabel, converting.hasSubject, converting.hasTopic), FACETS))
+    articles = {s.split('#')[-1]: dict.fromkeys(FACETS) for s in rdf.subjects(rdflib.RDF.type, converting.ARTICLE)}
+    entities = defaultdict(set)
+    for s, p, o in rdf:
+        article = s.split('#')[-1]
+        if p in predicates:
+            articles[article][predicates[p]] = value(o)
+        elif p == converting.hasEntity:
+            entities[article].add(o.split('#')[-1])
+    return articles, entities
+
+
+def all_pages(query, **kwargs):
+    rows, page = [], 1
+    while True:
+        result = query(page=page, per_page=200, **kwargs)
+        rows.extend(result['articles'])
+        if page * 200 >= result['total']:
+            return rows
+        page += 1
+
+
+def test_postings_match_a_scan(graph, naive):
+    index, _ = graph
+    articles, _ = naive
+    assert index.n_articles == len(articles)
+    assert sorted(a['id'] for a in all_pages(index.articles)) == sorted(articles)
+
+    for facet in FACETS:
+        for name in index.values[facet]:
+            expected = sorted(a for a, facets in articles.items() if facets[facet] == name)
+            rows = all_pages(index.articles, **{facet: name})
+            assert sorted(row['id'] for row in rows) == expected
+            assert all(row[facet] == name for row in rows)
+
+    label, subject = index.values['label'][0], index.values['subject'][0]
+    expected = {a for a, f in articles.items() if f['label'] == label and f['subject'] == subject}
+    assert {row['id'] for row in all_pages(index.articles, label=label, subject=subject)} == expected
+
+
+@pytest.mark.parametrize('by', [list(c) for n in range(len(FACETS) + 1) for c in combinations(FACETS, n)])
+def test_count_cube_matches_a_scan(graph, naive, by):
+    index, _ = graph
+    articles, _ = naive
+    expected = Counter(tuple(facets[f] for f in by) for facets in articles.values())
+
+    counts = index.counts(by=by)['counts']
+    assert {tuple(row[f] for f in by): row['count'] for row in counts} == dict(expected)
+
+    label = index.values['label'][0]
+    filtered = Counter(tuple(f[g] for g in by if g != 'label') for f in articles.values() if f['label'] == label)
+    counts = index.counts(by=by, label=label)['counts']
+    assert {tuple(row[f] for f in by if f != 'label'): row['count'] for row in counts} == dict(filtered)
+
+
+def test_entity_rankings_match_a_scan(graph, naive):
+    index, _ = graph
+    articles, entities = naive
+    for label in [None] + index.values['label']:
+        expected = Counter(entity for article, names in entities.items()
+                           if label is None or articles[article]['label'] == label for entity in names)
+        ranked = index.top_entities(label=label, per_page=200)['entities']
+        assert {entity['id']: entity['articles'] for entity in ranked} == dict(expected)
+        assert [entity['articles'] for entity in ranked] == sorted(expected.values(), reverse=True)
+
+    entity = ranked[0]['id']
+    mentioned = sorted(a for a, names in entities.items() if entity in names)
+    assert sorted(row['id'] for row in all_pages(index.neighbors, entity=entity)) == mentioned
+
+
+def test_unknown_facet_is_a_bad_request(graph, monkeypatch):
+    index, _ = graph
+    with pytest.raises(ValueError):
+        index.counts(by=['author'])
+    with pytest.raises(KeyError):
+        index.counts(by=['label'], subject='no such subject')
+
+    monkeypatch.setattr(flask_app, 'graph_index', index)
+    client = flask_app.app.test_client()
+    assert client.get('/graph/counts?by=label,author').status_code == 400
+    assert client.get('/graph/counts?by=label&subject=nowhere').status_code == 404
+    assert client.get('/graph/counts?by=label,subject').status_code == 200
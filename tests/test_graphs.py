@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EX = 'http://example.org/misinfo#'
+
+
+def write_ttl(path, n_articles=60):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'@prefix ex: <{EX}> .\n')
+        for i in range(n_articles):
+            article = f'<{EX}article_{i}>'
+            f.write(f'{article} <{EX}hasLabel> <{EX}label_{"FAKE" if i % 2 else "REAL"}> .\n')
+            f.write(f'{article} <{EX}hasSubject> <{EX}subject_{i % 3}> .\n')
+            f.write(f'{article} <{EX}hasTopic> <{EX}topic_{i % 7}> .\n')
+            f.write(f'{article} <{EX}hasEntity> <{EX}entity_{i % 11}> .\n')
+
+
+def test_fresh_store_build_with_several_workers(tmp_path):
+    write_ttl(tmp_path / 'articles.ttl')
+    env = dict(os.environ, GRAPH_SOURCE='articles.ttl', GRAPH_STORE='articles.sqlite', GRAPH_SNAPSHOT='')
+    result = subprocess.run([sys.executable, os.path.join(ROOT, 'graphs.py'), '--workers', '3'],
+                            cwd=tmp_path, env=env, capture_output=True, text=True, timeout=300)
+    assert result.returncode == 0, result.stderr
+
+    page = (tmp_path / 'all_graphs_combined.html').read_text(encoding='utf-8')
+    assert page.count('new vis.Network') == 5
+    assert page.rstrip().endswith('</html>')
+    assert (tmp_path / 'articles.sqlite').exists()
+    assert not [name for name in os.listdir(tmp_path) if '.tmp' in name]
+
+
+def test_in_memory_graph_defaults_to_one_worker(monkeypatch):
+    import graphs
+    monkeypatch.setattr(graphs, 'GRAPH_SNAPSHOT', '')
+    monkeypatch.setattr(graphs, 'GRAPH_STORE', '')
+    assert graphs.default_workers() == 1
+    monkeypatch.setattr(graphs, 'GRAPH_STORE', 'articles.sqlite')
+    assert graphs.default_workers() == (os.cpu_count() or 1)
+
+
+def test_raw_full_view_keeps_every_iri_triple(tmp_path, monkeypatch):
+    import argparse
+
+    import rdflib
+
+    import graphs
+    write_ttl(tmp_path / 'articles.ttl', n_articles=3)
+    with open(tmp_path / 'articles.ttl', 'a', encoding='utf-8') as f:
+        for i in range(3):
+            f.write(f'<{EX}article_{i}> a <{EX}Article> ; <{EX}title> "Headline {i}" .\n')
+    graph = rdflib.Graph().parse(tmp_path / 'articles.ttl', format='turtle')
+    monkeypatch.setattr(graphs, '_graph', graph)
+
+    args = argparse.Namespace(max_nodes=1000)
+    net = graphs.build_view('Full Knowledge Graph', 'raw_full', '#FFB347', args)
+
+    assert len(net.edges) == 3 * 5
+    assert sum(edge['title'] == 'type' for edge in net.edges) == 3
+    assert not [node for node in net.get_nodes() if node.startswith('Headline')]
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from sklearn.base import clone
+
+from conftest import HEADLINES, UNSEEN_HEADLINES
+from headline_vectorizer import HeadlineVectorizer
+
+
+def assert_same_csr(expected, actual):
+    assert expected.shape == actual.shape
+    assert np.array_equal(expected.indptr, actual.indptr)
+    assert np.array_equal(expected.indices, actual.indices)
+    assert np.array_equal(expected.data, actual.data)
+
+
+def test_transform_is_identical_to_tfidf(small_pipeline, headlines):
+    vectorizer = small_pipeline.steps[0][1]
+    assert HeadlineVectorizer.supports(vectorizer)
+    fast = HeadlineVectorizer.from_vectorizer(vectorizer)
+
+    assert_same_csr(vectorizer.transform(headlines), fast.transform(headlines))
+    # Raw, uncleaned titles go through the same lowercasing and token pattern
+    raw = HEADLINES + UNSEEN_HEADLINES
+    assert_same_csr(vectorizer.transform(raw), fast.transform(raw))
+
+
+def test_transform_one_matches_batch(small_pipeline, headlines):
+    fast = HeadlineVectorizer.from_vectorizer(small_pipeline.steps[0][1])
+    batch = fast.transform(headlines)
+    for row, text in enumerate(headlines):
+        assert_same_csr(batch[row], fast.transform([text]))
+
+
+def test_only_float64_vectorizers_are_supported(small_pipeline):
+    vectorizer = clone(small_pipeline.steps[0][1]).set_params(dtype=np.float32).fit(HEADLINES)
+    assert not HeadlineVectorizer.supports(vectorizer)
+    with pytest.raises(ValueError):
+        HeadlineVectorizer.from_vectorizer(vectorizer)
@@ -0,0 +1,104 @@
+import json
+import threading
+
+import joblib
+import pytest
+
+from inference import FutureTimeout, MicroBatcher, ModelLoader, iter_json_array
+from model_registry import ModelRegistry
+
+
+def register(pipeline, root, tmp_path, version):
+    path = tmp_path / f'{version}.pkl'
+    joblib.dump(pipeline, path)
+    return ModelRegistry(str(root)).register(str(path), version)
+
+
+def test_warm_builds_the_explainer(small_pipeline, tmp_path):
+    root = tmp_path / 'Models'
+    register(small_pipeline, root, tmp_path, 'v1')
+    loader = ModelLoader(ModelRegistry(str(root)))
+
+    handle = loader.warm()
+
+    assert loader._explainer is not None and loader._explainer[0] is handle
+    assert loader.get_explainer() is loader._explainer[1]
+
+
+def test_reload_swaps_in_a_ready_explainer(small_pipeline, tmp_path):
+    root = tmp_path / 'Models'
+    register(small_pipeline, root, tmp_path, 'v1')
+    loader = ModelLoader(ModelRegistry(str(root)))
+    loader.warm()
+    old_explainer = loader.get_explainer()
+
+    register(small_pipeline, root, tmp_path, 'v2')
+    handle = loader.reload()
+
+    assert handle.version == 'v2'
+    assert loader._explainer[0] is handle
+    assert loader._explainer[1] is not old_explainer
+
+
+def chunks_of(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('payload', [
+    [1.5e10],
+    [1.5e10, -0.25, 3, 12e-3, True, False, None],
+    ['Senate passes tax bill', {'id': 7, 'headline': 'Markets rally — again'}, [1, 2], 42],
+])
+def test_iter_json_array_any_chunk_size(payload):
+    data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    for size in range(1, len(data) + 1):
+        assert list(iter_json_array(chunks_of(data, size))) == payload, size
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    batches = []
+
+    def predict_fn(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=4, max_wait_ms=200)
+    futures = [batcher.submit(i) for i in range(10)]
+
+    assert [future.result(timeout=5) for future in futures] == [i * 2 for i in range(10)]
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert sum(batches, []) == list(range(10))
+
+
+def test_micro_batcher_sets_errors_on_every_future():
+    def predict_fn(items):
+        if 'bad' in items:
+            raise RuntimeError('model exploded')
+        return items
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=8, max_wait_ms=200)
+    futures = [batcher.submit(item) for item in ('a', 'bad', 'c')]
+    for future in futures:
+        with pytest.raises(RuntimeError, match='model exploded'):
+            future.result(timeout=5)
+    # The worker thread survives a failed batch
+    assert batcher.predict('ok', timeout=5) == 'ok'
+
+
+def test_micro_batcher_timeout_cancels_the_request():
+    release = threading.Event()
+    seen = []
+
+    def predict_fn(items):
+        release.wait(5)
+        seen.extend(items)
+        return items
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=1, max_wait_ms=0)
+    blocker = batcher.submit('first')
+    with pytest.raises(FutureTimeout):
+        batcher.predict('second', timeout=0.05)
+    release.set()
+    assert blocker.result(timeout=5) == 'first'
+    assert batcher.predict('third', timeout=5) == 'third'
+    assert seen == ['first', 'third']  # the caller gave up on 'second', so it was never scored
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+
+import pytest
+
+import prediction_cache
+from prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(prediction_cache, 'time', clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(maxsize=10, ttl=60)
+    cache.set('Senate passes tax bill', [0.2, 0.8])
+
+    clock.now += 60
+    assert cache.get('Senate passes tax bill') == [0.2, 0.8]
+    clock.now += 1
+    assert cache.get('Senate passes tax bill') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = PredictionCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the least recently used
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_keys_are_normalized_headlines(clock):
+    cache = PredictionCache(maxsize=10, ttl=60)
+    cache.set('Senate passes tax bill', 1)
+    assert cache.get('  senate passes TAX bill!  ') == 1
+
+
+def test_model_signature_change_invalidates(clock):
+    signature = ['sha-1']
+    cache = PredictionCache(maxsize=10, ttl=3600, model_signature=lambda: signature[0], check_interval=5)
+    cache.set('Senate passes tax bill', 1)
+
+    signature[0] = 'sha-2'
+    # The signature is only re-read every check_interval seconds
+    assert cache.get('Senate passes tax bill') == 1
+    clock.now += 5
+    assert cache.get('Senate passes tax bill') is None
+    assert cache.stats()['invalidations'] == 1
+
+    cache.set('Senate passes tax bill', 2)
+    clock.now += 5
+    assert cache.get('Senate passes tax bill') == 2
+    assert cache.stats()['invalidations'] == 1
+
+
+def fill_shared_cache(path, signature):
+    cache = PredictionCache(maxsize=10, ttl=3600, model_signature=lambda: signature, shared_path=path)
+    cache.set('Senate passes tax bill', [0.2, 0.8])
+    cache.set('Markets rally', [0.9, 0.1])
+    os._exit(0 if cache.get('Markets rally') == [0.9, 0.1] else 1)
+
+
+def test_shared_store_across_processes(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = PredictionCache(maxsize=10, ttl=3600, model_signature=lambda: 'sha-1', shared_path=path)
+    assert cache.get('Senate passes tax bill') is None  # opens this process's connection before the fork
+
+    process = multiprocessing.get_context('fork').Process(target=fill_shared_cache, args=(path, 'sha-1'))
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+
+    assert cache.get('senate passes tax bill') == [0.2, 0.8]
+    assert cache.get('Senate passes tax bill') == [0.2, 0.8]
+    stats = cache.stats()
+    assert (stats['shared_hits'], stats['hits']) == (1, 1)
+
+    other_model = PredictionCache(maxsize=10, ttl=3600, model_signature=lambda: 'sha-2', shared_path=path)
+    assert other_model.get('Markets rally') is None
+
+
+def test_shared_store_prunes_stale_rows(tmp_path):
+    store = prediction_cache.SharedCacheStore(str(tmp_path / 'cache.sqlite'), maxsize=2)
+    for i, signature in enumerate(['old', 'new', 'new', 'new']):
+        store.set(f'headline {i}', i, expires=prediction_cache.time.time() + 60 + i, signature=signature)
+    store.set('expired', 0, expires=prediction_cache.time.time() - 1, signature='new')
+
+    store.prune('new')
+
+    keys = [row[0] for row in store._conn().execute('SELECT key FROM predictions ORDER BY key')]
+    assert keys == ['headline 2', 'headline 3']
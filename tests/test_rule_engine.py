@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from conftest import HEADLINES
+from rule_engine import DEFAULT_RULES, RuleEngine
+
+
+def naive_matches(rules, text):
+    """Every overlapping occurrence of every indicator in text.lower(), by repeated str.find"""
+    lowered = text.lower()
+    matches = set()
+    for category, indicators in rules.items():
+        for indicator in map(str.lower, indicators):
+            start = lowered.find(indicator) if indicator else -1
+            while start >= 0:
+                matches.add((indicator, category, start, start + len(indicator)))
+                start = lowered.find(indicator, start + 1)
+    return sorted(matches)
+
+
+def engine_matches(engine, text):
+    matches = [tuple(match) for match in engine.find_all(text)]
+    assert len(matches) == len(set(matches))
+    return sorted(matches)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_a_naive_scan(seed):
+    rng = random.Random(seed)
+    # A small alphabet makes shared prefixes, nested and overlapping indicators common
+    word = lambda n: ''.join(rng.choice('abAB ') for _ in range(n))
+    rules = {category: [word(rng.randint(0, 4)) for _ in range(rng.randint(1, 8))] for category in ('x', 'y', 'z')}
+    engine = RuleEngine(rules)
+    for _ in range(20):
+        text = word(rng.randint(0, 40))
+        assert engine_matches(engine, text) == naive_matches(rules, text)
+        assert engine.categories(text) == {category for _, category, _, _ in naive_matches(rules, text)}
+
+
+def test_default_rules_on_headlines():
+    engine = RuleEngine(DEFAULT_RULES)
+    texts = HEADLINES + ['BREAKING: Leaked memo EXPOSED BY reporters, according to Reuters',
+                         'Study shows government committee coverup: you won\'t believe it']
+    for text in texts:
+        assert engine_matches(engine, text) == naive_matches(DEFAULT_RULES, text)
+
+
+def test_offsets_refer_to_the_original_text():
+    engine = RuleEngine({'place': ['istanbul', 'i̇zmir'], 'word': ['ΟΔΟΣ']})
+    text = 'İzmir to İSTANBUL: ΟΔΟΣ'  # 'İ'.lower() is two characters
+
+    spans = {match.indicator: text[match.start:match.end] for match in engine.find_all(text)}
+
+    assert spans == {'i̇zmir': 'İzmir', 'οδος': 'ΟΔΟΣ'}
+    # 'İSTANBUL'.lower() is 'i̇stanbul', so 'istanbul' does not match, as with `in text.lower()`
+    assert 'istanbul' not in text.lower()
@@ -0,0 +1,156 @@
+"""Bag-of-words corpus streamed from disk instead of held in Python lists.
+
+The notebook kept every document as a list of tokens and every BoW as a
+list of (id, count) tuples, roughly 100 bytes of Python objects per
+distinct word per article. Here documents are read one at a time from a
+token file (one article per line), the dictionary is built in one pass,
+and the BoW corpus is written in a second pass to Matrix Market
+(<prefix>.mm plus an offset index), with an optional CSR copy in <prefix>.npz:
+
+    tokens = lemmatize_csv(['True.csv', 'Fake.csv'], 'tokens.txt')
+    dictionary = build_dictionary(tokens)
+    corpus = serialize_corpus(tokens, dictionary, 'topic_corpus', npz=True)
+
+    lda = train_lda(corpus, dictionary)        # gensim: iterates BoW lists from the .mm file
+    X = corpus.to_csr()                        # sklearn: scipy.sparse CSR matrix
+    for X_batch in corpus.iter_csr(10000):     # or row blocks for partial_fit
+        ...
+
+Peak memory depends on the chunk size and the dictionary, not the number
+of articles, unless the whole CSR matrix is built (npz=True or to_csr()).
+BowCorpus(prefix) reopens a serialized corpus without recomputing anything.
+"""
+import os
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import scipy.sparse
+from gensim import matutils
+from gensim.corpora import Dictionary, MmCorpus
+
+from topic_preprocessing import lemmatize
+
+CORPUS_PREFIX = 'topic_corpus'
+CHUNK_SIZE = 10000
+
+# Dictionary.filter_extremes settings from the notebook
+NO_BELOW = 15
+NO_ABOVE = 0.5
+KEEP_N = 100000
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_dictionary(documents, no_below=NO_BELOW, no_above=NO_ABOVE, keep_n=KEEP_N):
+    """Dictionary over documents in one streaming pass, filtered like the notebook's"""
+    dictionary = Dictionary(documents)
+    dictionary.filter_extremes(no_below=no_below, no_above=no_above, keep_n=keep_n)
+    return dictionary
+
+
+class TokenFile:
+    """Documents stored one per line as space-separated tokens; can be iterated any number of times"""
+
+    def __init__(self, path):
+        self.path = path
+        self._length = None
+
+    def __iter__(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield line.split()
+
+    def __len__(self):
+        if self._length is None:
+            with open(self.path, 'rb') as f:
+                self._length = sum(1 for _ in f)
+        return self._length
+
+
+def write_token_file(documents, path, mode='w'):
+    """Write token lists as a TokenFile; tokens containing whitespace are joined with '_'"""
+    with open(path, mode, encoding='utf-8') as f:
+        for tokens in documents:
+            f.write(' '.join('_'.join(token.split()) for token in tokens) + '\n')
+    return TokenFile(path)
+
+
+def lemmatize_csv(inputs, path, column='text', chunksize=CHUNK_SIZE, **lemmatize_kwargs):
+    """Lemmatize the column of each CSV chunk by chunk into a TokenFile at path.
+
+    lemmatize_kwargs go to topic_preprocessing.lemmatize, so the token
+    cache still skips articles seen before.
+    """
+    write_token_file([], path)
+    for input_csv in inputs:
+        for chunk in pd.read_csv(input_csv, usecols=[column], chunksize=chunksize):
+            write_token_file(lemmatize(chunk[column], **lemmatize_kwargs), path, mode='a')
+    return TokenFile(path)
+
+
+class BowCorpus:
+    """Serialized BoW corpus: iterates gensim BoW lists, converts to scipy CSR for sklearn"""
+
+    def __init__(self, prefix=CORPUS_PREFIX):
+        self.prefix = prefix
+        self.mm = MmCorpus(prefix + '.mm')
+        dict_path = prefix + '.dict'
+        self.dictionary = Dictionary.load(dict_path) if os.path.exists(dict_path) else None
+
+    def __iter__(self):
+        return iter(self.mm)
+
+    def __len__(self):
+        return self.mm.num_docs
+
+    def __getitem__(self, docno):
+        # Random access through the offset index MmCorpus.serialize writes
+        return self.mm[docno]
+
+    @property
+    def num_terms(self):
+        return self.mm.num_terms
+
+    def to_csr(self, dtype=np.float32):
+        """(n_docs, num_terms) CSR matrix, from <prefix>.npz when it exists"""
+        npz_path = self.prefix + '.npz'
+        if os.path.exists(npz_path):
+            return scipy.sparse.load_npz(npz_path).astype(dtype, copy=False)
+        return matutils.corpus2csc(self.mm, self.num_terms, dtype, len(self), self.mm.num_nnz).T.tocsr()
+
+    def iter_csr(self, batch_size=CHUNK_SIZE, dtype=np.float32):
+        """CSR row blocks of at most batch_size documents, e.g. for partial_fit"""
+        for chunk in chunked(self.mm, batch_size):
+            yield matutils.corpus2csc(chunk, self.num_terms, dtype, len(chunk)).T.tocsr()
+
+
+def serialize_corpus(documents, dictionary, prefix=CORPUS_PREFIX, npz=False):
+    """Write doc2bow of each document to <prefix>.mm, the dictionary to <prefix>.dict.
+
+    documents is iterated once. npz=True also saves the CSR matrix to
+    <prefix>.npz, which holds the whole corpus in memory while it is built.
+    Returns the BowCorpus reading the files back.
+    """
+    MmCorpus.serialize(prefix + '.mm', (dictionary.doc2bow(tokens) for tokens in documents), id2word=dictionary)
+    dictionary.save(prefix + '.dict')
+    npz_path = prefix + '.npz'
+    if os.path.exists(npz_path):
+        os.remove(npz_path)
+    corpus = BowCorpus(prefix)
+    if npz:
+        scipy.sparse.save_npz(npz_path, corpus.to_csr())
+    return corpus
+
+
+def build_corpus(documents, prefix=CORPUS_PREFIX, npz=False, **filter_kwargs):
+    """Dictionary pass plus serialization pass over a re-iterable document source"""
+    dictionary = build_dictionary(documents, **filter_kwargs)
+    return serialize_corpus(documents, dictionary, prefix, npz)
@@ -0,0 +1,149 @@
+"""Online topic inference for headlines, served next to the RF pipeline.
+
+topic_model.py --export writes Models/topic_model.npz: the trained LDA's
+exp(E[log beta]) matrix, alpha, the dictionary's vocabulary and the
+precomputed topic_terms table. TopicInferencer loads those arrays and
+runs LDA's variational E-step for a whole batch of headlines at once in
+NumPy, so serving needs neither gensim nor the pickled model:
+
+    inferencer = TopicInferencer.from_path('Models/topic_model.npz')
+    inferencer.infer(['Senate passes tax bill', ...])
+    # [{'topic': 5, 'topic_terms': 'tax, bill, senate, ...', 'distribution': [0.02, ..., 0.81, ...]}, ...]
+
+The number of E-step iterations is capped (TOPIC_MAX_ITERATIONS), which
+bounds latency; headlines are short, so the cap is rarely what stops it.
+"""
+import logging
+import os
+
+import numpy as np
+from scipy.special import psi
+
+from topic_preprocessing import MIN_TOKEN_LENGTH, SPACY_MODEL, lemmatize, load_nlp, normalize
+
+logger = logging.getLogger(__name__)
+
+TOPIC_MAX_ITERATIONS = int(os.environ.get('TOPIC_MAX_ITERATIONS', 20))
+GAMMA_THRESHOLD = 1e-3
+EPSILON = np.finfo(np.float32).eps
+
+
+def dirichlet_expectation(gamma):
+    """E[log theta] for each row of gamma"""
+    return psi(gamma) - psi(gamma.sum(axis=1, keepdims=True))
+
+
+class HeadlineTokenizer:
+    """Tokens as topic_preprocessing.lemmatize makes them, without its disk cache.
+
+    spaCy is loaded on first use. Where it (or the model) is not installed,
+    headlines fall back to the normalized surface words, which miss only
+    the words whose lemma differs from how they are written.
+    """
+
+    def __init__(self, model=SPACY_MODEL):
+        self.model = model
+        self._nlp = None
+        self._fallback = False
+
+    def _load(self):
+        if self._nlp is None and not self._fallback:
+            try:
+                self._nlp = load_nlp(self.model)
+            except (ImportError, OSError) as e:
+                logger.warning('spaCy model %s unavailable, topics use unlemmatized words: %s', self.model, e)
+                self._fallback = True
+        return self._nlp
+
+    def __call__(self, texts):
+        nlp = self._load()
+        if nlp is None:
+            return [[word for word in normalize(text).split() if len(word) >= MIN_TOKEN_LENGTH] for text in texts]
+        return lemmatize(texts, nlp=nlp, cache_path=None)
+
+
+class TopicInferencer:
+    def __init__(self, exp_elog_beta, alpha, vocabulary, topic_terms, tokenizer=None,
+                 max_iterations=TOPIC_MAX_ITERATIONS, gamma_threshold=GAMMA_THRESHOLD):
+        self.exp_elog_beta = np.ascontiguousarray(exp_elog_beta, dtype=np.float32)
+        self.alpha = np.asarray(alpha, dtype=np.float32)
+        self.token_ids = {token: i for i, token in enumerate(vocabulary)}
+        self.topic_terms = list(topic_terms)
+        self.tokenizer = tokenizer or HeadlineTokenizer()
+        self.max_iterations = max_iterations
+        self.gamma_threshold = gamma_threshold
+
+    @classmethod
+    def from_path(cls, path, **kwargs):
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls(arrays['exp_elog_beta'], arrays['alpha'], arrays['vocabulary'].tolist(),
+                       arrays['topic_terms'].tolist(), **kwargs)
+
+    @property
+    def num_topics(self):
+        return len(self.alpha)
+
+    def counts(self, token_lists):
+        """(n_docs, n_terms) dense counts over the terms present in the batch, and those term ids"""
+        rows, cols = [], []
+        for row, tokens in enumerate(token_lists):
+            for token in tokens:
+                term_id = self.token_ids.get(token)
+                if term_id is not None:
+                    rows.append(row)
+                    cols.append(term_id)
+        term_ids, local = np.unique(np.asarray(cols, dtype=np.int64), return_inverse=True)
+        counts = np.zeros((len(token_lists), len(term_ids)), dtype=np.float32)
+        np.add.at(counts, (np.asarray(rows, dtype=np.int64), local), 1)
+        return counts, term_ids
+
+    def distributions(self, token_lists):
+        """(n_docs, num_topics) topic proportions, one E-step for the whole batch.
+
+        Same updates as gensim's LdaModel.inference(), but on matrices: each
+        iteration is two (docs x topics x batch terms) products, and only
+        the batch's own vocabulary columns of beta are touched. The loop ends
+        once every row has converged, or after max_iterations.
+        """
+        counts, term_ids = self.counts(token_lists)
+        exp_elog_beta = self.exp_elog_beta[:, term_ids]
+        gamma = np.ones((len(token_lists), self.num_topics), dtype=np.float32)
+        # gensim stops when a document's mean |change in gamma| drops below the threshold
+        threshold = self.gamma_threshold * self.num_topics
+        for _ in range(self.max_iterations):
+            exp_elog_theta = np.exp(dirichlet_expectation(gamma))
+            phinorm = exp_elog_theta @ exp_elog_beta + EPSILON
+            new_gamma = self.alpha + exp_elog_theta * ((counts / phinorm) @ exp_elog_beta.T)
+            converged = np.abs(new_gamma - gamma).sum(axis=1).max(initial=0) < threshold
+            gamma = new_gamma
+            if converged:
+                break
+        return gamma / gamma.sum(axis=1, keepdims=True)
+
+    def infer(self, texts):
+        """Dominant topic, its terms and the full topic distribution for each text.
+
+        A text with no word in the topic model's vocabulary gets topic None,
+        like the articles without a dominant topic in the knowledge graph.
+        """
+        token_lists = self.tokenizer(list(texts))
+        theta = self.distributions(token_lists)
+        dominant = theta.argmax(axis=1).tolist()
+        results = []
+        for row, tokens in enumerate(token_lists):
+            if not any(token in self.token_ids for token in tokens):
+                results.append({'topic': None, 'topic_terms': None, 'distribution': None})
+                continue
+            results.append({
+                'topic': dominant[row],
+                'topic_terms': self.topic_terms[dominant[row]],
+                'distribution': [round(p, 6) for p in theta[row].tolist()],
+            })
+        return results
+
+    def stats(self):
+        return {
+            'num_topics': self.num_topics,
+            'vocab_size': len(self.token_ids),
+            'max_iterations': self.max_iterations,
+        }
@@ -0,0 +1,191 @@
+"""LDA topic pipeline: train, assign dominant topics and write final_combined_results.csv.
+
+Replaces the notebook's per-document loop. The notebook called
+get_document_topics(bow, minimum_probability=0.0)[0][0], which returns
+the first listed topic rather than the most probable one, and it called
+show_topic once per row. Here the doc-topic matrix is inferred in
+batches, the dominant topic is the argmax over each row, and topic_terms
+is looked up in a per-topic table:
+
+    lda = train_lda(corpus, dictionary, num_topics=7, workers=3)
+    theta = doc_topic_matrix(lda, corpus)
+    topics = dominant_topics(theta, corpus)          # <NA> for empty documents
+    terms = topic_terms_table(lda)[topics.fillna(-1)]
+
+Training uses LdaMulticore when workers > 1. With online=True the
+corpus is read once, chunk by chunk, through LdaModel.update(), so it
+can be a generator over data that does not fit in memory.
+
+From the command line, producing the CSV that converting.py reads:
+
+    python topic_model.py --true True.csv --fake Fake.csv --workers 3
+
+Articles are lemmatized chunk by chunk into a token file (--tokens) and
+the corpus is built from it in two streamed passes; the articles are only
+loaded as a DataFrame after training, for the output columns and entities.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from gensim.models import LdaModel, LdaMulticore
+
+from topic_corpus import CORPUS_PREFIX, build_corpus, chunked, lemmatize_csv
+from topic_preprocessing import SPACY_MODEL, TOKEN_CACHE_PATH, entity_strings
+
+OUTPUT_CSV = 'final_combined_results.csv'
+TOKENS_PATH = 'topic_tokens.txt'
+OUTPUT_COLUMNS = ['title', 'label', 'subject', 'dominant_topic', 'topic_terms', 'entities_str']
+NUM_TOPICS = 7
+PASSES = 10
+CHUNKSIZE = 2000
+TOPN = 10
+RANDOM_STATE = 42
+
+
+def train_lda(corpus, dictionary, num_topics=NUM_TOPICS, passes=PASSES, workers=1, chunksize=CHUNKSIZE,
+              online=False, random_state=RANDOM_STATE):
+    """Fit an LDA model on a bag-of-words corpus.
+
+    workers > 1 trains with LdaMulticore (workers - 1 E-step processes
+    plus the parent). online=True makes a single pass over the corpus,
+    updating the model one chunk at a time; use update_lda() to fold in
+    later batches the same way.
+    """
+    if online:
+        lda = LdaModel(num_topics=num_topics, id2word=dictionary, chunksize=chunksize, random_state=random_state)
+        return update_lda(lda, corpus, chunksize)
+    if workers > 1:
+        return LdaMulticore(corpus=corpus, num_topics=num_topics, id2word=dictionary, workers=workers - 1,
+                            passes=passes, chunksize=chunksize, random_state=random_state)
+    return LdaModel(corpus=corpus, num_topics=num_topics, id2word=dictionary, passes=passes,
+                    chunksize=chunksize, random_state=random_state)
+
+
+def update_lda(lda, corpus, chunksize=CHUNKSIZE):
+    """Online variational Bayes over the corpus, one chunk in memory at a time"""
+    for chunk in chunked(corpus, chunksize):
+        lda.update(chunk, chunksize=len(chunk))
+    return lda
+
+
+def doc_topic_matrix(lda, corpus, chunksize=CHUNKSIZE):
+    """(n_docs, num_topics) float32 matrix of topic proportions.
+
+    Runs lda.inference() on whole chunks and normalizes the variational
+    gamma rows, which is what get_document_topics() does per document.
+    """
+    rows = []
+    for chunk in chunked(corpus, chunksize):
+        gamma, _ = lda.inference(chunk)
+        rows.append((gamma / gamma.sum(axis=1, keepdims=True)).astype(np.float32))
+    if not rows:
+        return np.empty((0, lda.num_topics), dtype=np.float32)
+    return np.concatenate(rows)
+
+
+def dominant_topics(theta, corpus=None):
+    """Most probable topic per row of theta, as a nullable integer Series.
+
+    Documents with no words left in the dictionary get no topic (converting.py
+    then writes no hasTopic edge) instead of the prior's arbitrary argmax.
+    """
+    topics = pd.Series(theta.argmax(axis=1), dtype='Int64')
+    if corpus is not None:
+        empty = np.fromiter((not doc for doc in corpus), dtype=bool, count=len(topics))
+        topics[empty] = pd.NA
+    return topics
+
+
+def topic_terms_table(lda, topn=TOPN):
+    """Array of 'word, word, ...' strings indexed by topic id, plus '' for no topic at index -1"""
+    topics = lda.get_topics()
+    top_ids = np.argsort(-topics, axis=1, kind='stable')[:, :topn]
+    words = [', '.join(lda.id2word[word_id] for word_id in row) for row in top_ids.tolist()]
+    return np.array(words + [''], dtype=object)
+
+
+def topic_columns(lda, corpus, topn=TOPN, chunksize=CHUNKSIZE):
+    """dominant_topic and topic_terms columns for every document in the corpus"""
+    topics = dominant_topics(doc_topic_matrix(lda, corpus, chunksize), corpus)
+    table = topic_terms_table(lda, topn)
+    return pd.DataFrame({
+        'dominant_topic': topics,
+        'topic_terms': table[topics.fillna(-1).to_numpy(dtype=np.int64)],
+    })
+
+
+def export_topic_model(lda, path, topn=TOPN):
+    """Write the arrays topic_inference.TopicInferencer serves from (Models/topic_model.npz)"""
+    vocabulary = [lda.id2word[i] for i in range(lda.num_terms)]
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path,
+             exp_elog_beta=lda.expElogbeta.astype(np.float32),
+             alpha=np.asarray(lda.alpha, dtype=np.float32),
+             vocabulary=np.array(vocabulary, dtype=str),
+             topic_terms=np.array(topic_terms_table(lda, topn)[:-1].tolist(), dtype=str))
+    os.replace(tmp_path, path)
+
+
+def load_articles(true_csv, fake_csv):
+    true_df = pd.read_csv(true_csv)
+    fake_df = pd.read_csv(fake_csv)
+    true_df['label'] = 'true'
+    fake_df['label'] = 'fake'
+    return pd.concat([true_df, fake_df], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train LDA and write the CSV that converting.py reads.')
+    parser.add_argument('--true', default='True.csv')
+    parser.add_argument('--fake', default='Fake.csv')
+    parser.add_argument('--output', default=OUTPUT_CSV)
+    parser.add_argument('--num-topics', type=int, default=NUM_TOPICS)
+    parser.add_argument('--passes', type=int, default=PASSES)
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE)
+    parser.add_argument('--workers', type=int, default=1, help='LdaMulticore when > 1')
+    parser.add_argument('--online', action='store_true', help='single streamed pass with LdaModel.update()')
+    parser.add_argument('--spacy-model', default=SPACY_MODEL)
+    parser.add_argument('--cache', default=TOKEN_CACHE_PATH)
+    parser.add_argument('--tokens', default=TOKENS_PATH, help='token file, one lemmatized article per line')
+    parser.add_argument('--corpus', default=CORPUS_PREFIX, help='prefix of the serialized BoW corpus files')
+    parser.add_argument('--npz', action='store_true', help='also save the corpus as a CSR matrix <corpus>.npz')
+    parser.add_argument('--n-process', type=int, default=1, help='spaCy processes')
+    parser.add_argument('--export', metavar='NPZ', help='also write the model for online inference, '
+                        'e.g. Models/topic_model.npz')
+    parser.add_argument('--no-entities', action='store_true', help='leave entities_str empty')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    # Same row order as load_articles: True.csv, then Fake.csv
+    documents = lemmatize_csv([args.true, args.fake], args.tokens, cache_path=args.cache,
+                              n_process=args.n_process, model=args.spacy_model)
+    print(f'Lemmatized {len(documents)} articles in {time.perf_counter() - start:.1f}s')
+
+    # Streamed to <corpus>.mm; training and inference read it back one chunk at a time
+    corpus = build_corpus(documents, args.corpus, npz=args.npz)
+    start = time.perf_counter()
+    lda = train_lda(corpus, corpus.dictionary, args.num_topics, args.passes, args.workers, args.chunksize,
+                    args.online)
+    print(f'Trained {args.num_topics} topics in {time.perf_counter() - start:.1f}s')
+
+    if args.export:
+        export_topic_model(lda, args.export)
+        print(f'Exported topic model to {args.export}')
+
+    data = load_articles(args.true, args.fake)
+    data = pd.concat([data, topic_columns(lda, corpus, chunksize=args.chunksize)], axis=1)
+    if args.no_entities:
+        data['entities_str'] = ''
+    else:
+        start = time.perf_counter()
+        data['entities_str'] = entity_strings(data['text'], n_process=args.n_process, model=args.spacy_model)
+        print(f'Extracted entities in {time.perf_counter() - start:.1f}s')
+    data[OUTPUT_COLUMNS].to_csv(args.output, index=False)
+    print(f'Wrote {len(data)} rows to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""Lemmatization for topic modeling, batched through spaCy and cached on disk.
+
+Same tokens as the notebook's preprocess_and_lemmatize (lowercase, strip
+punctuation and digits, lemmas of non-stop-words longer than 3 chars), but
+documents go through nlp.pipe in batches, optionally over several
+processes, and each document's tokens are stored in an SQLite cache keyed
+by a hash of its text. Re-runs only lemmatize new or edited articles.
+
+    from topic_preprocessing import lemmatize
+    data['processed_text'] = lemmatize(data['text'], n_process=4)
+
+Or warm the cache from the command line:
+
+    python topic_preprocessing.py True.csv Fake.csv --n-process 4
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import string
+import time
+
+import pandas as pd
+
+SPACY_MODEL = os.environ.get('SPACY_MODEL', 'en_core_web_sm')
+TOKEN_CACHE_PATH = os.environ.get('TOKEN_CACHE_PATH', 'token_cache.db')
+# Bump when the token rules below change so cached tokens are not reused
+PREPROCESS_VERSION = 1
+MIN_TOKEN_LENGTH = 4
+BATCH_SIZE = 256
+WRITE_EVERY = 1000
+
+PUNCTUATION_RE = re.compile(f'[{re.escape(string.punctuation)}]')
+DIGITS_RE = re.compile(r'\d+')
+
+
+def normalize(text):
+    """Lowercase and drop punctuation and digits, before spaCy sees the text"""
+    return DIGITS_RE.sub('', PUNCTUATION_RE.sub('', text.lower()))
+
+
+def load_nlp(model=SPACY_MODEL):
+    import spacy
+    return spacy.load(model, disable=['parser', 'ner'])
+
+
+def content_hash(text, namespace=''):
+    return hashlib.blake2b(f'{namespace}\0{text}'.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class TokenCache:
+    """Token lists keyed by content hash, in an SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, tokens TEXT)')
+
+    def get_many(self, keys, chunk=900):
+        found = {}
+        keys = list(keys)
+        # SQLite limits the number of bound parameters per statement
+        for start in range(0, len(keys), chunk):
+            part = keys[start:start + chunk]
+            rows = self.conn.execute(
+                f'SELECT key, tokens FROM tokens WHERE key IN ({",".join("?" * len(part))})', part
+            )
+            found.update((key, json.loads(tokens)) for key, tokens in rows)
+        return found
+
+    def set_many(self, items):
+        self.conn.execute('BEGIN')
+        self.conn.executemany('INSERT OR REPLACE INTO tokens VALUES (?, ?)',
+                              ((key, json.dumps(tokens)) for key, tokens in items))
+        self.conn.execute('COMMIT')
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM tokens').fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+def lemmatize(texts, nlp=None, cache_path=TOKEN_CACHE_PATH, batch_size=BATCH_SIZE, n_process=1, model=SPACY_MODEL):
+    """Token lists for texts, in order.
+
+    Identical texts are processed once, and texts already in the cache at
+    cache_path (None disables it) are not processed at all. nlp defaults to
+    load_nlp(model), loaded only when something is missing; a passed nlp
+    names the cache namespace from its meta (en_core_web_sm etc.).
+    """
+    texts = ['' if not isinstance(text, str) else text for text in texts]
+    if nlp is not None:
+        model = f"{nlp.meta['lang']}_{nlp.meta['name']}"
+    # Keys cover the model and token rules as well as the text
+    namespace = f'{model}:{PREPROCESS_VERSION}'
+    keys = [content_hash(text, namespace) for text in texts]
+
+    cache = TokenCache(cache_path) if cache_path else None
+    try:
+        tokens = cache.get_many(set(keys)) if cache is not None else {}
+        pending = {key: text for key, text in zip(keys, texts) if key not in tokens}
+        if pending:
+            nlp = nlp or load_nlp(model)
+            stop_words = nlp.Defaults.stop_words
+            docs = nlp.pipe((normalize(text) for text in pending.values()), batch_size=batch_size,
+                            n_process=n_process)
+            done = []
+            for key, doc in zip(pending, docs):
+                tokens[key] = [token.lemma_ for token in doc
+                               if token.text not in stop_words and len(token.text) >= MIN_TOKEN_LENGTH]
+                done.append((key, tokens[key]))
+                # Write as we go so an interrupted run keeps its progress
+                if cache is not None and len(done) >= WRITE_EVERY:
+                    cache.set_many(done)
+                    done = []
+            if cache is not None and done:
+                cache.set_many(done)
+    finally:
+        if cache is not None:
+            cache.close()
+    return [tokens[key] for key in keys]
+
+
+def entity_strings(texts, nlp=None, batch_size=BATCH_SIZE, n_process=1, model=SPACY_MODEL):
+    """'Name (TYPE); ...' named-entity strings for texts, the entities_str format converting.py reads.
+
+    Each distinct (name, type) appears once per text, in order of first mention.
+    """
+    if nlp is None:
+        import spacy
+        nlp = spacy.load(model, disable=['parser', 'lemmatizer'])
+    texts = ('' if not isinstance(text, str) else text for text in texts)
+    results = []
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+        # ';' separates entities in entities_str, so it cannot appear inside a name
+        mentions = dict.fromkeys(f"{' '.join(ent.text.replace(';', ',').split())} ({ent.label_})" for ent in doc.ents)
+        results.append('; '.join(mentions))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lemmatize article texts into the token cache.')
+    parser.add_argument('inputs', nargs='+', help='CSV files with a text column')
+    parser.add_argument('--column', default='text')
+    parser.add_argument('--cache', default=TOKEN_CACHE_PATH)
+    parser.add_argument('--model', default=SPACY_MODEL)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--n-process', type=int, default=1)
+    args = parser.parse_args()
+
+    texts = pd.concat([pd.read_csv(path, usecols=[args.column])[args.column] for path in args.inputs],
+                      ignore_index=True)
+    start = time.perf_counter()
+    lemmatize(texts, cache_path=args.cache, batch_size=args.batch_size, n_process=args.n_process, model=args.model)
+    print(f'Lemmatized {len(texts)} texts in {time.perf_counter() - start:.1f}s; cache at {args.cache}')
+
+
+if __name__ == '__main__':
+    main()